@@ -1,6 +1,77 @@
 # 先导入 config 模块以确保其优先初始化
 from .config import *
-from .api import *
-from .service import *
-from .controller import *
-from .utils import *
\ No newline at end of file
+import importlib
+
+# api、service、controller、utils 各层的导出名称 -> 所在模块
+# 这些名称在首次访问时才导入，运行某个任务时只会加载该任务实际用到的依赖。
+# 直接从定义名称的模块取值而不是经由子包：子模块被导入后会以模块对象覆盖子包上的同名属性，
+# 例如导入 AsyncPushPlus 时会导入 send.utils.PushPlus 模块，此后 send.utils.PushPlus 不再是类
+_LAZY_IMPORTS = {
+    'LoveQuoteApi': '.api.LoveQuoteApi',
+    'EventApi': '.api.EventApi',
+    'WeatherApi': '.api.WeatherApi',
+    'AsyncLoveQuoteApi': '.api.AsyncLoveQuoteApi',
+    'AsyncEventApi': '.api.AsyncEventApi',
+    'AsyncWeatherApi': '.api.AsyncWeatherApi',
+    'LoveQuoteService': '.service.LoveQuoteService',
+    'EventService': '.service.EventService',
+    'WeatherService': '.service.WeatherService',
+    'EventIndex': '.service.EventIndex',
+    'get_event_index': '.service.EventIndex',
+    'WeatherAlertEngine': '.service.WeatherAlertEngine',
+    'WeatherAlert': '.service.WeatherAlertEngine',
+    'QuoteReservoir': '.service.QuoteReservoir',
+    'get_quote_reservoir': '.service.QuoteReservoir',
+    'LoveQuoteController': '.controller.LoveQuoteController',
+    'EventController': '.controller.EventController',
+    'WeatherController': '.controller.WeatherController',
+    'PushPlus': '.utils.PushPlus',
+    'DeepSeek': '.utils.Deep_SEEK',
+    'HunYuan': '.utils.HunYuan',
+    'HttpTransport': '.utils.HttpTransport',
+    'get_transport': '.utils.HttpTransport',
+    'AsyncHttpTransport': '.utils.AsyncHttpTransport',
+    'AsyncPushPlus': '.utils.AsyncPushPlus',
+    'HttpCache': '.utils.HttpCache',
+    'get_http_cache': '.utils.HttpCache',
+    'CalendarStore': '.utils.CalendarStore',
+    'HolidayEngine': '.utils.HolidayEngine',
+    'LunarTable': '.utils.LunarTable',
+    'get_lunar_table': '.utils.LunarTable',
+    'CityResolver': '.utils.CityResolver',
+    'get_city_resolver': '.utils.CityResolver',
+    'WeatherStore': '.utils.WeatherStore',
+    'CastSeries': '.utils.WeatherStore',
+    'JsonState': '.utils.JsonState',
+    'TipCache': '.utils.TipCache',
+    'HedgedLLM': '.utils.HedgedLLM',
+    'LLMRouter': '.utils.LLMRouter',
+    'LLMBackend': '.utils.LLMRouter',
+    'BatchLLM': '.utils.BatchLLM',
+    'TipValidator': '.utils.TipValidator',
+    'Repair': '.utils.TipValidator',
+    'TemplateEngine': '.utils.TemplateEngine',
+    'get_template_engine': '.utils.TemplateEngine',
+    'BlocklistMatcher': '.utils.BlocklistMatcher',
+    'get_blocklist_matcher': '.utils.BlocklistMatcher',
+    'get_quote_blocklist': '.utils.BlocklistMatcher',
+    'MessageHistory': '.utils.MessageHistory',
+    'get_message_history': '.utils.MessageHistory',
+    'UsageTracker': '.utils.UsageTracker',
+    'UsageRecord': '.utils.UsageTracker',
+    'get_usage_tracker': '.utils.UsageTracker',
+    'estimate_tokens': '.utils.UsageTracker',
+    'truncate_prompt': '.utils.UsageTracker',
+    'ChatStream': '.utils.ChatStream',
+    'StreamResult': '.utils.ChatStream',
+}
+
+
+def __getattr__(name):
+    """首次访问时才导入对应模块中的名称"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
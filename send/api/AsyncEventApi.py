@@ -0,0 +1,47 @@
+from .EventApi import EventApi
+
+
+class AsyncEventApi(EventApi):
+    """
+    EventApi 的异步版本。
+
+    参数校验与响应解析复用 EventApi，仅将网络请求替换为异步请求。
+    """
+
+    def __init__(self, transport, store=None):
+        """
+        初始化AsyncEventApi实例。
+
+        :param transport: AsyncHttpTransport 实例。
+        :param store: 本地日历存储，默认使用缓存目录下的 CalendarStore。
+        """
+        super().__init__(transport=transport, store=store)
+
+    async def get_calendar(self, date: str) -> dict or None:
+        """
+        异步获取指定日期的详细日历信息，优先读取本地日历存储。
+        参数:
+            date (str): 格式为YYYY-MM-DD,如月份和日期小于10,则取个位,如:2012-1-1
+        返回:
+            返回一个包含日历信息的字典(dict)；
+            如果请求失败或发生异常，则返回None。
+        """
+        request_params = self._build_params(date)
+        if request_params is None:
+            return None
+
+        local_data = self._lookup_local(date)
+        if local_data is not None:
+            return local_data
+
+        try:
+            response = await self.transport.get(self.CalendarURL, params=request_params,
+                                               cache_check=self._is_cacheable)
+            calendar_data = self._handle_response(response)
+            self._save_local(date, calendar_data)
+            return calendar_data
+        except Exception as e:
+            self.logger.error(f"发生错误：{e}")
+
+        # 请求失败返回None
+        return None
\ No newline at end of file
@@ -0,0 +1,38 @@
+from .LoveQuoteApi import LoveQuoteApi
+
+
+class AsyncLoveQuoteApi(LoveQuoteApi):
+    """
+    LoveQuoteApi 的异步版本。
+
+    URL选择与响应解析复用 LoveQuoteApi，仅将网络请求替换为异步请求。
+    """
+
+    def __init__(self, transport):
+        """
+        初始化AsyncLoveQuoteApi实例。
+
+        :param transport: AsyncHttpTransport 实例。
+        """
+        super().__init__(transport=transport)
+
+    async def get_random_quote(self, url=None):
+        """
+        异步获取一条随机的情话。
+
+        :param url: 可选，quote_urls 中的一个，默认随机选择
+        :return: 如果请求成功，则返回包含情话内容的字典；否则返回None。
+        """
+        selected_url = self._select_url(url)
+
+        try:
+            response = await self.transport.get(selected_url)
+            quote_data = self._handle_response(response)
+            if quote_data is not None:
+                return quote_data
+        except Exception as e:
+            self.logger.error(f"发生错误：{e}")
+
+        # 请求失败返回None
+        self.logger.error("请求失败，返回空")
+        return None
\ No newline at end of file
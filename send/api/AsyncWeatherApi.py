@@ -0,0 +1,41 @@
+from typing import Dict
+import httpx
+from .WeatherApi import WeatherApi
+
+
+class AsyncWeatherApi(WeatherApi):
+    """
+    高德天气API服务的异步版本
+
+    查询解析与响应处理复用 WeatherApi，仅将网络请求替换为异步请求。
+    """
+
+    def __init__(self, transport):
+        """
+        初始化异步天气查询实例
+        :param transport: AsyncHttpTransport 实例
+        :raises ValueError: 当必要参数缺失时抛出
+        """
+        super().__init__(transport=transport)
+
+    async def get_weather(self, content=None) -> Dict:
+        """
+        异步获取天气数据
+        :param content: 查询内容(格式：城市+气象类型)，示例："北京实时天气"
+        :return: 结构化响应数据
+        """
+        api_url, error = self._prepare_request(content)
+        if error:
+            return error
+
+        try:
+            response = await self.transport.get(
+                api_url,
+                timeout=self.REQUEST_TIMEOUT,
+                cache_check=self._is_cacheable
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            return self._request_error(e)
+
+        return self._handle_response(response)
\ No newline at end of file
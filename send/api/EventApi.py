@@ -1,8 +1,7 @@
 import os
-import requests
 import re
 import send
-from datetime import datetime
+from datetime import date as Date, datetime
 from lunardate import LunarDate
 
 class EventApi:
@@ -14,16 +13,18 @@ class EventApi:
         CalendarURL (str): 获取日历信息的API URL。
     """
 
-    def __init__(self):
+    def __init__(self, transport=None, store=None):
         """
         初始化EventApi实例，从config.ini文件中读取API URL，并从环境变量中获取API密钥。
+
+        :param transport: HTTP传输层，默认使用进程内共享的连接池。
+        :param store: 本地日历存储，默认使用缓存目录下的 CalendarStore。
         """
-        self.logger = send.setup_logger()
-        reader = send.ConfigReader()
-        # 读取配置文件
-        event_config = reader.get_event_config()
+        self.logger = send.setup_logger(__name__)
+        self.transport = transport or send.get_transport()
+        self.store = store or send.CalendarStore()
         # 读取配置文件中的URL
-        self.CalendarURL = event_config['CalendarURL']
+        self.CalendarURL = send.get_config().event.calendar_url
 
         self.CalendarKEY = os.getenv('CalendarKEY')
         if not self.CalendarKEY:
@@ -32,14 +33,14 @@ class EventApi:
         # 初始化当前日期
         self.today = datetime.today()
 
-    def get_calendar(self, date: str) -> dict or None:
+    def _build_params(self, date: str) -> dict or None:
         """
-        获取指定日期的详细日历信息。
+        校验日期格式并构造请求参数。
+
         参数:
             date (str): 格式为YYYY-MM-DD,如月份和日期小于10,则取个位,如:2012-1-1
         返回:
-            返回一个包含日历信息的字典(dict)；
-            如果请求失败或发生异常，则返回None。
+            请求参数字典；日期不合法时返回None。
         """
         # 检查参数类型是否为字符串
         if not isinstance(date, str):
@@ -52,36 +53,128 @@ class EventApi:
             return None
 
         # 构造请求参数
-        request_params = {
+        return {
             'key': self.CalendarKEY,
             'date': date
         }
 
+    @staticmethod
+    def _is_cacheable(response) -> bool:
+        """只缓存包含有效result的响应，避免把密钥错误、超出配额等结果写入缓存"""
+        try:
+            return response.json().get('result') is not None
+        except ValueError:
+            return False
+
+    def _handle_response(self, response) -> dict or None:
+        """
+        解析日历API的HTTP响应。
+
+        返回:
+            包含日历信息的字典；状态码异常或缺少result字段时返回None。
+        """
+        # 检查请求是否成功
+        if response.status_code != 200:
+            self.logger.error(f"请求失败，状态码：{response.status_code}")
+            return None
+
+        # 解析返回的JSON数据
+        calendar_data = response.json()
+        self.logger.debug("收到的响应: %s", calendar_data)
+
+        # 检查 result 字段是否存在且不为 None
+        if 'result' not in calendar_data or calendar_data['result'] is None:
+            self.logger.error("API响应中未找到有效的result")
+            return None
+
+        # 返回获取到的数据
+        return calendar_data
+
+    @staticmethod
+    def format_date(day: Date) -> str:
+        """将日期格式化为接口要求的 YYYY-M-D 格式（不带前导零）"""
+        return f"{day.year}-{day.month}-{day.day}"
+
+    def _lookup_local(self, date: str) -> dict or None:
+        """从本地日历存储读取，命中时返回与接口响应结构一致的字典"""
+        data = self.store.get(datetime.strptime(date, '%Y-%m-%d').date())
+        if data is None:
+            return None
+        self.logger.debug("命中本地日历: %s", date)
+        return {'result': {'data': data}}
+
+    def _save_local(self, date: str, calendar_data: dict or None):
+        """将接口返回的日历数据写入本地存储"""
+        if calendar_data and calendar_data['result'].get('data'):
+            self.store.put(datetime.strptime(date, '%Y-%m-%d').date(), calendar_data['result']['data'])
+
+    def get_calendar(self, date: str) -> dict or None:
+        """
+        获取指定日期的详细日历信息，优先读取本地日历存储。
+        参数:
+            date (str): 格式为YYYY-MM-DD,如月份和日期小于10,则取个位,如:2012-1-1
+        返回:
+            返回一个包含日历信息的字典(dict)；
+            如果请求失败或发生异常，则返回None。
+        """
+        request_params = self._build_params(date)
+        if request_params is None:
+            return None
+
+        local_data = self._lookup_local(date)
+        if local_data is not None:
+            return local_data
+
         try:
             # 发送HTTP GET请求
-            response = requests.get(self.CalendarURL, params=request_params)
-
-            # 检查请求是否成功
-            if response.status_code == 200:
-                # 解析返回的JSON数据
-                calendar_data = response.json()
-                self.logger.info(f"收到的响应: {calendar_data}")
-
-                # 检查 result 字段是否存在且不为 None
-                if 'result' not in calendar_data or calendar_data['result'] is None:
-                    self.logger.error("API响应中未找到有效的result")
-                    return None
-
-                # 返回获取到的数据
-                return calendar_data
-            else:
-                self.logger.error(f"请求失败，状态码：{response.status_code}")
+            response = self.transport.get(self.CalendarURL, params=request_params, cache_check=self._is_cacheable)
+            calendar_data = self._handle_response(response)
+            self._save_local(date, calendar_data)
+            return calendar_data
         except Exception as e:
             self.logger.error(f"发生错误：{e}")
 
         # 请求失败返回None
         return None
 
+    def get_calendar_range(self, start: Date, end: Date, max_requests: int = None) -> int:
+        """
+        预取 [start, end] 区间内的日历数据到本地存储，已存储的日期不会重复请求。
+
+        参数:
+            start (date): 起始日期（包含）。
+            end (date): 结束日期（包含）。
+            max_requests (int, optional): 本次最多发起的请求数，用于控制免费接口的配额消耗；
+                未填满的日期会在之后的调用中继续预取。
+        返回:
+            本次成功写入本地存储的天数。
+        """
+        missing = self.store.missing(start, end)
+        if max_requests is not None:
+            missing = missing[:max_requests]
+        if not missing:
+            return 0
+
+        fetched = 0
+        for day in missing:
+            if self.get_calendar(self.format_date(day)) is None:
+                # 接口异常（如配额用尽）时停止本轮预取
+                self.logger.warning("预取 %s 的日历数据失败，停止本轮预取", day)
+                break
+            fetched += 1
+
+        self.logger.info("预取日历数据 %d 天，区间 %s ~ %s", fetched, start, end)
+        return fetched
+
+    def get_holidays(self, start: Date, end: Date) -> list:
+        """
+        查询 [start, end] 区间内本地存储中的节日。
+
+        返回:
+            [(date, 节日名称), ...]，按日期排序。
+        """
+        return self.store.holidays(start, end)
+
     def get_lunar_date(self) -> str:
         """
         获取今天的农历月份和日期，并以 'x月x日' 的格式返回。
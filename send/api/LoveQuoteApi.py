@@ -1,4 +1,3 @@
-import requests
 import os
 import random
 import send
@@ -12,15 +11,17 @@ class LoveQuoteApi:
         quote_urls (list): 包含两个URL的列表，分别用于获取情话和彩虹屁。
     """
 
-    def __init__(self):
+    def __init__(self, transport=None):
         """
         初始化LoveQuoteApi实例，从config.ini文件中读取API URL，并从环境变量中获取API密钥。
+
+        :param transport: HTTP传输层，默认使用进程内共享的连接池。
         """
-        self.logger = send.setup_logger()
-        reader = send.ConfigReader()
+        self.logger = send.setup_logger(__name__)
+        self.transport = transport or send.get_transport()
         # 读取配置文件中的URL
-        love_quote_config = reader.get_love_quote_config()
-        self.say_love_url, self.cai_hong_pi_url = love_quote_config['SayLoveURL'], love_quote_config['CaiHongPiURL']
+        love_quote_config = send.get_config().love_quote
+        self.say_love_url, self.cai_hong_pi_url = love_quote_config.say_love_url, love_quote_config.cai_hong_pi_url
 
         self.api_key = os.getenv('TIAN_KEY')
         if not self.api_key:
@@ -32,31 +33,45 @@ class LoveQuoteApi:
             f"{self.cai_hong_pi_url}?key={self.api_key}"
         ]
 
+    def _select_url(self, url=None) -> str:
+        """随机选择一个情话URL，指定 url 时直接使用"""
+        selected_url = url or random.choice(self.quote_urls)
+        self.logger.info(f"选择的URL: {selected_url.replace(self.api_key, '[SENSITIVE_DATA]', 1)}")
+        return selected_url
+
+    def _handle_response(self, response):
+        """
+        解析情话API的HTTP响应。
+
+        :return: 状态码为200时返回情话数据字典，否则返回None。
+        """
+        # 检查请求是否成功
+        if response.status_code == 200:
+            # 解析返回的JSON数据
+            quote_data = response.json()
+            self.logger.debug("收到的响应: %s", quote_data)
+            # 返回获取到的数据
+            return quote_data
+
+        self.logger.error(f"请求失败，状态码：{response.status_code}")
+        return None
 
-    def get_random_quote(self):
+    def get_random_quote(self, url=None):
         """
         获取一条随机的情话。
 
+        :param url: 可选，quote_urls 中的一个，默认随机选择
         :return: 如果请求成功，则返回包含情话内容的字典；否则返回None。
         """
         # 随机选择一个URL
-        selected_url = random.choice(self.quote_urls)
-
-        self.logger.info(f"选择的URL: {selected_url.replace(self.api_key, '[SENSITIVE_DATA]', 1)}")
+        selected_url = self._select_url(url)
 
         try:
             # 发送HTTP GET请求
-            response = requests.get(selected_url)
-
-            # 检查请求是否成功
-            if response.status_code == 200:
-                # 解析返回的JSON数据
-                quote_data = response.json()
-                self.logger.info(f"收到的响应: {quote_data}")
-                # 返回获取到的数据
+            response = self.transport.get(selected_url)
+            quote_data = self._handle_response(response)
+            if quote_data is not None:
                 return quote_data
-            else:
-                self.logger.error(f"请求失败，状态码：{response.status_code}")
         except Exception as e:
             self.logger.error(f"发生错误：{e}")
 
@@ -2,7 +2,6 @@ import requests
 import os
 from typing import Optional, Dict, Tuple
 import send
-from fuzzywuzzy import process
 
 
 class WeatherApi:
@@ -11,25 +10,24 @@ class WeatherApi:
     """
 
     # 常量定义
-    MIN_SCORE = 50  # 模糊匹配最低置信度
     REQUEST_TIMEOUT = 10  # API请求超时时间(秒)
 
-    def __init__(self):
+    def __init__(self, transport=None):
         """
         初始化天气查询实例
+        :param transport: HTTP传输层，默认使用进程内共享的连接池
         :raises ValueError: 当必要参数缺失时抛出
         """
-        self.logger = send.setup_logger()
+        self.logger = send.setup_logger(__name__)
+        self.transport = transport or send.get_transport()
 
-        try:
-            config = send.ConfigReader().get_weather_config()
-            self.url = config['URL']
-            self.city_map = config['City']
-            self.extensions_map = config['Extensions']
-            self.output_format = config['Output'][0]
-        except KeyError as e:
-            self.logger.critical(f"关键配置项缺失: {e}")
-            raise ValueError(f"配置文件不完整，缺失 {e} 配置项")
+        config = send.get_config().weather
+        if config is None:
+            self.logger.critical("关键配置项缺失: WeatherConfig")
+            raise ValueError("配置文件不完整，缺失 WeatherConfig 配置项")
+        self.url = config.url
+        self.resolver = send.get_city_resolver()
+        self.output_format = config.output[0]
 
         self.weather_key = os.getenv('Weather_Key')
         if not self.weather_key:
@@ -37,28 +35,15 @@ class WeatherApi:
             raise ValueError("Weather_Key环境变量未设置")
 
     def _parse_query(self, content: str) -> Tuple[Optional[str], Optional[str]]:
-        """增强型模糊匹配解析器"""
-        # 城市名称匹配分析
-        city_scores = process.extract(content, self.city_map.keys())
-        self.logger.debug(f"城市匹配: {city_scores}")
-        # 气象类型匹配分析
-        ext_scores = process.extract(content, self.extensions_map.keys())
-        self.logger.debug(f"气象匹配: {ext_scores}")
-
-        # 处理最佳匹配
-        city_match = process.extractOne(content, self.city_map.keys())
-        ext_match = process.extractOne(content, self.extensions_map.keys())
-
-        self.logger.info(
-            f"模糊匹配结果-最高候选:"
-            f"城市: {city_match[0]}({city_match[1]}) "
-            f"气象: {ext_match[0]}({ext_match[1]})"
-        )
-
-        return (
-            self.city_map.get(city_match[0]) if city_match[1] >= self.MIN_SCORE else None,
-            self.extensions_map.get(ext_match[0]) if ext_match[1] >= self.MIN_SCORE else None
-        )
+        """解析查询内容，返回 (城市编码, 气象类型)，结果由解析器缓存"""
+        return self.resolver.resolve(content)
+
+    def resolve(self, content: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        解析查询内容对应的城市编码与气象类型，不发起请求
+        :return: (城市编码, 气象类型)，无法解析的部分为 None
+        """
+        return self._parse_query(content) if content else (None, None)
 
     def _build_api_url(self, content: str) -> Optional[str]:
         """
@@ -81,15 +66,14 @@ class WeatherApi:
 
         return complete_url
 
-    def get_weather(self, content=None) -> Dict:
+    def _prepare_request(self, content: Optional[str]) -> Tuple[Optional[str], Optional[Dict]]:
         """
-        获取天气数据主入口
-        :param content: 查询内容(格式：城市+气象类型)，示例："北京实时天气"
-        :return: 结构化响应数据
+        校验查询内容并构建请求URL
+        :return: (API请求URL, None) 或 (None, 错误响应)
         """
         if not content:
             self.logger.error("必须提供查询内容")
-            return {
+            return None, {
                 'status': 400,
                 'message': '请求内容不能为空，请求示例："南宁市预报天气"',
                 'data': None
@@ -97,26 +81,36 @@ class WeatherApi:
 
         api_url = self._build_api_url(content)
         if not api_url:
-            return {
+            return None, {
                 'status': 400,
                 'message': 'URL不合法，请检查请求地址是否正确',
                 'data': None
             }
+        return api_url, None
 
+    def _request_error(self, error: Exception) -> Dict:
+        """请求失败时的结构化响应"""
+        self.logger.error(f"API请求失败: {str(error)}")
+        return {
+            'status': 500,
+            'message': f"服务请求失败: {str(error)}",
+            'data': None
+        }
+
+    @staticmethod
+    def _is_cacheable(response) -> bool:
+        """只缓存高德返回 status=1 的成功响应"""
         try:
-            response = requests.get(
-                api_url,
-                timeout=self.REQUEST_TIMEOUT
-            )
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"API请求失败: {str(e)}")
-            return {
-                'status': 500,
-                'message': f"服务请求失败: {str(e)}",
-                'data': None
-            }
+            return response.json().get('status') == '1'
+        except ValueError:
+            return False
 
+    def _handle_response(self, response) -> Dict:
+        """
+        解析API响应并标准化数据格式
+        :param response: 已通过状态码检查的HTTP响应
+        :return: 结构化响应数据
+        """
         try:
             result = response.json()
             if result.get('status') != '1':
@@ -144,6 +138,28 @@ class WeatherApi:
             }
         }
 
+    def get_weather(self, content=None) -> Dict:
+        """
+        获取天气数据主入口
+        :param content: 查询内容(格式：城市+气象类型)，示例："北京实时天气"
+        :return: 结构化响应数据
+        """
+        api_url, error = self._prepare_request(content)
+        if error:
+            return error
+
+        try:
+            response = self.transport.get(
+                api_url,
+                timeout=self.REQUEST_TIMEOUT,
+                cache_check=self._is_cacheable
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            return self._request_error(e)
+
+        return self._handle_response(response)
+
 
 if __name__ == '__main__':
     # 示例用法
@@ -1,5 +1,2 @@
-from .LoveQuoteApi import LoveQuoteApi
-from .EventApi import EventApi
-from .WeatherApi import WeatherApi
-
-__all__ = ['LoveQuoteApi', 'EventApi', 'WeatherApi']
\ No newline at end of file
+# 与子模块同名的类（如 WeatherApi）不在这里导出，请通过 send.WeatherApi 访问：
+# 子模块被导入后会以模块对象覆盖子包上的同名属性，子包的 __getattr__ 不再被调用
\ No newline at end of file
@@ -1,180 +1,524 @@
 import os
 import json
-from configparser import ConfigParser, NoSectionError, NoOptionError
-import logging
-import inspect
-from colorlog import ColoredFormatter
+import threading
+from configparser import ConfigParser, SectionProxy
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from .Logger import setup_logger
 
-def setup_logger(level=logging.DEBUG):
+
+@dataclass(frozen=True, slots=True)
+class LoveQuoteConfig:
+    """LoveQuoteConfig 配置段"""
+    say_love_url: str
+    cai_hong_pi_url: str
+    custom_values: Tuple[str, ...]
+    max_retries: int
+    reservoir_size: int
+    reservoir_low_water: int
+    refill_concurrency: int
+    blocklist_file: str
+    blocklist_normalize: bool
+    history_threshold: float
+    history_permutations: int
+    history_bands: int
+
+
+@dataclass(frozen=True, slots=True)
+class SendEmailConfig:
+    """SendEmailConfig 配置段"""
+    url: str
+    template: str
+    channel: str
+
+
+@dataclass(frozen=True, slots=True)
+class EventConfig:
+    """EventConfig 配置段"""
+    calendar_url: str
+    event_days: Tuple[Tuple[str, str], ...]
+    day: int
+    name: Tuple[str, ...]
+    prefetch_days: int
+    prefetch_budget: int
+    calendar_source: str
+    holiday_file: str
+    lunar_years: Tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherConfig:
+    """WeatherConfig 配置段"""
+    url: str
+    output: Tuple[str, ...]
+    city: Mapping[str, str]
+    extensions: Mapping[str, str]
+    condition: str
+    cities: Tuple[str, ...]
+    max_concurrency: int
+    adcode_file: str
+    report_hours: Tuple[int, ...]
+    tip_prefix: str
+    tip_max_length: int
+    tip_per_city: bool
+    tip_regenerations: int
+    tip_source: str
+    tip_deadline: float
+    tip_blocklist: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class DeepSeekConfig:
+    """DeepSeekConfig 配置段"""
+    url: str
+
+
+@dataclass(frozen=True, slots=True)
+class HunYuanConfig:
+    """HunYuanConfig 配置段"""
+    url: str
+
+
+@dataclass(frozen=True, slots=True)
+class HttpConfig:
+    """HttpConfig 配置段"""
+    timeout: float
+    pool_connections: int
+    pool_max_size: int
+    max_retries: int
+    backoff_factor: float
+    retry_status: Tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheConfig:
+    """CacheConfig 配置段"""
+    dir: str
+    http_max_entries: int
+    http_max_bytes: int
+    http_ttl: Mapping[str, int]
+    sensitive_params: Tuple[str, ...]
+    tip_ttl: int
+    tip_max_entries: int
+    tip_variants: int
+    tip_temp_bucket: int
+
+    def path(self, name: str) -> str:
+        """返回缓存目录下的文件路径，目录不存在时自动创建"""
+        os.makedirs(self.dir, exist_ok=True)
+        return os.path.join(self.dir, name)
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherAlertConfig:
+    """WeatherAlertConfig 配置段"""
+    temp_swing: int
+    extreme_high: int
+    extreme_low: int
+    rain_keywords: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class LLMConfig:
+    """LLMConfig 配置段"""
+    mode: str
+    backends: Tuple[str, ...]
+    hedge_delay: float
+    stream: bool
+    ewma_alpha: float
+    evict_after: int
+    evict_cooldown: int
+    pricing: Mapping[str, Tuple[float, float]]
+    prompt_token_budget: int
+    usage_window_days: int
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """
+    config.ini 的不可变快照，每个配置段对应一个冻结的数据类。
+
+    缺失的配置段为 None；配置段内的选项在加载时一次性校验。
+    """
+    path: str
+    mtime_ns: int
+    love_quote: Optional[LoveQuoteConfig]
+    send_email: Optional[SendEmailConfig]
+    event: Optional[EventConfig]
+    weather: Optional[WeatherConfig]
+    deep_seek: Optional[DeepSeekConfig]
+    hunyuan: Optional[HunYuanConfig]
+    http: Optional[HttpConfig]
+    cache: Optional[CacheConfig]
+    weather_alert: Optional[WeatherAlertConfig]
+    llm: Optional[LLMConfig]
+
+
+def _require(section: SectionProxy, option: str) -> str:
+    """读取必填选项，缺失时抛出 ValueError"""
+    value = section.get(option)
+    if value is None:
+        raise ValueError(f"[{section.name}] 缺少配置项 {option}")
+    return value
+
+
+def _require_json(section: SectionProxy, option: str, expected_type: type):
+    """读取必填的 JSON 选项并校验类型"""
+    raw = _require(section, option)
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"[{section.name}] 配置项 {option} 不是合法的 JSON: {e}") from e
+    if not isinstance(value, expected_type):
+        raise ValueError(f"[{section.name}] 配置项 {option} 应为 {expected_type.__name__}")
+    return value
+
+
+def _require_int(section: SectionProxy, option: str) -> int:
+    """读取必填的整数选项"""
+    raw = _require(section, option)
+    try:
+        return int(raw)
+    except ValueError as e:
+        raise ValueError(f"[{section.name}] 配置项 {option} 应为整数") from e
+
+
+def _require_bool(section: SectionProxy, option: str) -> bool:
+    """读取必填的布尔选项（true/false、yes/no、on/off、1/0）"""
+    _require(section, option)
+    try:
+        return section.getboolean(option)
+    except ValueError as e:
+        raise ValueError(f"[{section.name}] 配置项 {option} 应为 true 或 false") from e
+
+
+def _require_float(section: SectionProxy, option: str) -> float:
+    """读取必填的浮点数选项"""
+    raw = _require(section, option)
+    try:
+        return float(raw)
+    except ValueError as e:
+        raise ValueError(f"[{section.name}] 配置项 {option} 应为数字") from e
+
+
+def _optional(section: SectionProxy, option: str, read, fallback, *args):
+    """读取可选选项，缺失时返回默认值"""
+    if section.get(option) is None:
+        return fallback
+    return read(section, option, *args)
+
+
+def _parse_love_quote(section: SectionProxy) -> LoveQuoteConfig:
+    reservoir_size = max(1, _optional(section, 'ReservoirSize', _require_int, 30))
+    blocklist_file = _optional(section, 'BlocklistFile', _require, '')
+    return LoveQuoteConfig(
+        say_love_url=_require(section, 'SayLoveURL'),
+        cai_hong_pi_url=_require(section, 'CaiHongPiURL'),
+        custom_values=tuple(_require_json(section, 'Custom_Values', list)),
+        max_retries=_require_int(section, 'Max_Retries'),
+        reservoir_size=reservoir_size,
+        reservoir_low_water=min(reservoir_size, max(0, _optional(section, 'ReservoirLowWater', _require_int, 10))),
+        refill_concurrency=max(1, _optional(section, 'RefillConcurrency', _require_int, 4)),
+        blocklist_file=os.path.join(REPO_ROOT, blocklist_file) if blocklist_file else '',
+        blocklist_normalize=_optional(section, 'BlocklistNormalize', _require_bool, True),
+        history_threshold=min(100.0, max(0.0, _optional(section, 'HistoryThreshold', _require_float, 90.0))),
+        history_permutations=max(1, _optional(section, 'HistoryPermutations', _require_int, 128)),
+        history_bands=max(1, _optional(section, 'HistoryBands', _require_int, 32))
+    )
+
+
+def _parse_send_email(section: SectionProxy) -> SendEmailConfig:
+    return SendEmailConfig(
+        url=_require(section, 'URL'),
+        template=_require(section, 'Template'),
+        channel=_require(section, 'Channel')
+    )
+
+
+def _parse_event(section: SectionProxy) -> EventConfig:
+    event_days = _require_json(section, 'EventDays', list)
+    if not all(isinstance(item, list) and len(item) == 2 for item in event_days):
+        raise ValueError(f"[{section.name}] 配置项 EventDays 的每一项应为 [名称, 日期]")
+    calendar_source = _optional(section, 'CalendarSource', _require, 'local')
+    if calendar_source not in ('local', 'juhe'):
+        raise ValueError(f"[{section.name}] 配置项 CalendarSource 应为 local 或 juhe")
+    holiday_file = _optional(section, 'HolidayFile', _require, 'send/data/holidays.json')
+    lunar_years = _optional(section, 'LunarYears', _require_json, [1900, 2099], list)
+    if (len(lunar_years) != 2 or not all(isinstance(year, int) for year in lunar_years)
+            or not 1900 <= lunar_years[0] <= lunar_years[1] <= 2099):
+        raise ValueError(f"[{section.name}] 配置项 LunarYears 应为 [起始年, 结束年]，范围 1900-2099")
+    return EventConfig(
+        calendar_url=_require(section, 'CalendarURL'),
+        event_days=tuple((name, date_str) for name, date_str in event_days),
+        day=_require_int(section, 'Day'),
+        name=tuple(_require_json(section, 'Name', list)),
+        prefetch_days=_optional(section, 'PrefetchDays', _require_int, 365),
+        prefetch_budget=_optional(section, 'PrefetchBudget', _require_int, 30),
+        calendar_source=calendar_source,
+        holiday_file=os.path.join(REPO_ROOT, holiday_file),
+        lunar_years=(lunar_years[0], lunar_years[1])
+    )
+
+
+def _parse_weather(section: SectionProxy) -> WeatherConfig:
+    report_hours = _optional(section, 'ReportHours', _require_json, [8, 11, 18], list)
+    if not report_hours or not all(isinstance(hour, int) and 0 <= hour <= 23 for hour in report_hours):
+        raise ValueError(f"[{section.name}] 配置项 ReportHours 应为 0-23 的整数列表")
+    tip_source = _optional(section, 'TipSource', _require, 'llm')
+    if tip_source not in ('llm', 'template'):
+        raise ValueError(f"[{section.name}] 配置项 TipSource 应为 llm 或 template")
+    return WeatherConfig(
+        url=_require(section, 'URL'),
+        output=tuple(_require_json(section, 'Output', list)),
+        city=MappingProxyType(_require_json(section, 'City', dict)),
+        extensions=MappingProxyType(_require_json(section, 'Extensions', dict)),
+        condition=_require(section, 'Condition'),
+        cities=tuple(_require_json(section, 'Cities', list)),
+        max_concurrency=_optional(section, 'MaxConcurrency', _require_int, 4),
+        adcode_file=os.path.join(REPO_ROOT, _optional(section, 'AdcodeFile', _require, 'send/data/adcodes.tsv')),
+        report_hours=tuple(report_hours),
+        tip_prefix=_optional(section, 'TipPrefix', _require, '温馨提示：亲爱的老婆，'),
+        tip_max_length=_optional(section, 'TipMaxLength', _require_int, 45),
+        tip_per_city=_optional(section, 'TipPerCity', _require_bool, False),
+        tip_regenerations=max(0, _optional(section, 'TipRegenerations', _require_int, 1)),
+        tip_source=tip_source,
+        tip_deadline=max(0.0, _optional(section, 'TipDeadline', _require_float, 0.0)),
+        tip_blocklist=tuple(_optional(section, 'TipBlocklist', _require_json, [], list))
+    )
+
+
+def _parse_deep_seek(section: SectionProxy) -> DeepSeekConfig:
+    return DeepSeekConfig(url=_require(section, 'URL'))
+
+
+def _parse_hunyuan(section: SectionProxy) -> HunYuanConfig:
+    return HunYuanConfig(url=_require(section, 'URL'))
+
+
+def _parse_http(section: SectionProxy) -> HttpConfig:
+    return HttpConfig(
+        timeout=_optional(section, 'Timeout', _require_float, 10.0),
+        pool_connections=_optional(section, 'PoolConnections', _require_int, 10),
+        pool_max_size=_optional(section, 'PoolMaxSize', _require_int, 10),
+        max_retries=_optional(section, 'MaxRetries', _require_int, 3),
+        backoff_factor=_optional(section, 'BackoffFactor', _require_float, 0.5),
+        retry_status=tuple(_optional(section, 'RetryStatus', _require_json, [429, 500, 502, 503, 504], list))
+    )
+
+
+def _parse_cache(section: SectionProxy) -> CacheConfig:
+    # 相对路径以仓库根目录为基准
+    cache_dir = os.path.join(REPO_ROOT, _optional(section, 'Dir', _require, '.cache'))
+    return CacheConfig(
+        dir=os.path.abspath(cache_dir),
+        http_max_entries=_optional(section, 'HttpMaxEntries', _require_int, 1000),
+        http_max_bytes=_optional(section, 'HttpMaxBytes', _require_int, 20 * 1024 * 1024),
+        http_ttl=MappingProxyType(_optional(section, 'HttpTTL', _require_json, {}, dict)),
+        sensitive_params=tuple(_optional(section, 'SensitiveParams', _require_json, ['key', 'token'], list)),
+        tip_ttl=_optional(section, 'TipTTL', _require_int, 7 * 24 * 3600),
+        tip_max_entries=_optional(section, 'TipMaxEntries', _require_int, 500),
+        tip_variants=max(1, _optional(section, 'TipVariants', _require_int, 3)),
+        tip_temp_bucket=max(1, _optional(section, 'TipTempBucket', _require_int, 3))
+    )
+
+
+def _parse_weather_alert(section: SectionProxy) -> WeatherAlertConfig:
+    return WeatherAlertConfig(
+        temp_swing=_optional(section, 'TempSwing', _require_int, 5),
+        extreme_high=_optional(section, 'ExtremeHigh', _require_int, 35),
+        extreme_low=_optional(section, 'ExtremeLow', _require_int, 5),
+        rain_keywords=tuple(_optional(section, 'RainKeywords', _require_json, ['雨', '雪'], list))
+    )
+
+
+def _parse_llm(section: SectionProxy) -> LLMConfig:
+    backends = _optional(section, 'Backends', _require_json, ['deepseek/deepseek-reasoner', 'hunyuan/hunyuan-pro'], list)
+    providers = ('deepseek', 'hunyuan')
+    if not backends or not all(isinstance(backend, str) and backend.partition('/')[0] in providers
+                               and backend.partition('/')[2] for backend in backends):
+        raise ValueError(f"[{section.name}] 配置项 Backends 的每一项应为 服务/模型，服务为 {'、'.join(providers)}")
+    pricing = _optional(section, 'Pricing', _require_json, {}, dict)
+    if not all(isinstance(price, list) and len(price) == 2 and all(isinstance(p, (int, float)) for p in price)
+               for price in pricing.values()):
+        raise ValueError(f"[{section.name}] 配置项 Pricing 应为 模型 -> [输入单价, 输出单价]")
+    pricing = {model: (float(price[0]), float(price[1])) for model, price in pricing.items()}
+    mode = _optional(section, 'Mode', _require, 'hedged')
+    if mode not in ('hedged', 'adaptive', *providers, *backends):
+        raise ValueError(f"[{section.name}] 配置项 Mode 应为 hedged、adaptive、服务名或 Backends 中的一项")
+    return LLMConfig(
+        mode=mode,
+        backends=tuple(backends),
+        hedge_delay=_optional(section, 'HedgeDelay', _require_float, 15.0),
+        stream=_optional(section, 'Stream', _require_bool, True),
+        ewma_alpha=_optional(section, 'EwmaAlpha', _require_float, 0.3),
+        evict_after=_optional(section, 'EvictAfter', _require_int, 3),
+        evict_cooldown=_optional(section, 'EvictCooldown', _require_int, 600),
+        pricing=MappingProxyType(pricing),
+        prompt_token_budget=_optional(section, 'PromptTokenBudget', _require_int, 4000),
+        usage_window_days=max(1, _optional(section, 'UsageWindowDays', _require_int, 7))
+    )
+
+
+# 配置段名称 -> (快照字段名, 解析函数)
+_SECTION_PARSERS = {
+    'LoveQuoteConfig': ('love_quote', _parse_love_quote),
+    'SendEmailConfig': ('send_email', _parse_send_email),
+    'EventConfig': ('event', _parse_event),
+    'WeatherConfig': ('weather', _parse_weather),
+    'DeepSeekConfig': ('deep_seek', _parse_deep_seek),
+    'HunYuanConfig': ('hunyuan', _parse_hunyuan),
+    'HttpConfig': ('http', _parse_http),
+    'CacheConfig': ('cache', _parse_cache),
+    'WeatherAlertConfig': ('weather_alert', _parse_weather_alert),
+    'LLMConfig': ('llm', _parse_llm),
+}
+
+# 所有选项都有默认值的配置段，缺失时按默认值生成而不是置为 None
+_DEFAULTED_SECTIONS = {'HttpConfig', 'CacheConfig', 'WeatherAlertConfig', 'LLMConfig'}
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.ini')
+# 仓库根目录，即 send 包的上一级目录
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# 进程内快照缓存：配置文件路径 -> ConfigSnapshot
+_snapshots: Dict[str, ConfigSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _load_snapshot(config_path: str, mtime_ns: int) -> ConfigSnapshot:
+    """解析并校验配置文件，生成不可变快照"""
+    parser = ConfigParser()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            parser.read_file(file)
+    except IOError as e:
+        setup_logger(__name__).error(f"读取配置文件失败: {e}")
+        raise
+
+    sections = {}
+    for section_name, (field_name, parse) in _SECTION_PARSERS.items():
+        if parser.has_section(section_name):
+            sections[field_name] = parse(parser[section_name])
+        elif section_name in _DEFAULTED_SECTIONS:
+            parser.add_section(section_name)
+            sections[field_name] = parse(parser[section_name])
+        else:
+            setup_logger(__name__).error(f"配置文件中缺少 {section_name} 配置段")
+            sections[field_name] = None
+
+    return ConfigSnapshot(path=config_path, mtime_ns=mtime_ns, **sections)
+
+
+def get_config(config_path: Optional[str] = None) -> ConfigSnapshot:
     """
-    配置并返回一个只输出到控制台且带有颜色的日志记录器。
+    获取配置文件的进程级缓存快照。
+
+    配置文件只在首次调用或其修改时间(mtime)变化时重新解析，其余调用直接返回缓存的快照。
 
     Args:
-        level (int): 日志级别，默认为logging.INFO。
+        config_path (str): 配置文件路径，默认为当前目录下的 config.ini。
 
     Returns:
-        logging.Logger: 配置好的日志记录器。
-    """
-    # 获取调用者的完整文件路径
-    caller_frame = inspect.stack()[1][0]
-    caller_filename = inspect.getframeinfo(caller_frame).filename
-    full_path = os.path.abspath(caller_filename)  # 获取完整路径
-
-    # 定义仓库根路径
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))  # 仓库根路径是当前文件的上一级目录
-
-    # 获取相对于仓库根路径的相对路径
-    relative_path = os.path.relpath(full_path, repo_root)
-
-    # 将路径中的反斜杠 `\` 替换为点 `.`，并去掉文件扩展名
-    module_style_path = relative_path.replace("\\", ".").replace("/", ".")
-    module_style_path = module_style_path.replace(".py", "")  # 去掉 .py 后缀
-
-    # 使用模块风格路径作为日志记录器的名称
-    logger = logging.getLogger(module_style_path)
-    logger.setLevel(level)
-
-    # 如果已经存在处理器，则不再添加新的处理器
-    if logger.hasHandlers():
-        return logger
-
-    # 设置日志格式，包含时间、日志级别、模块风格路径、行号和消息
-    log_format = '%(log_color)s%(asctime)s [%(levelname)s] %(name)s.%(funcName)s:%(lineno)d - %(message)s'
-    date_format = '%Y-%m-%d %H:%M:%S'
-
-    # 创建彩色日志格式器
-    colored_formatter = ColoredFormatter(
-        log_format,
-        datefmt=date_format,
-        reset=True,
-        log_colors={
-            'DEBUG': 'white',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'bold_red',
-        }
-    )
+        ConfigSnapshot: 不可变的配置快照。
 
-    # 创建控制台处理器并设置格式
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(colored_formatter)
+    Raises:
+        FileNotFoundError: 配置文件不存在。
+        ValueError: 配置项缺失或格式不正确。
+    """
+    config_path = os.path.abspath(config_path or DEFAULT_CONFIG_PATH)
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        setup_logger(__name__).error(f"未找到配置文件: {config_path}")
+        raise FileNotFoundError(f"无法在 {config_path} 找到配置文件")
 
-    # 添加处理器到记录器
-    logger.addHandler(console_handler)
+    snapshot = _snapshots.get(config_path)
+    if snapshot is not None and snapshot.mtime_ns == mtime_ns:
+        return snapshot
 
-    return logger
+    with _snapshots_lock:
+        snapshot = _snapshots.get(config_path)
+        if snapshot is None or snapshot.mtime_ns != mtime_ns:
+            snapshot = _load_snapshot(config_path, mtime_ns)
+            _snapshots[config_path] = snapshot
+    return snapshot
 
 
 class ConfigReader:
+    """
+    兼容旧接口的配置读取器，基于 get_config() 的缓存快照返回字典形式的配置。
+    """
+
     def __init__(self, config_path=None):
         # 初始化日志记录器
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
 
         # 加载配置文件
-        self._load_config(config_path)
-
-    def _load_config(self, config_path=None):
-        """加载配置文件"""
-        # 默认寻找当前目录下的config.ini文件
-        if config_path is None:
-            config_path = os.path.join(os.path.dirname(__file__), 'config.ini')
-
-        if not os.path.exists(config_path):
-            self.logger.error(f"未找到配置文件: {config_path}")
-            raise FileNotFoundError(f"无法在 {config_path} 找到配置文件")
-
-        self.config = ConfigParser()
-        try:
-            with open(config_path, 'r', encoding='utf-8') as file:
-                self.config.read_file(file)
-        except IOError as e:
-            self.logger.error(f"读取配置文件失败: {e}")
-            raise
+        self.snapshot = get_config(config_path)
 
     def get_love_quote_config(self) -> dict:
-        try:
-            love_quote_section = self.config['LoveQuoteConfig']
-            raw_config = {
-                'SayLoveURL': love_quote_section.get('SayLoveURL'),
-                'CaiHongPiURL': love_quote_section.get('CaiHongPiURL'),
-                'Custom_Values': json.loads(love_quote_section.get('Custom_Values')),
-                'Max_Retries': love_quote_section.getint('Max_Retries')
-            }
-            return raw_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 LoveQuoteConfig 配置失败: {e}")
+        section = self.snapshot.love_quote
+        if section is None:
             return {}
+        return {
+            'SayLoveURL': section.say_love_url,
+            'CaiHongPiURL': section.cai_hong_pi_url,
+            'Custom_Values': list(section.custom_values),
+            'Max_Retries': section.max_retries
+        }
 
     def get_send_email_config(self) -> dict:
-        try:
-            send_email_section = self.config['SendEmailConfig']
-            send_email_config = {
-                'URL': send_email_section.get('URL'),
-                'Template': send_email_section.get('Template'),
-                'Channel': send_email_section.get('Channel')
-            }
-            return send_email_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 SendEmailConfig 配置失败: {e}")
+        section = self.snapshot.send_email
+        if section is None:
             return {}
+        return {
+            'URL': section.url,
+            'Template': section.template,
+            'Channel': section.channel
+        }
 
     def get_event_config(self) -> dict:
-        try:
-            event_section = self.config['EventConfig']
-            raw_config = {
-                'CalendarURL': event_section.get('CalendarURL'),
-                'EventDays': json.loads(event_section.get('EventDays')),
-                'Day': event_section.getint('Day'),
-                'Name': json.loads(event_section.get('Name'))
-            }
-            return raw_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 EventConfig 配置失败: {e}")
+        section = self.snapshot.event
+        if section is None:
             return {}
+        return {
+            'CalendarURL': section.calendar_url,
+            'EventDays': [list(item) for item in section.event_days],
+            'Day': section.day,
+            'Name': list(section.name)
+        }
 
     def get_weather_config(self) -> dict:
-        try:
-            weather_section = self.config['WeatherConfig']
-            weather_config = {
-                'URL': weather_section.get('URL'),
-                'Output': json.loads(weather_section.get('Output')),
-                'City': json.loads(weather_section.get('City')),
-                'Extensions': json.loads(weather_section.get('Extensions')),
-                'Condition': weather_section.get('Condition'),
-                'Cities': json.loads(weather_section.get('Cities'))
-            }
-            return weather_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 WeatherConfig 配置失败: {e}")
+        section = self.snapshot.weather
+        if section is None:
             return {}
+        return {
+            'URL': section.url,
+            'Output': list(section.output),
+            'City': dict(section.city),
+            'Extensions': dict(section.extensions),
+            'Condition': section.condition,
+            'Cities': list(section.cities)
+        }
 
     def get_deep_seek_config(self) -> dict:
-        try:
-            deep_seek_section = self.config['DeepSeekConfig']
-            deep_seek_config = {
-                'URL': deep_seek_section.get('URL')
-            }
-            return deep_seek_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 DeepSeekConfig 配置失败: {e}")
+        section = self.snapshot.deep_seek
+        if section is None:
             return {}
+        return {'URL': section.url}
 
     def get_hunyuan_config(self) -> dict:
-        try:
-            hunyuan_lite_section = self.config['HunYuanConfig']
-            hunyuan_lite_config = {
-                'URL': hunyuan_lite_section.get('URL')
-            }
-            return hunyuan_lite_config
-        except (NoSectionError, NoOptionError) as e:
-            self.logger.error(f"读取 HunYuanConfig 配置失败: {e}")
+        section = self.snapshot.hunyuan
+        if section is None:
             return {}
+        return {'URL': section.url}
 
 
 # 使用方法：
 if __name__ == '__main__':
     try:
+        print(get_config())
         reader = ConfigReader()
         print(reader.get_love_quote_config())
         print(reader.get_send_email_config())
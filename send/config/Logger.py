@@ -0,0 +1,258 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Mapping, Optional, Union
+from colorlog import ColoredFormatter
+
+# 日志输出格式，可通过环境变量 SEND_LOG_FORMAT 切换为 json
+LOG_FORMAT_ENV = 'SEND_LOG_FORMAT'
+# 单条日志消息的最大字符数，可通过环境变量 SEND_LOG_MAX_CHARS 配置，0 表示不截断
+LOG_MAX_CHARS_ENV = 'SEND_LOG_MAX_CHARS'
+DEFAULT_LOG_MAX_CHARS = 2000
+# 按日志记录器名称前缀配置的采样率，例如 "send.api=0.1,send.service.WeatherService=0.5"
+LOG_SAMPLING_ENV = 'SEND_LOG_SAMPLING'
+# 未指定名称时使用的默认日志记录器名称
+DEFAULT_LOGGER_NAME = 'send'
+
+# 已创建的日志记录器缓存：名称 -> Logger
+_loggers: Dict[str, logging.Logger] = {}
+_loggers_lock = threading.Lock()
+# 所有日志记录器共用的队列处理器，以及在后台线程中输出日志的监听器
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+# 入队前格式化异常调用栈使用的格式器
+_exception_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    将日志记录格式化为单行 JSON 的格式器，便于日志采集系统解析。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'func': record.funcName,
+            'line': record.lineno,
+            'message': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc_info'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _build_formatter() -> logging.Formatter:
+    """根据 SEND_LOG_FORMAT 环境变量创建彩色或 JSON 格式器"""
+    if os.environ.get(LOG_FORMAT_ENV, '').lower() == 'json':
+        return JsonFormatter()
+
+    # 设置日志格式，包含时间、日志级别、模块风格路径、行号和消息
+    log_format = '%(log_color)s%(asctime)s [%(levelname)s] %(name)s.%(funcName)s:%(lineno)d - %(message)s'
+    date_format = '%Y-%m-%d %H:%M:%S'
+
+    # 创建彩色日志格式器
+    return ColoredFormatter(
+        log_format,
+        datefmt=date_format,
+        reset=True,
+        log_colors={
+            'DEBUG': 'white',
+            'INFO': 'green',
+            'WARNING': 'yellow',
+            'ERROR': 'red',
+            'CRITICAL': 'bold_red',
+        }
+    )
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    只在调用线程中合并消息参数的队列处理器。
+
+    与标准 QueueHandler 一样，入队前用 getMessage() 合并 msg 与 args，并把异常格式化为文本后清除 exc_info，
+    避免参数对象在入队后被修改、或队列长期持有异常的调用栈；但不调用 format()，
+    时间、级别等格式化以及截断和输出都推迟到 QueueListener 的后台线程中完成。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        # 复制记录，不影响同一条记录的其他处理器
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class TruncateFilter(logging.Filter):
+    """
+    将超过长度上限的日志消息截断，避免大体积的接口响应阻塞日志输出。
+
+    该过滤器挂在输出处理器上，在监听线程中执行。
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.max_chars <= 0:
+            return True
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.msg = f"{message[:self.max_chars]}...(已截断 {len(message) - self.max_chars} 个字符)"
+            record.args = None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    按日志记录器名称前缀对 INFO 及以下级别的日志进行采样。
+
+    WARNING 及以上级别的日志始终保留；采样率为 0~1 之间的小数，匹配最长的名称前缀。
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            matched = -1
+            for prefix, prefix_rate in self.rates.items():
+                if (name == prefix or name.startswith(prefix + '.')) and len(prefix) > matched:
+                    rate, matched = prefix_rate, len(prefix)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+def _parse_sampling(raw: str) -> Dict[str, float]:
+    """解析 "前缀=采样率,前缀=采样率" 格式的采样配置"""
+    rates = {}
+    for item in raw.split(','):
+        if '=' not in item:
+            continue
+        prefix, rate = item.split('=', 1)
+        try:
+            rates[prefix.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def _get_handler() -> logging.Handler:
+    """获取（首次调用时创建）共用的队列处理器，并启动后台输出线程"""
+    global _handler, _listener
+    if _handler is None:
+        try:
+            max_chars = int(os.environ.get(LOG_MAX_CHARS_ENV, DEFAULT_LOG_MAX_CHARS))
+        except ValueError:
+            max_chars = DEFAULT_LOG_MAX_CHARS
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(_build_formatter())
+        console_handler.addFilter(TruncateFilter(max_chars))
+
+        log_queue = queue.SimpleQueue()
+        handler = LazyQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(_parse_sampling(os.environ.get(LOG_SAMPLING_ENV, ''))))
+
+        _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        _handler = handler
+    return _handler
+
+
+def configure_logging(max_chars: Optional[int] = None, sampling: Optional[Mapping[str, float]] = None):
+    """
+    在运行时调整日志截断长度和采样率。
+
+    Args:
+        max_chars (int): 单条日志消息的最大字符数，0 表示不截断。
+        sampling (dict): 日志记录器名称前缀 -> 采样率(0~1)。
+    """
+    handler = _get_handler()
+    if sampling is not None:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, SamplingFilter):
+                handler.removeFilter(log_filter)
+        handler.addFilter(SamplingFilter(sampling))
+    if max_chars is not None and _listener is not None:
+        for output_handler in _listener.handlers:
+            for log_filter in output_handler.filters:
+                if isinstance(log_filter, TruncateFilter):
+                    log_filter.max_chars = max_chars
+
+
+def shutdown_logging():
+    """停止后台输出线程，并在退出前输出队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _logger_name(name: Union[str, type, object, None]) -> str:
+    """将模块名、类或实例转换为日志记录器名称"""
+    if name is None:
+        return DEFAULT_LOGGER_NAME
+    if isinstance(name, str):
+        return name
+    cls = name if isinstance(name, type) else type(name)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def setup_logger(name: Union[str, type, object, None] = None, level=logging.DEBUG) -> logging.Logger:
+    """
+    获取一个只输出到控制台且带有颜色（或 JSON 格式）的日志记录器。
+
+    日志记录器按名称缓存，处理器只在首次创建时配置一次，不做任何调用栈检查。
+    日志先进入队列，由后台线程完成格式化、截断和输出，不会阻塞调用方。
+
+    Args:
+        name: 日志记录器名称，通常传入 __name__；也可以传入类或实例，
+            此时使用 "模块.类名" 作为名称。默认为 "send"。
+        level (int): 日志级别，默认为logging.DEBUG。
+
+    Returns:
+        logging.Logger: 配置好的日志记录器。
+    """
+    logger_name = _logger_name(name)
+    logger = _loggers.get(logger_name)
+    if logger is not None:
+        return logger
+
+    with _loggers_lock:
+        logger = _loggers.get(logger_name)
+        if logger is None:
+            logger = logging.getLogger(logger_name)
+            logger.setLevel(level)
+            # 如果已经存在处理器，则不再添加新的处理器
+            if not logger.handlers:
+                logger.addHandler(_get_handler())
+            _loggers[logger_name] = logger
+    return logger
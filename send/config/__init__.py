@@ -1,5 +1,11 @@
 from .Config import ConfigReader
-from .Config  import setup_logger
+from .Logger import setup_logger, configure_logging, shutdown_logging, JsonFormatter
+from .Config import get_config
+from .Config import (ConfigSnapshot, LoveQuoteConfig, SendEmailConfig, EventConfig, WeatherConfig,
+                     DeepSeekConfig, HunYuanConfig, HttpConfig, CacheConfig, WeatherAlertConfig,
+                     LLMConfig)
 
 
-__all__ = ['ConfigReader','setup_logger']
\ No newline at end of file
+__all__ = ['ConfigReader', 'setup_logger', 'configure_logging', 'shutdown_logging', 'JsonFormatter', 'get_config',
+           'ConfigSnapshot', 'LoveQuoteConfig', 'SendEmailConfig', 'EventConfig', 'WeatherConfig', 'DeepSeekConfig',
+           'HunYuanConfig', 'HttpConfig', 'CacheConfig', 'WeatherAlertConfig', 'LLMConfig']
\ No newline at end of file
@@ -1,4 +1,3 @@
-from datetime import datetime
 import send
 
 class EventController:
@@ -15,44 +14,25 @@ class EventController:
 
         在初始化时，调用Service层获取初始情话。
         """
-        self.logger = send.setup_logger()
+        self.logger = send.setup_logger(__name__)
         self.event_service = send.EventService()
-        event_config = send.ConfigReader()
-        self.name = event_config.get_event_config()['Name']
-        self.day = int(event_config.get_event_config()['Day'])  # 确保day是整数
+        event_config = send.get_config().event
+        self.name = event_config.name
+        self.day = event_config.day
+        self.templates = send.get_template_engine()
 
     def get_events(self):
         """
-        获取所有事件及其与当前日期的差值。
+        获取未来 Day 天内的事件及其与当前日期的差值。
+
+        事件的下一次发生日期由事件索引预先计算（已过的日期顺延到下一年），这里只做一次区间查询。
 
         返回:
             一个列表，每个元素是一个字典，包含name、date以及与当前日期的天数差(diff_days)。
             如果事件名称中包含'重要'或'紧急'，则diff_days设置为0。
         """
-        events = self.event_service.handle_events()
-        self.logger.info(f"获取到的事件列表为：{events}")
-        today = datetime.now().date()
-
-        if not events:
-            return []
-
-        for event in events:
-            name = event['name']
-            date = event['date']
-
-            if any(value in name for value in self.name):
-                # 对于重要或紧急事件，直接将diff_days设置为0
-                event['diff_days'] = 0
-            else:
-                try:
-                    event_date = datetime.strptime(date, '%Y-%m-%d').date()
-                    diff_days = (event_date - today).days
-                    event['diff_days'] = diff_days
-                except ValueError:
-                    # 如果日期格式不正确，记录错误并跳过该事件
-                    self.event_service.logger.error(f"无法解析日期 {date} 对应的事件 {name}")
-                    continue
-
+        events = self.event_service.get_event_index().upcoming(self.day)
+        self.logger.debug("获取到的事件列表为：%s", events)
         return events
 
     def handle_content(self, events):
@@ -65,23 +45,14 @@ class EventController:
         返回:
             content (str): 构建的通知内容字符串。
         """
-        notification_items = []
-        for event in events:
-            name = event['name']
-            date = event['date']
-            date_str = event['date_str']
-            diff_days = event['diff_days']
-
-            if diff_days == 0 or (isinstance(diff_days, int) and 0 < diff_days <= self.day):
-                if diff_days == 0:
-                    item = f"{name}: {date_str}"
-                else:
-                    item = f"{name}: {date_str}（公历日期：{date}，距离今天{diff_days}天）"
-                notification_items.append(item)
-
-        content = "未来有以下日子需要注意：\n" + "\n".join(notification_items)
+        notification_items = [
+            event for event in events
+            if event['diff_days'] == 0 or (isinstance(event['diff_days'], int) and 0 < event['diff_days'] <= self.day)
+        ]
 
         if notification_items:
+            # 提醒内容由 event/content.j2 模板渲染
+            content = self.templates.event_content(notification_items)
             return {'status': 200, 'message': '邮件准备发送', 'content': content, 'send_email': True}
         else:
             return {'status': 400, 'message': '未来七天内未有事件', 'content': None, 'send_email': False}
@@ -1,3 +1,4 @@
+import os
 import send
 
 
@@ -9,28 +10,34 @@ class LoveQuoteController:
     如果情话为None或包含过滤字段，则进行相应处理。
     """
 
+    # 无法获取有效情话时发送的默认内容，不记入已发送历史
+    FALLBACK_QUOTE = "致亲爱的老婆：今天接口有问题，我亲口跟你说：我永远爱你！"
+
     def __init__(self):
         """
         初始化LoveQuoterController实例。
 
-        在初始化时，调用Service层获取初始情话。
+        在初始化时，从预取的情话库存中取出初始情话。
         """
-        self.logger = send.setup_logger()
-        self.love_quote_service = send.LoveQuoteService()
-        reader = send.ConfigReader()
+        self.logger = send.setup_logger(__name__)
+        self.quote_reservoir = send.get_quote_reservoir()
         # 读取配置文件
-        love_quote_config = reader.get_love_quote_config()
-        self.custom_values, self.max_retries = love_quote_config['Custom_Values'], love_quote_config['Max_Retries']
+        love_quote_config = send.get_config().love_quote
+        self.custom_values, self.max_retries = love_quote_config.custom_values, love_quote_config.max_retries
+        # Custom_Values 与屏蔽词文件编译成的自动机，一次扫描匹配全部屏蔽词
+        self.blocklist = send.get_quote_blocklist()
         self.quote = self.get_initial_quote()
 
     def get_initial_quote(self):
         """
         获取初始情话。
 
-        :return: 从Service层获取的情话字符串，如果获取失败则返回None。
+        库存中的情话已预先过滤，取用无需网络请求；库存不足时在后台补充。
+
+        :return: 从情话库存取出的情话字符串，如果获取失败则返回None。
         """
         try:
-            initial_quote = self.love_quote_service.get_quote()
+            initial_quote = self.quote_reservoir.take()
             return initial_quote
         except Exception as e:
             self.logger.error(f"获取初始情话时发生错误: {e}")
@@ -40,7 +47,7 @@ class LoveQuoteController:
         """
         进行业务逻辑判断并决定是否发送邮件。
 
-        如果情话中包含任何需要过滤的字段，则重新调用API获取新数据。
+        如果情话中包含任何需要过滤的字段，则从库存中重新取一条。
         如果连续3次都包含过滤字段，则返回默认内容。
         否则，准备发送邮件并返回成功状态码及情话内容。
 
@@ -51,14 +58,15 @@ class LoveQuoteController:
         while retries < self.max_retries:
             if not self.quote:
                 self.logger.warning("无法获取有效的情话数据，返回默认数据")
-                self.quote = f"致亲爱的老婆：今天接口有问题，我亲口跟你说：我永远爱你！"
+                self.quote = self.FALLBACK_QUOTE
                 break
 
-            if any(value in self.quote for value in self.custom_values):
-                self.logger.warning(f"情话包含不合适的词语: {self.custom_values}")
+            blocked = self.blocklist.find(self.quote)
+            if blocked:
+                self.logger.warning(f"情话包含不合适的词语: {blocked}")
                 retries += 1
                 if retries >= self.max_retries:
-                    self.quote = f"致亲爱的老婆：今天接口有问题，我亲口跟你说：我永远爱你！"
+                    self.quote = self.FALLBACK_QUOTE
                     break
                 # 重新获取情话
                 self.quote = self.get_initial_quote()
@@ -69,4 +77,14 @@ class LoveQuoteController:
         if self.quote:
             return {'status': 200, 'message': '邮件准备发送', 'quote': self.quote, 'send_email': True}
         else:
-            return {'status': 400, 'message': '无法获取有效的情话数据'}
\ No newline at end of file
+            return {'status': 400, 'message': '无法获取有效的情话数据'}
+
+    def record_sent(self, quote):
+        """
+        将发送成功的情话记入已发送历史，之后相似度不低于 HistoryThreshold 的情话不会再发送。
+
+        :param quote: 已发送的情话，默认内容不记录。
+        """
+        if not quote or quote == self.FALLBACK_QUOTE:
+            return
+        self.quote_reservoir.history.add(quote, recipient=os.environ.get('PUSHPLUS_GROUP_TOPIC', ''))
\ No newline at end of file
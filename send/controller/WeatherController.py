@@ -1,55 +1,209 @@
-from typing import Optional, Dict, Any
+import asyncio
+from itertools import islice
+from typing import Optional, Dict, Any, Sequence
 import send
-import random
 
 
 class WeatherController:
 
     def __init__(self):
-        self.logger = send.setup_logger()
-        config = send.ConfigReader()
-        self.condition = config.get_weather_config().get('Condition')
-        self.cities = config.get_weather_config().get('Cities')
+        self.logger = send.setup_logger(__name__)
+        weather_config = send.get_config().weather
+        # 天气建议的固定开头与开头之后的最大字数，同时替换进提示词
+        self.tip_prefix = weather_config.tip_prefix
+        self.tip_max_length = weather_config.tip_max_length
+        self.condition = (weather_config.condition.replace('{prefix}', self.tip_prefix)
+                          .replace('{max_length}', str(self.tip_max_length)))
+        self.cities = weather_config.cities
+        self.tip_per_city = weather_config.tip_per_city
+        self.tip_regenerations = weather_config.tip_regenerations
+        self.tip_source = weather_config.tip_source
+        self.tip_deadline = weather_config.tip_deadline
+        self.templates = send.get_template_engine()
+        self.tip_validator = send.TipValidator(self.tip_prefix, self.tip_max_length)
         self.weather_service = send.WeatherService()
-
-        # 初始化两个不同的服务实例
-        self.services = {
-            'hunyuan': send.HunYuan(model='hunyuan-pro'),
-            'deepseek': send.DeepSeek(model='deepseek-reasoner')
-        }
-
-    def _get_weather_condition(self, weather_info: Dict[str, Any], service_name: Optional[str] = None) -> Optional[str]:
-        """根据service_name指定或随机选择一个服务实例并获取天气状况建议"""
-        if service_name and service_name in self.services:
-            service = self.services[service_name]
-            self.logger.info(f"手动选择的服务：{service.__class__.__name__}")
-        else:
-            service = random.choice(list(self.services.values()))
-            self.logger.info(f"随机选择的服务：{service.__class__.__name__}")
+        self.alert_engine = send.WeatherAlertEngine()
+        self.tip_cache = send.TipCache()
+
+        # 大模型客户端由路由器在首次使用时创建，缺少某个服务的密钥不影响其他服务
+        self.llm_mode = send.get_config().llm.mode
+        self.router = send.LLMRouter()
+
+    def _get_weather_condition(self, weather_info: Dict[str, Any], service_name: Optional[str] = None,
+                               alerts: Sequence[Any] = ()) -> Optional[str]:
+        """
+        根据service_name指定的服务获取天气状况建议，触发的预警会一并写入提示词。
+
+        未指定时按 LLMConfig 中的 Mode 选择：hedged 为对当前最快的两个后端发起对冲请求，
+        adaptive 为路由到当前最快的后端并在失败时切换，服务名或 "服务/模型" 为固定使用该后端。
+        """
+        service = self._select_service(service_name or self.llm_mode)
+        if service is None:
+            self.logger.error(f"没有可用的大模型服务：{service_name or self.llm_mode}")
+            return None
 
         # 将所有城市的天气信息转换为字符串格式
         weather_str = ', '.join([f"{city}: {info['day2']}" for city, info in weather_info.items()])
-
-        weather_condition = service.send_message(
-            f'{weather_str} {self.condition}'
-        )
-        if not weather_condition:
-            self.logger.warning(f"{service.__class__.__name__}服务返回空结果")
-            return None
-
-        self.logger.info(f"天气状况建议：{weather_condition}")
+        if alerts:
+            weather_str += f" 预警: {'; '.join(alert.description for alert in alerts)}"
+
+        # 回复先在本地校验与修复，只有无法修复时才重新请求
+        for _ in range(self.tip_regenerations + 1):
+            reply = self._send_with_deadline(service, f'{weather_str} {self.condition}')
+            if not reply:
+                self.logger.warning(f"{getattr(service, 'name', service.__class__.__name__)}服务返回空结果")
+                return None
+            weather_condition = self.tip_validator.check(reply)
+            if weather_condition is not None:
+                self.logger.info(f"天气状况建议：{weather_condition}")
+                return weather_condition
+        self.logger.error(f"天气建议重新生成 {self.tip_regenerations} 次后仍不满足要求")
+        return None
+
+    def _send_with_deadline(self, service, content: str) -> Optional[str]:
+        """
+        请求大模型，超过 TipDeadline 秒未返回时取消请求并返回 None，由模板建议兜底。
+
+        流式请求时，回复超出 "开头 + 最大字数" 后在最后一个完整句子处提前结束。
+        """
+        max_chars = len(self.tip_prefix) + self.tip_max_length
+        if not self.tip_deadline:
+            return service.send_message(content, max_chars=max_chars)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                return asyncio.run(asyncio.wait_for(service.async_send_message(content, max_chars=max_chars),
+                                                    self.tip_deadline))
+            except asyncio.TimeoutError:
+                self.logger.warning(f"大模型 {self.tip_deadline}s 内未返回，改用模板建议")
+                return None
+        self.logger.warning("当前线程已有运行中的事件循环，不限制大模型的响应时间")
+        return service.send_message(content, max_chars=max_chars)
+
+    def _template_tips(self, weather_info: Dict[str, Any], alerts: Sequence[Any] = ()) -> Dict[str, Optional[str]]:
+        """用本地模板为每个城市生成天气建议"""
+        return {city: self.templates.weather_tip({city: info}, [alert for alert in alerts if alert.city == city])
+                for city, info in weather_info.items() if info}
+
+    def _get_city_conditions(self, weather_info: Dict[str, Any], service_name: Optional[str] = None,
+                             alerts: Sequence[Any] = ()) -> Dict[str, Optional[str]]:
+        """
+        为每个城市分别生成天气状况建议：先查天气建议缓存，未命中的城市合并为一次批量请求。
+
+        :return: {城市: 建议}，获取失败的城市为 None
+        """
+        tips, keys, items = {}, {}, {}
+        for city, info in weather_info.items():
+            if not info:
+                tips[city] = None
+                continue
+            city_alerts = [alert for alert in alerts if alert.city == city]
+            keys[city] = self.tip_cache.make_key({city: info}, city_alerts)
+            tips[city] = self.tip_cache.get(keys[city])
+            if tips[city] is None:
+                items[city] = f"{city}: {info['day2']}"
+                if city_alerts:
+                    items[city] += f" 预警: {'; '.join(alert.description for alert in city_alerts)}"
+        if not items:
+            self.logger.info("所有城市均命中天气建议缓存")
+            return tips
+
+        service = self._select_service(service_name or self.llm_mode)
+        if service is None:
+            self.logger.error(f"没有可用的大模型服务：{service_name or self.llm_mode}")
+            return tips
+
+        # 可以在本地修复的回复不再重新请求
+        batch = send.BatchLLM(service, max_retries=self.tip_regenerations,
+                              validator=lambda reply: self.tip_validator.repair(reply).tip is not None)
+        for city, reply in batch.send_batch(items, self.condition).items():
+            tips[city] = tip = self.tip_validator.check(reply) if reply else None
+            if tip:
+                self.tip_cache.put(keys[city], tip)
+            else:
+                # 为积累变体而额外生成失败时，使用已有的变体
+                tips[city] = self.tip_cache.get(keys[city], allow_extra=False)
+        self.logger.info(f"各城市天气状况建议：{tips}")
+        return tips
+
+    def _select_service(self, service_name: str):
+        """按名称选择服务：hedged、adaptive、服务名或 "服务/模型" """
+        if service_name == 'hedged':
+            # 取当前最快且客户端可以创建的两个后端
+            ranked = list(islice((backend for backend in self.router.ranked()
+                                  if self.router.client(backend.name) is not None), 2))
+            if len(ranked) < 2:
+                return ranked[0] if ranked else None
+            self.logger.info(f"对冲请求：{ranked[0].name} -> {ranked[1].name}")
+            return send.HedgedLLM(ranked[0], ranked[1])
+        if service_name == 'adaptive':
+            return self.router
+        backend = self.router.backend(service_name)
+        if backend is not None:
+            self.logger.info(f"手动选择的服务：{backend.name}")
+        return backend
+
+    def _get_cached_or_generated_condition(self, weather: Dict[str, Any], service_name: Optional[str],
+                                           alerts: Sequence[Any]) -> Optional[str]:
+        """依次尝试天气建议缓存、大模型与上一次的建议"""
+        tip_key = self.tip_cache.make_key(weather, alerts)
+        weather_condition = self.tip_cache.get(tip_key)
+        if weather_condition is not None:
+            self.logger.info(f"命中天气建议缓存：{tip_key}")
+        elif self.tip_cache.has(tip_key) or self.alert_engine.needs_refresh(alerts, tip_key):
+            # 缓存中已有变体时，本次是为积累变体而额外生成，失败时使用已有的变体
+            weather_condition = self._get_weather_condition(weather, service_name=service_name, alerts=alerts)
+            if weather_condition is not None:
+                self.alert_engine.save(alerts, tip_key, weather_condition)
+                self.tip_cache.put(tip_key, weather_condition)
+            else:
+                weather_condition = self.tip_cache.get(tip_key, allow_extra=False)
+        else:
+            weather_condition = self.alert_engine.cached_tip()
+            self.logger.info("未触发天气预警且天气特征未变化，沿用上一次的天气建议")
+        self._save_state()
         return weather_condition
 
+    def _save_state(self):
+        """运行结束时一次性保存天气建议缓存、校验统计与路由统计，并记录本次运行的统计"""
+        self.tip_cache.save()
+        self.tip_validator.save()
+        self.router.save()
+        self.logger.info("天气建议缓存统计：%s", self.tip_cache.stats())
+        self.logger.info("天气建议校验统计：%s", self.tip_validator.stats())
+        send.get_usage_tracker().log_summary()
+
     def get_weather(self, service_name: Optional[str] = None) -> Optional[str]:
         """获取天气信息并返回天气状况建议"""
         weather = self.weather_service.handle_weathers(self.cities)
-        self.logger.info(f"天气信息：{weather}")
-
-        # 获取天气状况建议
-        weather_condition = self._get_weather_condition(weather, service_name='deepseek')
+        self.logger.info("天气信息：%s", weather)
+
+        # 相近的天气特征优先复用缓存的建议；没有触发预警且天气特征未变化时沿用上一次的建议，不再调用大模型
+        alerts = self.alert_engine.evaluate(weather)
+        if self.tip_per_city and weather:
+            if self.tip_source == 'template':
+                tips = self._template_tips(weather, alerts)
+            else:
+                tips = self._get_city_conditions(weather, service_name=service_name, alerts=alerts)
+                # 大模型未返回建议的城市使用模板建议
+                failed = {city: info for city, info in weather.items() if info and not tips.get(city)}
+                tips.update(self._template_tips(failed, alerts))
+                self._save_state()
+            return '; '.join(f"{city}: {(info or {}).get('day2', '代码有问题，无数据')} "
+                             f"{tips.get(city) or self.templates.weather_fallback()}"
+                             for city, info in weather.items())
+
+        if self.tip_source == 'template':
+            weather_condition = self.templates.weather_tip(weather, alerts)
+        else:
+            weather_condition = self._get_cached_or_generated_condition(weather, service_name, alerts)
 
+        # 大模型失败或超时时使用模板建议
+        if weather_condition is None and weather:
+            weather_condition = self.templates.weather_tip(weather, alerts)
         if weather_condition is None:
-            weather_condition = "温馨提示：今日接口有问题，老婆注意安全，顺便跟我说一下~"
+            weather_condition = self.templates.weather_fallback()
 
         # 拼接天气信息和天气状况建议
         if weather:
@@ -67,10 +221,10 @@ class WeatherController:
 if __name__ == '__main__':
     weather_controller = WeatherController()
 
-    # 示例：可以传入'service_name'参数来手动选择服务，或者不传参以随机选择
+    # 示例：可以传入'service_name'参数来手动选择服务，或者不传参按 LLMConfig 中的 Mode 选择
     weather = weather_controller.get_weather(service_name='hunyuan')  # 手动选择
     # 或者
-    # weather = weather_controller.get_weather()  # 默认随机选择
+    # weather = weather_controller.get_weather()  # 默认按 Mode 选择
 
     if weather:
         print(weather)
@@ -1,9 +1,2 @@
-from .LoveQuoteController import LoveQuoteController
-from .EventController import EventController
-from .WeatherController import WeatherController
-
-__all__ = [
-    'LoveQuoteController',
-    'EventController',
-    'WeatherController'
-]
\ No newline at end of file
+# 与子模块同名的类（如 WeatherController）不在这里导出，请通过 send.WeatherController 访问：
+# 子模块被导入后会以模块对象覆盖子包上的同名属性，子包的 __getattr__ 不再被调用
\ No newline at end of file
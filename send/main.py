@@ -1,13 +1,67 @@
 import send
+import time
 import argparse
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    任务注册项。
+
+    Attributes:
+        name (str): 任务名称，即命令行参数。
+        handler (str): PushPlus 中处理该任务的方法名。
+        dependencies (tuple): 任务依赖的 send 导出名称，运行前才按需导入。
+        import_budget (float): 导入依赖的耗时预算（秒），超出时记录警告。
+    """
+    name: str
+    handler: str
+    dependencies: Tuple[str, ...]
+    import_budget: float
+
+
+# 任务注册表：任务名称 -> Task
+TASKS = {task.name: task for task in (
+    Task('love_quote', 'handle_love_quote',
+         ('PushPlus', 'LoveQuoteApi', 'LoveQuoteService', 'BlocklistMatcher', 'MessageHistory',
+          'QuoteReservoir', 'LoveQuoteController'), import_budget=0.3),
+    Task('event', 'handle_event',
+         ('PushPlus', 'HolidayEngine', 'TemplateEngine', 'EventService', 'EventController'), import_budget=0.3),
+    Task('weather', 'handle_weather',
+         ('PushPlus', 'WeatherApi', 'WeatherService', 'LLMRouter', 'HedgedLLM', 'TemplateEngine', 'WeatherController'),
+         import_budget=1.0),
+)}
 
 
 class PushPlus:
 
     def __init__(self, task_name):
         self.task_name = task_name
-        self.logger = send.setup_logger()
-        self.send_email = send.PushPlus()
+        self.logger = send.setup_logger(__name__)
+        self.send_email = None
+
+    def _load_dependencies(self, task: Task) -> float:
+        """
+        按需导入任务依赖，并记录每个依赖及总体的导入耗时。
+
+        :return: 导入依赖的总耗时（秒）
+        """
+        total_start = time.perf_counter()
+        for dependency in task.dependencies:
+            start = time.perf_counter()
+            getattr(send, dependency)
+            self.logger.debug("导入 %s 耗时 %.1fms", dependency, (time.perf_counter() - start) * 1000)
+        elapsed = time.perf_counter() - total_start
+
+        if elapsed > task.import_budget:
+            self.logger.warning("任务 %s 导入耗时 %.1fms，超出预算 %.1fms",
+                                task.name, elapsed * 1000, task.import_budget * 1000)
+        else:
+            self.logger.info("任务 %s 导入耗时 %.1fms（预算 %.1fms）",
+                             task.name, elapsed * 1000, task.import_budget * 1000)
+        return elapsed
 
     def handle_love_quote(self):
         """处理情话任务"""
@@ -18,7 +72,9 @@ class PushPlus:
 
         if result['status'] == 200 and result.get('send_email', False):
             try:
-                self.send_email.send_reminder_email('每日小情话', result.get('quote'), is_group_send=True)
+                if self.send_email.send_reminder_email('每日小情话', result.get('quote'), is_group_send=True):
+                    # 记入已发送历史，之后不再发送相同或几乎相同的情话
+                    love_quoter_controller.record_sent(result['quote'])
                 self.logger.info(f"邮件已发送, 内容：{result['quote']}")
             except Exception as e:
                 self.logger.error(f"邮件发送失败，原因: {str(e)}")
@@ -68,14 +124,14 @@ class PushPlus:
             self.logger.warning(f"邮件发送失败，原因: 无法获取天气信息")
 
     def run(self):
-        if self.task_name == 'love_quote':
-            self.handle_love_quote()
-        elif self.task_name == 'event':
-            self.handle_event()
-        elif self.task_name == 'weather':
-            self.handle_weather()
-        else:
+        task = TASKS.get(self.task_name)
+        if task is None:
             self.logger.error(f"未知的任务类型: {self.task_name}")
+            return
+
+        self._load_dependencies(task)
+        self.send_email = send.PushPlus()
+        getattr(self, task.handler)()
 
 
 if __name__ == '__main__':
@@ -83,7 +139,7 @@ if __name__ == '__main__':
     default_task = 'weather'
 
     parser = argparse.ArgumentParser(description='PushPlus 任务运行器')
-    parser.add_argument('task', type=str, choices=['love_quote', 'event','weather'],
+    parser.add_argument('task', type=str, choices=list(TASKS),
                         help='指定要运行的任务类型', nargs='?', default=default_task)
 
     args = parser.parse_args()
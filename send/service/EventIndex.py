@@ -0,0 +1,152 @@
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import send
+
+# 事件日期格式："11月14日"，农历闰月写作 "闰4月10日"
+_DATE_PATTERN = re.compile(r'^(闰)?(\d{1,2})月(\d{1,2})日$')
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedEvent:
+    """索引中的一个事件及其下一次发生的公历日期"""
+    ordinal: int
+    name: str
+    date_str: str
+
+    @property
+    def date(self) -> str:
+        return date.fromordinal(self.ordinal).strftime('%Y-%m-%d')
+
+
+class EventIndex:
+    """
+    纪念日/生日事件索引。
+
+    构建时为每个事件计算从 today 起的下一次发生日期（跨年时顺延到下一年，农历按农历年顺延），
+    并按日期序数排序，"未来 N 天内的事件" 即为一次二分查找的区间查询。
+    名称包含过滤词（如"重要"、"紧急"）的事件不做日期换算，始终视为当天提醒。
+    """
+
+    def __init__(self, event_days: Sequence[Tuple[str, str]], pinned_names: Sequence[str],
+                 today: Optional[date] = None):
+        """
+        构建事件索引。
+
+        参数:
+            event_days: [(事件名称, 日期字符串), ...]，名称包含"农历"的按农历日期处理。
+            pinned_names: 过滤词，名称包含任一过滤词的事件始终提醒。
+            today (date, optional): 计算基准日期，默认为今天。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.today = today or date.today()
+        self.pinned: List[Dict] = []
+
+        events = []
+        lunar_events = []
+        for name, date_str in event_days:
+            if any(value in name for value in pinned_names):
+                self.pinned.append({'name': name, 'date_str': date_str, 'date': date_str, 'diff_days': 0})
+                continue
+
+            parsed = self.parse_date(date_str)
+            if parsed is None:
+                self.logger.error(f"无法解析日期 {date_str} 对应的事件 {name}")
+                continue
+            month, day, is_leap = parsed
+
+            if '农历' in name:
+                # 农历事件收集后整列一次查表换算
+                lunar_events.append((name, date_str, month, day, is_leap))
+                continue
+            occurrence = self._next_solar(month, day)
+            if occurrence is None:
+                self.logger.error(f"无法换算日期 {date_str} 对应的事件 {name}")
+                continue
+            events.append(IndexedEvent(occurrence.toordinal(), name, date_str))
+
+        events.extend(self._next_lunar(lunar_events))
+        events.sort(key=lambda event: event.ordinal)
+        self._events = events
+        self._ordinals = [event.ordinal for event in events]
+
+    @staticmethod
+    def parse_date(date_str: str) -> Optional[Tuple[int, int, bool]]:
+        """解析 "x月x日" / "闰x月x日" 格式的日期，返回 (月, 日, 是否闰月)"""
+        match = _DATE_PATTERN.match(date_str.strip())
+        if not match:
+            return None
+        return int(match.group(2)), int(match.group(3)), bool(match.group(1))
+
+    def _next_solar(self, month: int, day: int) -> Optional[date]:
+        """公历日期从今天起的下一次发生日期，非闰年的2月29日按2月28日计算"""
+        for year in (self.today.year, self.today.year + 1):
+            try:
+                occurrence = date(year, month, day)
+            except ValueError:
+                if (month, day) != (2, 29):
+                    return None
+                occurrence = date(year, 2, 28)
+            if occurrence >= self.today:
+                return occurrence
+        return None
+
+    def _next_lunar(self, lunar_events: List[Tuple[str, str, int, int, bool]]) -> List[IndexedEvent]:
+        """
+        批量计算农历事件从今天起的下一次发生日期。
+
+        当年没有对应闰月时按同名普通月份计算；该月没有三十日时按二十九日计算。
+        无法换算的事件单独记录错误并跳过，不影响其他事件。
+        """
+        if not lunar_events:
+            return []
+        _, _, months, days, leaps = zip(*lunar_events)
+        ordinals = send.get_lunar_table().next_occurrences(months, days, leaps, self.today)
+
+        indexed = []
+        for (name, date_str, *_), ordinal in zip(lunar_events, ordinals.tolist()):
+            if ordinal < 0:
+                self.logger.error(f"无法换算日期 {date_str} 对应的事件 {name}")
+                continue
+            indexed.append(IndexedEvent(ordinal, name, date_str))
+        return indexed
+
+    def __len__(self):
+        return len(self._events)
+
+    def events(self) -> List[Dict]:
+        """所有事件（包括始终提醒的事件），日期为下一次发生的公历日期"""
+        return [dict(event) for event in self.pinned] + [{'name': event.name, 'date_str': event.date_str, 'date': event.date}
+                              for event in self._events]
+
+    def within(self, days: int) -> List[Dict]:
+        """
+        查询从今天起 days 天内（含今天）发生的事件，按日期排序。
+
+        返回:
+            [{'name', 'date_str', 'date', 'diff_days'}, ...]
+        """
+        today_ordinal = self.today.toordinal()
+        start = bisect_left(self._ordinals, today_ordinal)
+        end = bisect_right(self._ordinals, today_ordinal + days)
+        return [{'name': event.name, 'date_str': event.date_str, 'date': event.date,
+                 'diff_days': event.ordinal - today_ordinal}
+                for event in self._events[start:end]]
+
+    def upcoming(self, days: int) -> List[Dict]:
+        """始终提醒的事件加上 days 天内发生的事件"""
+        return [dict(event) for event in self.pinned] + self.within(days)
+
+
+@lru_cache(maxsize=1024)
+def get_event_index(event_days: Tuple[Tuple[str, str], ...], pinned_names: Tuple[str, ...],
+                    today: date) -> EventIndex:
+    """
+    获取事件索引，相同的事件列表在同一天内只构建一次。
+
+    参数需可哈希：event_days 与 pinned_names 直接使用配置快照中的元组即可。
+    """
+    return EventIndex(event_days, pinned_names, today)
\ No newline at end of file
@@ -1,5 +1,4 @@
 from datetime import datetime, timedelta
-import lunardate
 import send
 
 class EventService:
@@ -13,15 +12,24 @@ class EventService:
         """
         初始化EventService实例。
 
-        在初始化时，会创建一个EventApi实例用于后续获取日历数据。
+        根据 EventConfig 中的 CalendarSource 创建日历数据来源：local 使用本地节日计算引擎
+        HolidayEngine，juhe 使用聚合数据接口 EventApi。
         """
-        reader = send.ConfigReader()
-        event_config = reader.get_event_config()
-        self.event_days= event_config['EventDays']
-        self.name = event_config['Name']
+        event_config = send.get_config().event
+        self.event_days = event_config.event_days
+        self.name = event_config.name
+        self.prefetch_days = event_config.prefetch_days
+        self.prefetch_budget = event_config.prefetch_budget
+        self.calendar_source = event_config.calendar_source
         self.current_year = datetime.now().year
-        self.event_api = send.EventApi()
-        self.logger = send.setup_logger()
+        self.logger = send.setup_logger(__name__)
+
+        if self.calendar_source == 'juhe':
+            self.event_api = send.EventApi()
+            self.holiday_engine = None
+        else:
+            self.event_api = None
+            self.holiday_engine = send.HolidayEngine()
 
     def get_calendar(self, query_date: str = None) :
         """
@@ -45,14 +53,21 @@ class EventService:
                 query_date = tomorrow.strftime('%Y-%m-%d').replace('-0', '-')
                 self.logger.info("未提供日期，使用明天的日期: %s", query_date)
 
-            # 调用API获取日历数据
-            calendar_data = self.event_api.get_calendar(query_date)
+                # 从明天开始增量预取未来一段时间的日历，之后的查询直接读取本地存储
+                self.prefetch_calendar(tomorrow.date())
+
+            # 获取日历数据：本地计算或调用API
+            if self.holiday_engine is not None:
+                calendar_data = self.holiday_engine.get_calendar(query_date)
+            else:
+                calendar_data = self.event_api.get_calendar(query_date)
 
             # 处理获取到的日历数据
             date_str = self.handle_calendar(calendar_data)
 
-            # 组装节日提醒内容
-            calendar_content = f"节日提醒: {date_str.get('calendar_data')} {date_str.get('calendar_holiday')}"
+            # 组装节日提醒内容（event/calendar.j2 模板）
+            calendar_content = send.get_template_engine().calendar_content(
+                date_str.get('calendar_data'), date_str.get('calendar_holiday'))
 
             if date_str.get('calendar_holiday'):
                 return {'status': 200, 'message': '节日提醒邮件准备发送', 'calendar_content': calendar_content, 'send_email': True}
@@ -64,6 +79,37 @@ class EventService:
             self.logger.error(f"处理日历信息时发生错误: {e}")
             return None, None
 
+    def prefetch_calendar(self, start=None) -> int:
+        """
+        从 start 开始预取 PrefetchDays 天的日历数据到本地存储，每次最多请求 PrefetchBudget 天。
+
+        参数:
+            start (date, optional): 起始日期，默认为明天。
+
+        返回:
+            本次新写入本地存储的天数；使用本地节日计算引擎时无需预取，返回0。
+        """
+        if self.event_api is None:
+            return 0
+        start = start or (datetime.today() + timedelta(days=1)).date()
+        end = start + timedelta(days=self.prefetch_days - 1)
+        return self.event_api.get_calendar_range(start, end, max_requests=self.prefetch_budget)
+
+    def get_upcoming_holidays(self, days: int) -> list:
+        """
+        一次查询未来 days 天内（从明天开始）本地存储中的节日。
+
+        返回:
+            [{'date': 'YYYY-M-D', 'holiday': 节日名称}, ...]，按日期排序。
+        """
+        start = (datetime.today() + timedelta(days=1)).date()
+        end = start + timedelta(days=days - 1)
+        if self.holiday_engine is not None:
+            holidays = self.holiday_engine.holidays(start, end)
+        else:
+            holidays = self.event_api.get_holidays(start, end)
+        return [{'date': f"{day.year}-{day.month}-{day.day}", 'holiday': holiday} for day, holiday in holidays]
+
     def handle_calendar(self, response_data: dict) -> dict:
         """
         从API响应数据中提取日历信息。
@@ -108,44 +154,25 @@ class EventService:
             self.logger.error(f"处理日历信息时发生错误: {e}")
             return {}
 
+    def get_event_index(self, today=None):
+        """
+        获取当天的事件索引，相同配置在同一天内只构建一次。
+
+        参数:
+            today (date, optional): 计算基准日期，默认为今天。
+        """
+        return send.get_event_index(self.event_days, self.name, today or datetime.now().date())
+
     def handle_events(self):
         """
         解析并转换event_days中的日期。
 
-        如果事件名称中包含'农历'，则将对应的农历日期转换为公历。
+        每个事件的日期换算为从今天起下一次发生的公历日期（已过的日期顺延到下一年）；
+        如果事件名称中包含'农历'，则按农历日期换算。
         如果事件名称中包含'重要'或'紧急'，则直接使用提供的日期字符串，不进行转换。
-        返回一个列表，每个元素是字典，包含name和转换后的date。
+        返回一个列表，每个元素是字典，包含name、date_str和转换后的date。
         """
-        handle_events = []
-
-        for _event in self.event_days:
-            name, date_str = _event  # 更清晰地命名变量
-
-            if any(value in name for value in self.name):
-                # 如果名称包含过滤词，则直接使用提供的日期字符串
-                handle_events.append({'name': name, 'date_str':date_str, 'date': date_str})
-                continue  # 跳过后续处理
-
-            # 提取月份和日子
-            month, day = map(int, date_str.replace('月', ' ').replace('日', '').split())
-
-            if '农历' in name:
-                # 将农历转换为公历
-                try:
-                    lunar_date = lunardate.LunarDate(self.current_year, month, day)
-                    solar_date = lunar_date.toSolarDate()
-                    formatted_date = f"{solar_date.year}-{solar_date.month:02d}-{solar_date.day:02d}"
-                except Exception as e:
-                    self.logger.error(f"转换农历日期时出错: {e}")
-                    return None
-            else:
-                # 直接格式化日期
-                formatted_date = f"{self.current_year}-{month:02d}-{day:02d}"
-
-            # 使用字典存储name和formatted_date
-            handle_events.append({'name': name, 'date_str':date_str, 'date': formatted_date})
-
-        return handle_events
+        return self.get_event_index().events()
 
 # 示例调用
 if __name__ == "__main__":
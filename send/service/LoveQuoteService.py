@@ -1,3 +1,5 @@
+import asyncio
+from typing import List
 import send
 
 
@@ -8,13 +10,16 @@ class LoveQuoteService:
     该类负责调用外部API获取随机情话，并对返回的数据进行处理，最终返回格式化后的情话内容。
     """
 
+    # 格式化后情话的固定开头
+    QUOTE_PREFIX = "致亲爱的老婆："
+
     def __init__(self):
         """
         初始化LoveQuoteService实例。
 
         在初始化时，会创建一个LoveQuoteApi实例用于后续获取情话数据。
         """
-        self.logger = send.setup_logger()
+        self.logger = send.setup_logger(__name__)
         self.love_quote_api = send.LoveQuoteApi()
 
     def get_quote(self):
@@ -31,19 +36,70 @@ class LoveQuoteService:
             quote_data = self.love_quote_api.get_random_quote()
 
             # 处理获取到的情话数据
-            content = self.handle_quote(quote_data)
-            if not content:
-                self.logger.warning("获取情话中content为空,返回None")
-                return None
-
-            # 返回去除空白字符后的情话内容
-            return f"致亲爱的老婆：{content.strip()}"
+            return self.format_quote(quote_data)
 
         except Exception as e:
             # 记录错误日志并返回None
             self.logger.error(f"处理情话时发生错误: {e}")
             return None
 
+    def format_quote(self, quote_data):
+        """
+        将API响应数据处理为最终发送的情话。
+
+        :param quote_data: API响应的数据字典。
+        :return: 格式化后的情话字符串，如果没有找到合适的内容则返回None。
+        """
+        content = self.handle_quote(quote_data)
+        if not content:
+            self.logger.warning("获取情话中content为空,返回None")
+            return None
+
+        # 返回去除空白字符后的情话内容
+        return f"{self.QUOTE_PREFIX}{content.strip()}"
+
+    def fetch_quotes(self, count: int, max_concurrency: int = 4) -> List[str]:
+        """
+        批量获取情话，请求轮流发往情话与彩虹屁两个接口。
+
+        若当前线程已有运行中的事件循环，则退回逐个请求。
+
+        :param count: 请求次数
+        :param max_concurrency: 最大并发请求数
+        :return: 获取成功的情话列表（可能少于 count 条，且可能重复）
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_quotes_async(count, max_concurrency))
+        quotes = (self.format_quote(self.love_quote_api.get_random_quote(url))
+                  for url in self._urls(count))
+        return [quote for quote in quotes if quote]
+
+    async def fetch_quotes_async(self, count: int, max_concurrency: int = 4) -> List[str]:
+        """fetch_quotes 的异步版本，并发请求"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with send.AsyncHttpTransport() as transport:
+            love_quote_api = send.AsyncLoveQuoteApi(transport)
+
+            async def fetch(url: str):
+                async with semaphore:
+                    try:
+                        return self.format_quote(await love_quote_api.get_random_quote(url))
+                    except Exception as e:
+                        self.logger.error(f"处理情话时发生错误: {e}")
+                        return None
+
+            quotes = await asyncio.gather(*(fetch(url) for url in self._urls(count)))
+
+        return [quote for quote in quotes if quote]
+
+    def _urls(self, count: int) -> List[str]:
+        """count 个请求依次轮流使用的接口URL"""
+        urls = self.love_quote_api.quote_urls
+        return [urls[index % len(urls)] for index in range(count)]
+
     def handle_quote(self, quote):
         """
         从API响应数据中提取情话内容。
@@ -0,0 +1,220 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+import send
+
+
+class QuoteReservoir:
+    """
+    预取的情话库存。
+
+    从情话与彩虹屁两个接口批量并发获取情话，用屏蔽词（Custom_Values 与 BlocklistFile）预先过滤后保存在缓存目录中，
+    发送时直接从库存头部取出一条（O(1)，无需网络请求）。取用后库存低于 ReservoirLowWater 条时
+    在后台线程中补充到 ReservoirSize 条；库存为空时才同步补充一次。
+    与已发送情话（MessageHistory）相似度不低于 HistoryThreshold 的情话同样会被过滤，库存中互相重复的情话
+    只保留一条；取用时若已发送过相似的情话则丢弃并改记为过滤。补充时按历史的通过率多请求一些，抵消被过滤掉的情话，
+    上游情话池较小、重复增多时请求数随之增加。
+    """
+
+    # 按通过率估算补充请求数时的最大倍数
+    MAX_OVERFETCH = 3.0
+
+    def __init__(self, path: Optional[str] = None, service=None):
+        """
+        初始化库存，参数从 config.ini 的 LoveQuoteConfig 配置段读取。
+
+        参数:
+            path (str, optional): 库存文件路径，默认位于缓存目录下。
+            service (LoveQuoteService, optional): 获取情话的服务，默认在首次补充时创建。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config()
+        love_quote_config = config.love_quote
+        self.capacity = love_quote_config.reservoir_size
+        self.low_water = love_quote_config.reservoir_low_water
+        self.concurrency = love_quote_config.refill_concurrency
+        self.blocklist = send.get_quote_blocklist()
+        self.history = send.get_message_history()
+        self.path = path or config.cache.path('quote_reservoir.json')
+        self._store = send.JsonState(self.path, '情话库存')
+        self._service = service
+        self._lock = threading.Lock()
+        # 同一时间只进行一次补充
+        self._refill_lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+        self._quotes: deque = deque()
+        self._members = set()
+        self._stats = {'fetched': 0, 'accepted': 0, 'rejected': 0, 'duplicates': 0, 'taken': 0}
+        self._load()
+
+    def _load(self):
+        data = self._store.load({})
+        stats, quotes = data.get('stats', {}), data.get('quotes', [])
+        if not isinstance(stats, dict) or not isinstance(quotes, list):
+            self.logger.warning("情话库存格式无效，将重新获取")
+            return
+        self._stats.update(stats)
+        # 过滤词可能已修改，载入时重新过滤
+        for quote in quotes:
+            if isinstance(quote, str) and self.accept(quote):
+                self._quotes.append(quote)
+                self._members.add(quote)
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    @property
+    def service(self):
+        """获取情话的服务，首次使用时创建（需要 TIAN_KEY）"""
+        if self._service is None:
+            self._service = send.LoveQuoteService()
+        return self._service
+
+    def accept(self, quote: Optional[str]) -> bool:
+        """判断情话能否放入库存：非空、不包含过滤词、与库存及已发送的情话都不重复"""
+        return self._rejection(quote) is None
+
+    def _rejection(self, quote: Optional[str]) -> Optional[str]:
+        """情话被过滤的原因：empty、blocked 或 duplicate，可以放入库存时返回 None"""
+        if not quote:
+            return 'empty'
+        if self.blocklist.find(quote) is not None:
+            return 'blocked'
+        if quote in self._members or self.history.match(quote, self._quotes) or self.history.similar(quote):
+            return 'duplicate'
+        return None
+
+    def take(self) -> Optional[str]:
+        """
+        取出一条情话，库存低于低水位时在后台补充。
+
+        返回:
+            情话；库存为空且同步补充失败时返回 None。
+        """
+        quote = self._pop()
+        while quote is not None and self._sent_before(quote):
+            quote = self._pop()
+        if quote is None:
+            self.logger.warning("情话库存为空，同步补充")
+            self.refill()
+            quote = self._pop()
+        if len(self) < self.low_water:
+            self.refill_in_background()
+        self.save()
+        return quote
+
+    def _pop(self) -> Optional[str]:
+        with self._lock:
+            if not self._quotes:
+                return None
+            quote = self._quotes.popleft()
+            self._members.discard(quote)
+            self._stats['taken'] += 1
+        self.logger.info(f"从库存取出情话，剩余 {len(self)} 条")
+        return quote
+
+    def _sent_before(self, quote: str) -> bool:
+        """放入库存后才发送过相似情话的，丢弃并改记为过滤，使补充时的通过率反映重复情况"""
+        match = self.history.similar(quote)
+        if match is None:
+            return False
+        self.logger.info(f"丢弃已发送过的相似情话（相似度 {match[1]:.0f}）: {quote}")
+        with self._lock:
+            for key, delta in (('taken', -1), ('accepted', -1), ('rejected', 1), ('duplicates', 1)):
+                self._stats[key] += delta
+        return True
+
+    def _fetch_count(self, deficit: int) -> int:
+        """按历史通过率估算补足 deficit 条所需的请求数"""
+        fetched, accepted = self._stats['fetched'], self._stats['accepted']
+        overfetch = min(self.MAX_OVERFETCH, fetched / accepted) if fetched and accepted else 1.0
+        return math.ceil(deficit * overfetch)
+
+    def _fetch(self, count: int) -> List[str]:
+        """批量获取情话"""
+        return self.service.fetch_quotes(count, self.concurrency)
+
+    def refill(self) -> int:
+        """
+        同步补充库存到 ReservoirSize 条。
+
+        返回:
+            本次放入库存的情话数量。
+        """
+        with self._refill_lock:
+            deficit = self.capacity - len(self)
+            if deficit <= 0:
+                return 0
+            count = self._fetch_count(deficit)
+            self.logger.info(f"补充情话库存：缺少 {deficit} 条，请求 {count} 次")
+            try:
+                quotes = self._fetch(count)
+            except Exception as e:
+                self.logger.error(f"补充情话库存失败: {e}")
+                return 0
+
+            added = 0
+            with self._lock:
+                self._stats['fetched'] += len(quotes)
+                for quote in quotes:
+                    if len(self._quotes) >= self.capacity:
+                        break
+                    reason = self._rejection(quote)
+                    if reason is None:
+                        self._quotes.append(quote)
+                        self._members.add(quote)
+                        self._stats['accepted'] += 1
+                        added += 1
+                    else:
+                        self._stats['rejected'] += 1
+                        if reason == 'duplicate':
+                            self._stats['duplicates'] += 1
+            self.logger.info(f"情话库存补充 {added} 条（获取 {len(quotes)} 条），当前 {len(self)} 条")
+        self.save()
+        return added
+
+    def refill_in_background(self) -> threading.Thread:
+        """
+        在后台线程中补充库存，已有补充在进行时不重复启动。
+
+        补充线程不是守护线程，进程会在补充完成后才退出。
+        """
+        with self._lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return self._refill_thread
+            self._refill_thread = threading.Thread(target=self.refill, name='quote-refill')
+            self._refill_thread.start()
+            return self._refill_thread
+
+    def wait(self, timeout: Optional[float] = None):
+        """等待后台补充完成"""
+        thread = self._refill_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, float]:
+        """累计获取、通过、过滤（其中重复）与取用次数，以及当前库存数量"""
+        with self._lock:
+            fetched = self._stats['fetched']
+            return {**self._stats, 'accept_rate': self._stats['accepted'] / fetched if fetched else 0.0,
+                    'size': len(self._quotes)}
+
+    def save(self):
+        """将库存与统计写入缓存文件"""
+        with self._lock:
+            self._store.save({'quotes': list(self._quotes), 'stats': self._stats})
+
+
+_reservoir: Optional[QuoteReservoir] = None
+_reservoir_lock = threading.Lock()
+
+
+def get_quote_reservoir() -> QuoteReservoir:
+    """获取进程内共享的 QuoteReservoir 实例"""
+    global _reservoir
+    if _reservoir is None:
+        with _reservoir_lock:
+            if _reservoir is None:
+                _reservoir = QuoteReservoir()
+    return _reservoir
\ No newline at end of file
@@ -0,0 +1,144 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import send
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherAlert:
+    """某个城市明天触发的一条天气预警"""
+    city: str
+    rule: str
+    value: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.city}:{self.rule}"
+
+    @property
+    def description(self) -> str:
+        if self.rule == 'temp_swing':
+            return f"{self.city}明天{'升温' if self.value > 0 else '降温'}{abs(self.value)}°C"
+        if self.rule == 'rain_onset':
+            return f"{self.city}明天转为雨雪天气"
+        if self.rule == 'extreme_high':
+            return f"{self.city}明天高温{self.value}°C"
+        return f"{self.city}明天低温{self.value}°C"
+
+
+class WeatherAlertEngine:
+    """
+    天气预警规则引擎。
+
+    将多个城市今天、明天两天的预报整理为数组，一次向量化计算以下规则：
+    - temp_swing：明天最高或最低气温与今天相差达到 TempSwing；
+    - rain_onset：今天无降水、明天有降水；
+    - extreme_high / extreme_low：明天最高气温不低于 ExtremeHigh / 最低气温不高于 ExtremeLow。
+    上一次生成天气建议时的天气特征（TipCache 的缓存键）、预警集合、生成时间与建议内容保存在缓存目录中；
+    没有触发预警、天气特征与上一次相同且建议未超过 TipTTL 时沿用上一次的建议，否则重新调用大模型。
+    """
+
+    RULES = ('temp_swing', 'rain_onset', 'extreme_high', 'extreme_low')
+
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        初始化规则引擎。
+
+        参数:
+            state_path (str, optional): 预警状态文件，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().weather_alert
+        self.temp_swing = config.temp_swing
+        self.extreme_high = config.extreme_high
+        self.extreme_low = config.extreme_low
+        self.rain_keywords = config.rain_keywords
+        self.state_path = state_path or send.get_config().cache.path('weather_alerts.json')
+        self.tip_ttl = send.get_config().cache.tip_ttl
+        self._lock = threading.Lock()
+        self._store = send.JsonState(self.state_path, '预警状态')
+        self._state: Dict = self._store.load({})
+
+    def _is_rain(self, weather: str) -> bool:
+        return any(keyword in weather for keyword in self.rain_keywords)
+
+    def evaluate(self, weather: Dict[str, Optional[Dict]]) -> List[WeatherAlert]:
+        """
+        计算所有城市明天的预警。
+
+        参数:
+            weather: WeatherService.handle_weathers 的返回值，每个城市需包含前两天的 casts；
+                获取失败或缺少数据的城市会被跳过。
+
+        返回:
+            预警列表，按城市顺序、规则顺序排列。
+        """
+        cities, temps, rain = [], [], []
+        for city, info in weather.items():
+            casts = (info or {}).get('casts') or []
+            if len(casts) < 2:
+                continue
+            try:
+                temps.append([[int(cast['daytemp']), int(cast['nighttemp'])] for cast in casts[:2]])
+            except (KeyError, TypeError, ValueError):
+                self.logger.warning(f"{city} 的预报温度无效，跳过预警计算")
+                continue
+            rain.append([self._is_rain(cast.get('dayweather', '') + cast.get('nightweather', '')) for cast in casts[:2]])
+            cities.append(city)
+        if not cities:
+            return []
+
+        # temps: [城市, 天(今天/明天), (最高, 最低)]
+        temps = np.asarray(temps, dtype=np.int16)
+        rain = np.asarray(rain, dtype=bool)
+        change = temps[:, 1, :] - temps[:, 0, :]
+        # 取最高、最低气温中变化幅度更大的一个
+        swing = np.take_along_axis(change, np.abs(change).argmax(axis=1)[:, None], axis=1)[:, 0]
+
+        fired = {
+            'temp_swing': (np.abs(swing) >= self.temp_swing, swing),
+            'rain_onset': (~rain[:, 0] & rain[:, 1], np.zeros(len(cities), dtype=np.int16)),
+            'extreme_high': (temps[:, 1, 0] >= self.extreme_high, temps[:, 1, 0]),
+            'extreme_low': (temps[:, 1, 1] <= self.extreme_low, temps[:, 1, 1]),
+        }
+        alerts = []
+        for index, city in enumerate(cities):
+            for rule in self.RULES:
+                mask, values = fired[rule]
+                if mask[index]:
+                    alerts.append(WeatherAlert(city, rule, int(values[index])))
+        self.logger.info("天气预警：%s", [alert.description for alert in alerts])
+        return alerts
+
+    def needs_refresh(self, alerts: Sequence[WeatherAlert], tip_key: Optional[str]) -> bool:
+        """
+        是否需要调用大模型重新生成天气建议。
+
+        参数:
+            alerts: 本次触发的预警。
+            tip_key: 本次天气特征的缓存键（TipCache.make_key），缺少预报数据时为 None。
+
+        返回:
+            触发了预警、天气特征或预警集合与上一次不同、上一次的建议已超过 TipTTL 或没有可沿用的建议时返回 True。
+        """
+        with self._lock:
+            state = dict(self._state)
+        if alerts or tip_key is None or not state.get('tip'):
+            return True
+        if time.time() - (state.get('saved_at') or 0) >= self.tip_ttl:
+            return True
+        return state.get('key') != tip_key or state.get('alerts') != sorted(alert.key for alert in alerts)
+
+    def cached_tip(self) -> Optional[str]:
+        """上一次调用大模型生成的天气建议"""
+        with self._lock:
+            return self._state.get('tip')
+
+    def save(self, alerts: Sequence[WeatherAlert], tip_key: Optional[str], tip: str):
+        """记录本次的天气特征、预警集合与生成的天气建议"""
+        state = {'key': tip_key, 'alerts': sorted(alert.key for alert in alerts), 'tip': tip, 'saved_at': time.time()}
+        with self._lock:
+            self._state = state
+            self._store.save(state)
\ No newline at end of file
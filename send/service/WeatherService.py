@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Optional, Dict
 import send
 
@@ -5,16 +6,26 @@ import send
 class WeatherService:
 
     def __init__(self):
-        self.logger = send.setup_logger()
+        self.logger = send.setup_logger(__name__)
         self.weather_api = send.WeatherApi()
+        self.weather_store = send.WeatherStore()
+        self.max_concurrency = send.get_config().weather.max_concurrency
 
     def handle_weathers(self, cities: List[str]) -> Dict[str, Optional[Dict]]:
         """
         获取并处理指定多个地区的天气信息。
 
+        多个地区时并发请求；若当前线程已有运行中的事件循环，则退回逐个请求。
+
         :param cities: 地区名称或查询关键词列表
         :return: 包含每个城市省份、城市及天气预报详情的字典
         """
+        if len(cities) > 1:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.handle_weathers_async(cities))
+
         all_weather_info = {}
         for city in cities:
             weather_info = self._handle_single_city_weather(city)
@@ -22,6 +33,37 @@ class WeatherService:
 
         return all_weather_info
 
+    async def handle_weathers_async(self, cities: List[str], max_concurrency: Optional[int] = None
+                                    ) -> Dict[str, Optional[Dict]]:
+        """
+        并发获取并处理指定多个地区的天气信息。
+
+        :param cities: 地区名称或查询关键词列表
+        :param max_concurrency: 最大并发请求数，默认读取 WeatherConfig 中的 MaxConcurrency
+        :return: 包含每个城市省份、城市及天气预报详情的字典，顺序与 cities 一致
+        """
+        stored = {city: self._load_stored_weather(city) for city in cities}
+        if all(stored.values()):
+            return {city: self._handle_weather_response(city, stored[city]) for city in cities}
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async with send.AsyncHttpTransport() as transport:
+            weather_api = send.AsyncWeatherApi(transport)
+
+            async def fetch(city: str) -> Optional[Dict]:
+                weather = stored[city]
+                if weather is None:
+                    async with semaphore:
+                        self.logger.info(f"开始获取 {city} 的天气信息...")
+                        weather = await weather_api.get_weather(city)
+                    self._store_weather(weather)
+                return self._handle_weather_response(city, weather)
+
+            results = await asyncio.gather(*(fetch(city) for city in cities))
+
+        return dict(zip(cities, results))
+
     def _handle_single_city_weather(self, content: str) -> Optional[Dict]:
         """
         获取并处理单个城市的天气信息。
@@ -29,9 +71,45 @@ class WeatherService:
         :param content: 地区名称或查询关键词
         :return: 包含省份、城市及天气预报详情的字典
         """
-        self.logger.info(f"开始获取 {content} 的天气信息...")
-        weather = self.weather_api.get_weather(content)
-        self.logger.info(f"获取天气信息结果：{weather}")
+        weather = self._load_stored_weather(content)
+        if weather is None:
+            self.logger.info(f"开始获取 {content} 的天气信息...")
+            weather = self.weather_api.get_weather(content)
+            self._store_weather(weather)
+        return self._handle_weather_response(content, weather)
+
+    def _load_stored_weather(self, content: str) -> Optional[Dict]:
+        """
+        本地保存的预报仍是最新时（高德尚未发布新的预报），直接用它组装接口响应，不再请求接口。
+
+        :param content: 地区名称或查询关键词
+        :return: 与 WeatherApi.get_weather 结构一致的响应；仅支持预报天气，无可用数据时返回 None
+        """
+        city_code, ext_code = self.weather_api.resolve(content)
+        if not city_code or ext_code != 'all':
+            return None
+        forecast = self.weather_store.current_forecast(city_code, min_casts=2)
+        if forecast is None:
+            return None
+        self.logger.info(f"{content} 的预报({forecast['reporttime']}发布)仍是最新，使用本地数据")
+        return {'status': 200, 'message': 'success', 'data': {'lives': [], 'forecast': [forecast]}}
+
+    def _store_weather(self, weather: Dict):
+        """将接口返回的预报保存到本地，供后续运行复用及查询历史"""
+        if weather.get('status') != 200:
+            return
+        for forecast in weather['data']['forecast']:
+            self.weather_store.put_forecast(forecast)
+
+    def _handle_weather_response(self, content: str, weather: Dict) -> Optional[Dict]:
+        """
+        处理单个城市的天气接口响应。
+
+        :param content: 地区名称或查询关键词
+        :param weather: WeatherApi.get_weather 返回的结构化响应
+        :return: 包含省份、城市及天气预报详情的字典
+        """
+        self.logger.debug("获取天气信息结果：%s", weather)
 
         if weather.get('status') != 200:
             self.logger.error(f"获取{content}天气信息失败，错误信息：{weather.get('message')}")
@@ -65,9 +143,9 @@ class WeatherService:
         提取当天和第二天的天气预报信息，并格式化为易读的字符串。
 
         :param weather_dict: 包含天气预报详情的字典
-        :return: 包含格式化后的当天和第二天天气预报信息的字典
+        :return: 包含格式化后的当天和第二天天气预报信息的字典，casts 为这两天的原始预报（供预警规则使用）
         """
-        forecast_info = {}
+        forecast_info = {'casts': weather_dict['casts'][:2]}
 
         for i in range(2):  # 只处理前两天的数据
             cast = weather_dict['casts'][i]
@@ -1,9 +1,22 @@
-from .LoveQuoteService import LoveQuoteService
-from .EventService import EventService
-from .WeatherService import WeatherService
-
-__all__ = [
-    'LoveQuoteService',
-    'EventService',
-    'WeatherService'
-]
\ No newline at end of file
+import importlib
+
+# 与子模块同名的类（如 WeatherService）不在这里导出，请通过 send.WeatherService 访问：
+# 子模块被导入后会以模块对象覆盖子包上的同名属性，子包的 __getattr__ 不再被调用
+# 导出名称 -> 所在模块
+_LAZY_IMPORTS = {
+    'get_event_index': '.EventIndex',
+    'WeatherAlert': '.WeatherAlertEngine',
+    'get_quote_reservoir': '.QuoteReservoir'
+}
+
+__all__ = ['get_event_index', 'WeatherAlert', 'get_quote_reservoir']
+
+
+def __getattr__(name):
+    """首次访问时才导入对应模块，避免一次性加载所有依赖"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Callable, Optional
+import httpx
+import send
+from .HttpCache import CachedResponse, HttpCache
+from .HttpTransport import resolve_cache
+
+
+class AsyncHttpTransport:
+    """
+    HttpTransport 的异步版本，基于 httpx.AsyncClient。
+
+    httpx 的客户端与事件循环绑定，因此不做进程级共享，而是在一次并发任务内
+    通过 ``async with AsyncHttpTransport() as transport`` 复用连接池。
+    重试策略与 HttpTransport 一致：连接失败由 httpx 重试，指定状态码仅对幂等请求按退避重试。
+    """
+
+    def __init__(self, timeout=None, pool_max_size=None, max_retries=None, backoff_factor=None,
+                 retry_status=None, cache: Optional[HttpCache] = None, use_cache=True):
+        """
+        初始化异步传输层，未传入的参数从 config.ini 的 HttpConfig 配置段读取。
+
+        Args:
+            timeout (float): 默认请求超时时间（秒）。
+            pool_max_size (int): 连接池的最大连接数。
+            max_retries (int): 最大重试次数。
+            backoff_factor (float): 重试退避系数。
+            retry_status (tuple): 需要重试的 HTTP 状态码。
+            cache (HttpCache): 响应缓存，默认使用进程内共享的持久化缓存。
+            use_cache (bool): 是否对配置了 TTL 的 GET 请求使用响应缓存。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().http
+
+        self.timeout = timeout if timeout is not None else config.timeout
+        self.max_retries = max_retries if max_retries is not None else config.max_retries
+        self.backoff_factor = backoff_factor if backoff_factor is not None else config.backoff_factor
+        self.retry_status = frozenset(retry_status if retry_status is not None else config.retry_status)
+        pool_max_size = pool_max_size if pool_max_size is not None else config.pool_max_size
+        self.cache = cache
+        self.use_cache = use_cache
+
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=pool_max_size, max_keepalive_connections=pool_max_size),
+            transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+        )
+
+    async def request(self, method: str, url: str, cache_check: Optional[Callable] = None,
+                      **kwargs) -> httpx.Response:
+        """
+        发送 HTTP 请求，缓存策略与 HttpTransport.request 一致。
+
+        :param cache_check: 可选，判断 200 响应能否写入缓存的函数
+        :raises httpx.HTTPError: 请求失败时抛出
+        """
+        cache, ttl = resolve_cache(self.cache, self.use_cache, method, url)
+        if cache is None:
+            return await self._send(method, url, **kwargs)
+
+        key = cache.key_for(method, url, kwargs.get('params'))
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry, ttl):
+            self.logger.debug("命中HTTP缓存: %s", entry.url)
+            return self._cached_response(entry, method)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            headers.update(entry.validators)
+        response = await self._send(method, url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.logger.debug("HTTP缓存重新验证通过: %s", entry.url)
+            cache.refresh(key)
+            return self._cached_response(entry, method)
+        if response.status_code == 200 and (cache_check is None or cache_check(response)):
+            cache.put(key, url, response.status_code, response.headers, response.content)
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，对幂等请求的可重试状态码按退避策略重试"""
+        attempt = 0
+        while True:
+            response = await self.client.request(method, url, **kwargs)
+            if (method not in ('GET', 'HEAD') or response.status_code not in self.retry_status
+                    or attempt >= self.max_retries):
+                return response
+            delay = self.backoff_factor * (2 ** attempt)
+            self.logger.warning("请求返回状态码 %s，%.1f 秒后重试", response.status_code, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _cached_response(entry: CachedResponse, method: str) -> httpx.Response:
+        """将缓存条目还原为 httpx.Response"""
+        return httpx.Response(
+            entry.status,
+            headers=entry.headers,
+            content=entry.body,
+            request=httpx.Request(method, entry.url)
+        )
+
+    async def get(self, url: str, params=None, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, params=params, **kwargs)
+
+    async def post(self, url: str, data=None, json=None, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, data=data, json=json, **kwargs)
+
+    async def aclose(self):
+        """关闭客户端及其连接池"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
\ No newline at end of file
@@ -0,0 +1,35 @@
+from .PushPlus import PushPlus
+
+
+class AsyncPushPlus(PushPlus):
+    """
+    PushPlus 的异步版本。
+
+    请求体构造与结果处理复用 PushPlus，仅将网络请求替换为异步请求。
+    """
+
+    def __init__(self, transport):
+        """
+        初始化AsyncPushPlus实例。
+
+        Args:
+            transport (AsyncHttpTransport): 异步HTTP传输层。
+        """
+        super().__init__(transport=transport)
+
+    async def send_reminder_email(self, title, content, is_group_send=False):
+        """
+        通过PushPlus服务异步发送邮件提醒。
+
+        Args:
+            title (str): 邮件标题。
+            content (str): 邮件内容。
+            is_group_send (bool): 是否群组发送，默认为False（即个人接收）。
+
+        Returns:
+            bool: PushPlus 是否返回发送成功。
+        """
+        data = self._build_payload(title, content, is_group_send)
+        headers = {'Content-Type': 'application/json'}
+        response = await self.transport.post(self.url, json=data, headers=headers)
+        return self._handle_response(response)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import json
+import re
+from typing import Callable, Dict, Optional
+import send
+
+# 回复外层可能包裹的 ```json 代码块
+_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+class BatchLLM:
+    """
+    批量请求：将多个相互独立的请求合并为一次大模型调用。
+
+    所有请求与共同的要求写入同一个提示词，要求模型按约定的 JSON 结构逐项返回：
+        {"results": [{"id": "请求编号", "reply": "回复内容"}, ...]}
+    解析后按编号拆分并逐项校验，只有缺失或未通过校验的请求会在下一轮中重新请求，
+    N 次串行的慢请求因此通常只需要一次调用。service 可以是 DeepSeek、HunYuan、LLMRouter 或 HedgedLLM。
+    """
+
+    def __init__(self, service, max_retries: int = 2, validator: Optional[Callable[[str], bool]] = None):
+        """
+        :param service: 提供 send_message / async_send_message 的大模型服务
+        :param max_retries: 首次请求之后，针对失败项的最多重试轮数
+        :param validator: 校验单项回复的函数，默认只要求回复非空
+        """
+        self.logger = send.setup_logger(__name__)
+        self.service = service
+        self.max_retries = max_retries
+        self.validator = validator or (lambda reply: bool(reply.strip()))
+
+    @staticmethod
+    def build_prompt(items: Dict[str, str], instruction: str = '') -> str:
+        """将多个请求与共同要求组装为一个提示词"""
+        requests = json.dumps([{'id': item_id, 'request': content} for item_id, content in items.items()],
+                              ensure_ascii=False)
+        return (f"下面是 {len(items)} 个相互独立的请求，请分别完成每一个请求。"
+                f"{'每个请求的共同要求：' + instruction if instruction else ''}\n"
+                f"请求列表（JSON）：{requests}\n"
+                '只返回一个 JSON 对象，不要包含其他文字，格式为 '
+                '{"results": [{"id": "与请求相同的id", "reply": "该请求的回复"}]}，每个请求对应一项。')
+
+    def parse(self, response: Optional[str], items: Dict[str, str]) -> Dict[str, str]:
+        """解析模型返回的 JSON，返回通过校验的 {id: 回复}；无法解析时返回空字典"""
+        if not response:
+            return {}
+        text = _FENCE.sub('', response.strip())
+        start, end = text.find('{'), text.rfind('}')
+        try:
+            results = json.loads(text[start:end + 1])['results']
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"批量回复不是约定的 JSON 结构: {e}")
+            return {}
+
+        replies = {}
+        for result in results if isinstance(results, list) else []:
+            if not isinstance(result, dict):
+                continue
+            item_id, reply = str(result.get('id')), result.get('reply')
+            if item_id in items and isinstance(reply, str) and self.validator(reply):
+                replies[item_id] = reply.strip()
+        return replies
+
+    def _finish(self, replies: Dict[str, str], items: Dict[str, str]) -> Dict[str, Optional[str]]:
+        failed = [item_id for item_id in items if item_id not in replies]
+        if failed:
+            self.logger.error(f"批量请求中 {len(failed)} 项在重试后仍失败: {failed}")
+        return {item_id: replies.get(item_id) for item_id in items}
+
+    def send_batch(self, items: Dict[str, str], instruction: str = '', **kwargs) -> Dict[str, Optional[str]]:
+        """
+        批量发送请求。
+
+        :param items: {请求编号: 请求内容}
+        :param instruction: 所有请求共同的要求，只在提示词中出现一次
+        :param kwargs: 透传给大模型服务的参数
+        :return: {请求编号: 回复}，重试后仍失败的项为 None
+        """
+        replies, pending = {}, dict(items)
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            self.logger.info(f"批量请求第 {attempt + 1} 轮：{len(pending)} 项")
+            replies.update(self.parse(self.service.send_message(self.build_prompt(pending, instruction), **kwargs),
+                                      pending))
+            pending = {item_id: content for item_id, content in pending.items() if item_id not in replies}
+        return self._finish(replies, items)
+
+    async def async_send_batch(self, items: Dict[str, str], instruction: str = '', **kwargs
+                               ) -> Dict[str, Optional[str]]:
+        """send_batch 的异步版本"""
+        replies, pending = {}, dict(items)
+        for attempt in range(self.max_retries + 1):
+            if not pending:
+                break
+            self.logger.info(f"批量请求第 {attempt + 1} 轮：{len(pending)} 项")
+            response = await self.service.async_send_message(self.build_prompt(pending, instruction), **kwargs)
+            replies.update(self.parse(response, pending))
+            pending = {item_id: content for item_id, content in pending.items() if item_id not in replies}
+        return self._finish(replies, items)
\ No newline at end of file
@@ -0,0 +1,155 @@
+import os
+import threading
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import send
+
+# 繁简字对照表，位于 send/data
+T2S_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 't2s.tsv')
+
+
+def _load_t2s(path: str) -> Dict[int, str]:
+    """读取 繁体字<TAB>简体字 格式的对照表，返回 str.translate 使用的映射"""
+    table = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                traditional, simplified = line.split('\t', 1)
+                table[ord(traditional)] = simplified
+    except (IOError, ValueError) as e:
+        send.setup_logger(__name__).error(f"读取繁简字对照表失败: {e}")
+    return table
+
+
+class BlocklistMatcher:
+    """
+    基于 Aho-Corasick 自动机的多模式屏蔽词匹配。
+
+    所有屏蔽词编译为一个自动机，一次扫描文本即可找出全部命中的屏蔽词，耗时与屏蔽词数量无关，
+    适合数千个屏蔽词的群发场景。开启归一化时，文本与屏蔽词在匹配前统一做 NFKC（全角转半角）、
+    转小写、繁体转简体，并去除标点、符号与空白，"嫁 給 你！" 同样会命中 "嫁给你"。
+    数千个屏蔽词的构建只需几十毫秒，每次运行时重新构建，进程内相同的屏蔽词只构建一次（见 get_blocklist_matcher）。
+    """
+
+    def __init__(self, patterns: Iterable[str], normalize: bool = True):
+        """
+        初始化匹配器。
+
+        参数:
+            patterns (iterable): 屏蔽词。
+            normalize (bool): 是否在匹配前归一化文本与屏蔽词。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.normalize_text = normalize
+        self._t2s = _load_t2s(T2S_FILE) if normalize else {}
+        # 归一化后的屏蔽词 -> 原始屏蔽词，归一化后为空的屏蔽词忽略
+        self.patterns: Dict[str, str] = {}
+        for pattern in patterns:
+            key = self.normalize(pattern)
+            if key:
+                self.patterns.setdefault(key, pattern)
+        self._goto, self._fail, self._output = self._build()
+
+    def normalize(self, text: str) -> str:
+        """归一化文本：NFKC、转小写、繁体转简体，去除标点、符号、空白与控制字符"""
+        if not self.normalize_text:
+            return text
+        text = unicodedata.normalize('NFKC', text).lower().translate(self._t2s)
+        return ''.join(char for char in text if unicodedata.category(char)[0] not in 'PSZC')
+
+    def _build(self) -> Tuple[List[Dict[str, int]], List[int], List[Tuple[str, ...]]]:
+        """构建 goto / fail / output 表"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[str]] = [[]]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].append(pattern)
+
+        # 按层次遍历计算失败指针，并把失败指针所指状态的输出合并进来
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                if state:
+                    target = fail[state]
+                    while target and char not in goto[target]:
+                        target = fail[target]
+                    fail[child] = goto[target].get(char, 0)
+                output[child].extend(output[fail[child]])
+
+        self.logger.debug(f"屏蔽词自动机已构建：{len(self.patterns)} 个屏蔽词，{len(goto)} 个状态")
+        return goto, fail, [tuple(patterns) for patterns in output]
+
+    def _scan(self, text: str, first: bool) -> List[str]:
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for char in self.normalize(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                if first:
+                    return [self.patterns[output[state][0]]]
+                matches.extend(self.patterns[pattern] for pattern in output[state])
+        return list(dict.fromkeys(matches))
+
+    def find(self, text: Optional[str]) -> Optional[str]:
+        """返回文本中第一个命中的屏蔽词（原始写法），未命中时返回 None"""
+        if not text or not self.patterns:
+            return None
+        matches = self._scan(text, first=True)
+        return matches[0] if matches else None
+
+    def find_all(self, text: Optional[str]) -> List[str]:
+        """返回文本中命中的全部屏蔽词（原始写法，去重并按出现顺序排列）"""
+        if not text or not self.patterns:
+            return []
+        return self._scan(text, first=False)
+
+    def __contains__(self, text: str) -> bool:
+        return self.find(text) is not None
+
+
+_matchers: Dict[Tuple, BlocklistMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_blocklist_matcher(patterns: Iterable[str], normalize: bool = True) -> BlocklistMatcher:
+    """获取进程内共享的匹配器，相同的屏蔽词与归一化选项只构建一次"""
+    key = (tuple(patterns), normalize)
+    with _matchers_lock:
+        if key not in _matchers:
+            _matchers[key] = BlocklistMatcher(key[0], normalize)
+        return _matchers[key]
+
+
+def read_blocklist_file(path: str) -> List[str]:
+    """读取屏蔽词文件，每行一个屏蔽词，忽略空行与 # 开头的注释"""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    except IOError as e:
+        send.setup_logger(__name__).error(f"读取屏蔽词文件失败: {e}")
+        return []
+
+
+def get_quote_blocklist() -> BlocklistMatcher:
+    """情话的屏蔽词匹配器：LoveQuoteConfig 中的 Custom_Values 与 BlocklistFile 中的屏蔽词"""
+    config = send.get_config().love_quote
+    patterns = list(config.custom_values)
+    if config.blocklist_file:
+        patterns.extend(read_blocklist_file(config.blocklist_file))
+    return get_blocklist_matcher(patterns, config.blocklist_normalize)
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import send
+
+
+class CalendarStore:
+    """
+    本地日历存储，按日保存聚合数据日历接口返回的 data 字段。
+
+    以公历日期序数(date.toordinal())为主键，节日单独成列并建立索引，
+    可以一次查询出任意区间内的节日。
+    """
+
+    def __init__(self, path=None):
+        """
+        初始化日历存储。
+
+        参数:
+            path (str): SQLite 数据库文件路径，默认位于 CacheConfig 配置的缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or send.get_config().cache.path('calendar.sqlite3'),
+                                     check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS days ('
+            'ordinal INTEGER PRIMARY KEY, holiday TEXT NOT NULL, data TEXT NOT NULL)'
+        )
+        # 旧版本的索引条件用双引号书写，SQLite 会先把它当作列名解析，替换为使用字符串字面量的索引
+        self._conn.execute('DROP INDEX IF EXISTS days_holiday')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS days_holiday_set ON days (holiday) WHERE holiday != ''")
+        self._conn.commit()
+
+    def get(self, day: date) -> Optional[Dict]:
+        """读取指定日期的日历数据，不存在时返回None"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM days WHERE ordinal = ?', (day.toordinal(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, day: date, data: Dict):
+        """保存指定日期的日历数据"""
+        self.put_many([(day, data)])
+
+    def put_many(self, items: List[Tuple[date, Dict]]):
+        """批量保存日历数据"""
+        rows = [(day.toordinal(), data.get('holiday') or '', json.dumps(data, ensure_ascii=False))
+                for day, data in items]
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO days (ordinal, holiday, data) VALUES (?, ?, ?)', rows)
+            self._conn.commit()
+
+    def missing(self, start: date, end: date) -> List[date]:
+        """返回 [start, end] 区间内尚未保存的日期"""
+        with self._lock:
+            stored = {row[0] for row in self._conn.execute(
+                'SELECT ordinal FROM days WHERE ordinal BETWEEN ? AND ?', (start.toordinal(), end.toordinal())
+            )}
+        return [start + timedelta(days=offset) for offset in range((end - start).days + 1)
+                if (start + timedelta(days=offset)).toordinal() not in stored]
+
+    def holidays(self, start: date, end: date) -> List[Tuple[date, str]]:
+        """一次查询 [start, end] 区间内的所有节日，按日期排序"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ordinal, holiday FROM days WHERE ordinal BETWEEN ? AND ? AND holiday != '' ORDER BY ordinal",
+                (start.toordinal(), end.toordinal())
+            ).fetchall()
+        return [(date.fromordinal(ordinal), holiday) for ordinal, holiday in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
\ No newline at end of file
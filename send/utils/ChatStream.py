@@ -0,0 +1,120 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# 句子结束符，提前结束流式输出时优先在这些字符之后截断
+SENTENCE_ENDINGS = '。！？!?～~…'
+# 预算内没有完整句子时，退回在最后一个分句处截断并补上句号
+CLAUSE_ENDINGS = '，,；;、'
+
+
+@dataclass(slots=True)
+class StreamResult:
+    """一次流式请求的结果与耗时统计（秒）"""
+    content: str = ''
+    first_token: Optional[float] = None
+    ttft: Optional[float] = None
+    elapsed: float = 0.0
+    closed_early: bool = False
+    # 接口在最后一个分片中返回的用量（需请求时开启 stream_options.include_usage），提前结束时为 None
+    usage: Optional[object] = None
+    # 实际收到的回复与思考内容（截断前），用量缺失时用于估算 token 数
+    received: str = ''
+    reasoning: str = ''
+
+    def summary(self) -> str:
+        def seconds(value):
+            return '-' if value is None else f"{value:.2f}s"
+        return (f"首token {seconds(self.first_token)}，TTFT {seconds(self.ttft)}，总耗时 {seconds(self.elapsed)}"
+                f"{'，已提前结束' if self.closed_early else ''}")
+
+
+class ChatStream:
+    """
+    收集 OpenAI 兼容接口的流式响应。
+
+    每收到一段回复内容就交给 on_token 回调，并记录首个 token（含推理模型的思考内容）与首个回复 token 的耗时(TTFT)。
+    设置 max_chars 后，回复长度一旦超出预算就关闭连接，只保留预算内最后一个完整的句子，
+    不必等待模型输出多余的解释或后续内容。
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, on_token: Optional[Callable[[str], None]] = None):
+        """
+        :param max_chars: 回复的最大字符数，None 表示不提前结束
+        :param on_token: 收到回复内容时的回调
+        """
+        self.max_chars = max_chars
+        self.on_token = on_token
+        self.result = StreamResult()
+        self._parts = []
+        self._reasoning = []
+        self._length = 0
+        self._started = time.monotonic()
+
+    def feed(self, chunk) -> bool:
+        """
+        处理一个流式分片。
+
+        :return: 已满足长度预算、应当关闭连接时返回 True
+        """
+        if getattr(chunk, 'usage', None):
+            self.result.usage = chunk.usage
+        if not chunk.choices:
+            return False
+        delta = chunk.choices[0].delta
+        now = time.monotonic() - self._started
+        reasoning = getattr(delta, 'reasoning_content', None)
+        if self.result.first_token is None and (delta.content or reasoning):
+            self.result.first_token = now
+        if reasoning:
+            self._reasoning.append(reasoning)
+        if not delta.content:
+            return False
+
+        if self.result.ttft is None:
+            self.result.ttft = now
+        self._parts.append(delta.content)
+        self._length += len(delta.content)
+        if self.on_token:
+            self.on_token(delta.content)
+
+        if self.max_chars is not None and self._length > self.max_chars:
+            self.result.closed_early = True
+            return True
+        return False
+
+    def finish(self) -> StreamResult:
+        """结束收集，返回结果；提前结束时截断到预算内最后一个完整的句子"""
+        content = self.result.received = ''.join(self._parts)
+        self.result.reasoning = ''.join(self._reasoning)
+        if self.result.closed_early:
+            within = content[:self.max_chars]
+            end = max(within.rfind(ending) for ending in SENTENCE_ENDINGS)
+            if end >= 0:
+                content = within[:end + 1]
+            else:
+                end = max(within.rfind(ending) for ending in CLAUSE_ENDINGS)
+                content = within[:end] + '。' if end > 0 else within
+        self.result.content = content.strip()
+        self.result.elapsed = time.monotonic() - self._started
+        return self.result
+
+    def collect(self, stream) -> StreamResult:
+        """读取同步流式响应，满足预算或读取完毕后关闭连接"""
+        try:
+            for chunk in stream:
+                if self.feed(chunk):
+                    break
+        finally:
+            stream.close()
+        return self.finish()
+
+    async def async_collect(self, stream) -> StreamResult:
+        """读取异步流式响应，满足预算、读取完毕或被取消后关闭连接"""
+        try:
+            async for chunk in stream:
+                if self.feed(chunk):
+                    break
+        finally:
+            await stream.close()
+        return self.finish()
\ No newline at end of file
@@ -0,0 +1,167 @@
+import threading
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+from rapidfuzz import fuzz, process
+import send
+
+# 生成简称时去掉的行政区划后缀，按长度从长到短匹配
+_SUFFIXES = ('特别行政区', '维吾尔自治区', '壮族自治区', '回族自治区', '自治区', '自治州', '自治县', '省', '市', '区', '县')
+
+
+class CityResolver:
+    """
+    天气查询内容解析器：将 "南宁市青秀区实况天气" 这类查询解析为 (城市编码adcode, 气象类型)。
+
+    构建时一次性加载配置中的城市与气象类型，以及随包附带的高德行政区划编码表，生成：
+    - 精确匹配表：全称、简称以及"上级+本级"的组合名称 -> adcode；
+    - 最长名称匹配：在查询内容中逐个位置查找最长的已知名称，查找次数只与查询长度有关；
+      命中省、市时，剩余内容只在其下级行政区中模糊匹配，如 "南宁市青秀去" 取青秀区；
+    - 模糊匹配：以上都未命中时，用 RapidFuzz 在全部名称中查找几乎相同的名称。
+    城市的模糊匹配只接受高置信度的结果，宁可返回 None 也不返回其他城市的编码。
+    同一查询的解析结果会被缓存，重复查询不再重新匹配。
+    """
+
+    MIN_SCORE = 50  # 气象类型模糊匹配最低置信度
+    MIN_CITY_SCORE = 85  # 全部名称中模糊匹配城市的最低置信度
+    MIN_AREA_SCORE = 70  # 已命中省、市的下级行政区中模糊匹配的最低置信度
+    CACHE_SIZE = 4096
+
+    def __init__(self, city_map: Mapping[str, str], extensions_map: Mapping[str, str],
+                 adcode_file: Optional[str] = None):
+        """
+        构建解析索引。
+
+        参数:
+            city_map: 配置中的 {城市名称: adcode}，优先级高于行政区划编码表。
+            extensions_map: 配置中的 {气象类型名称: extensions 参数}。
+            adcode_file (str, optional): 行政区划编码表文件，为空时只使用配置中的城市。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.extensions_map = dict(extensions_map)
+        self.names: Dict[str, str] = {}
+        self._levels: Dict[str, int] = {}
+
+        if adcode_file:
+            self._load_adcodes(adcode_file)
+        # 配置中的城市名称最后写入，覆盖编码表中的同名条目
+        for name, adcode in city_map.items():
+            self._add(name, adcode, -1)
+            self._add(self._short_name(name), adcode, -1)
+
+        self._max_length = max(map(len, self.names), default=0)
+        self._choices: List[str] = list(self.names)
+        self.resolve = lru_cache(maxsize=self.CACHE_SIZE)(self._resolve)
+
+    def _load_adcodes(self, path: str):
+        """读取 adcode<TAB>名称 格式的编码表，并由 adcode 推出上级行政区生成组合名称"""
+        rows = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    adcode, name = line.split('\t', 1)
+                    rows[adcode] = name
+        except (IOError, ValueError) as e:
+            self.logger.error(f"读取行政区划编码表失败: {e}")
+            return
+
+        for adcode, name in rows.items():
+            province, city = adcode[:2] + '0000', adcode[:4] + '00'
+            level = 0 if adcode == province else 1 if adcode == city else 2
+            prefixes = ['']
+            if level == 2 and city in rows:
+                prefixes.append(rows[city])
+            if level >= 1 and province in rows:
+                prefixes.extend([rows[province] + prefix for prefix in prefixes])
+            for prefix in prefixes:
+                self._add(prefix + name, adcode, level)
+                self._add(prefix + self._short_name(name), adcode, level)
+
+    def _add(self, name: str, adcode: str, level: int):
+        """登记名称；同名时保留级别更高（数值更小）的行政区，避免区县简称覆盖城市"""
+        if len(name) < 2:
+            return
+        if name in self.names and self._levels[name] <= level:
+            return
+        self.names[name] = adcode
+        self._levels[name] = level
+
+    @staticmethod
+    def _short_name(name: str) -> str:
+        for suffix in _SUFFIXES:
+            if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+                return name[:-len(suffix)]
+        return name
+
+    def _match_extension(self, content: str) -> Tuple[Optional[str], str]:
+        """匹配气象类型，返回 (extensions 参数, 去掉气象类型后的剩余内容)"""
+        for name in sorted(self.extensions_map, key=len, reverse=True):
+            if name in content:
+                return self.extensions_map[name], content.replace(name, '')
+        match = process.extractOne(content, self.extensions_map.keys(), score_cutoff=self.MIN_SCORE)
+        self.logger.debug("气象模糊匹配: %s", match)
+        return (self.extensions_map[match[0]] if match else None), content
+
+    def _match_city(self, content: str) -> Optional[str]:
+        """依次尝试精确匹配、最长名称匹配和模糊匹配"""
+        content = content.strip()
+        if content in self.names:
+            return self.names[content]
+
+        # 取最长的已知名称；长度相同时取更具体的行政区，如 "桂林阳朔" 取阳朔县
+        best = None
+        for start in range(len(content)):
+            for end in range(min(len(content), start + self._max_length), start + 1, -1):
+                name = content[start:end]
+                if name in self.names:
+                    if best is None or (len(name), self._levels[name]) > (len(best), self._levels[best]):
+                        best = name
+                    break
+        if best is not None:
+            self.logger.debug("城市名称匹配: %s", best)
+            return self._match_area(self.names[best], content.replace(best, '', 1))
+
+        match = process.extractOne(content, self._choices, scorer=fuzz.ratio, score_cutoff=self.MIN_CITY_SCORE)
+        self.logger.debug("城市模糊匹配: %s", match)
+        return self.names[match[0]] if match else None
+
+    def _match_area(self, adcode: str, remainder: str) -> str:
+        """在省、市的下级行政区中模糊匹配剩余内容，未命中时返回该省、市本身"""
+        if adcode.endswith('0000'):
+            prefix = adcode[:2]
+        elif adcode.endswith('00'):
+            prefix = adcode[:4]
+        else:
+            return adcode
+        remainder = remainder.strip()
+        if len(remainder) < 2:
+            return adcode
+        choices = [name for name, code in self.names.items() if code != adcode and code.startswith(prefix)]
+        match = process.extractOne(remainder, choices, scorer=fuzz.ratio, score_cutoff=self.MIN_AREA_SCORE)
+        self.logger.debug("下级行政区模糊匹配: %s", match)
+        return self.names[match[0]] if match else adcode
+
+    def _resolve(self, content: str) -> Tuple[Optional[str], Optional[str]]:
+        ext_code, remainder = self._match_extension(content)
+        city_code = self._match_city(remainder)
+        self.logger.info("查询解析结果: %s -> 城市: %s 气象: %s", content, city_code, ext_code)
+        return city_code, ext_code
+
+
+_resolver = None
+_resolver_key = None
+_resolver_lock = threading.Lock()
+
+
+def get_city_resolver() -> CityResolver:
+    """获取进程内共享的解析器，WeatherConfig 中的城市、气象类型或编码表变化时重新构建"""
+    global _resolver, _resolver_key
+    config = send.get_config().weather
+    key = (dict(config.city), dict(config.extensions), config.adcode_file)
+    with _resolver_lock:
+        if _resolver is None or _resolver_key != key:
+            _resolver = CityResolver(config.city, config.extensions, config.adcode_file)
+            _resolver_key = key
+        return _resolver
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import time
 import openai
 import send
 
@@ -18,50 +19,81 @@ class DeepSeek:
         如果未设置API密钥，则记录错误日志。
         """
         # 读取配置文件中的DeepSeek配置
-        reader = send.ConfigReader()
-        config = reader.get_deep_seek_config()
-        self.url = config['URL']
-        self.logger = send.setup_logger()
+        self.url = send.get_config().deep_seek.url
+        self.logger = send.setup_logger(__name__)
         # 从环境变量中获取DeepSeek API密钥
         self.deepseek_key = os.environ.get('DeepSeek_Key')
         if not self.deepseek_key:
             self.logger.error("未设置 DeepSeek_Key 环境变量")
             raise ValueError("DeepSeek_Key 环境变量未设置")
         self.model = model
+        self.stream = send.get_config().llm.stream
+        # 最近一次流式请求的结果与耗时统计
+        self.last_stream = None
         # 设置OpenAI API密钥和基础URL
         self.client = openai.OpenAI(api_key=self.deepseek_key, base_url=self.url)
 
-    def send_message(self, content: str):
+    def _build_request(self, content: str) -> dict:
+        """构造聊天请求参数，超出 token 预算的提示词截去中间部分"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "user", "content": send.truncate_prompt(content, send.get_config().llm.prompt_token_budget)}
+            ]
+        }
+
+    def _record_usage(self, request: dict, started: float, reply, response=None, result=None):
+        """记录本次调用的 token、耗时与费用；流式请求使用 ChatStream 的结果，被取消或失败时按提示词估算"""
+        if result is not None:
+            completion, reasoning, usage, ttft = result.received, result.reasoning, result.usage, result.ttft
+        else:
+            message = response.choices[0].message if response is not None and response.choices else None
+            completion = (message.content or '') if message else ''
+            reasoning = (getattr(message, 'reasoning_content', None) or '') if message else ''
+            usage, ttft = getattr(response, 'usage', None), None
+        send.get_usage_tracker().record('deepseek', self.model, request['messages'][-1]['content'], completion,
+                                        reasoning, usage, ttft, time.monotonic() - started, bool(reply))
+
+    def _log_stream(self, result):
+        self.last_stream = result
+        self.logger.info(f"{self.model} 流式响应：{result.summary()}")
+
+    def send_message(self, content: str, stream=None, max_chars=None, on_token=None):
         """
         生成对话响应。
 
         Args:
             content (str): 用户输入内容（必填，不能为空）
+            stream (bool): 是否使用流式响应，默认读取 LLMConfig 中的 Stream
+            max_chars (int): 流式响应的最大字符数，超出后在预算内最后一个完整句子处提前结束
+            on_token (callable): 流式响应收到内容时的回调
 
         Returns:
             str or None: 生成的响应内容或None（如果请求失败）
-
-        Raises:
-            ValueError: 如果content为空或None
         """
         # 检查content是否为空
         if not content:
             self.logger.error("内容不能为空")
             return None
 
+        request, started = self._build_request(content), time.monotonic()
+        reply = response = result = None
         try:
-            # 创建聊天请求（默认为非流式）
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": content}
-                ]
-            )
-
-            self.logger.info(f"响应内容:{response}")
+            if self.stream if stream is None else stream:
+                # include_usage 使接口在最后一个分片中返回本次请求的用量
+                result = send.ChatStream(max_chars, on_token).collect(self.client.chat.completions.create(
+                    **request, stream=True, stream_options={"include_usage": True}))
+                self._log_stream(result)
+                reply = result.content or None
+                return reply
+
+            # 创建聊天请求（非流式）
+            response = self.client.chat.completions.create(**request)
+
+            self.logger.debug("响应内容: %s", response)
             # 处理非流式响应
-            full_response = response.choices[0].message.content
-            return full_response
+            reply = response.choices[0].message.content
+            return reply
 
         except openai.OpenAIError as e:
             # 处理OpenAI API相关错误
@@ -71,6 +103,49 @@ class DeepSeek:
             # 处理其他可能的异常
             self.logger.error(f"发生错误: {e}")
             return None
+        finally:
+            self._record_usage(request, started, reply, response, result)
+
+    async def async_send_message(self, content: str, stream=None, max_chars=None, on_token=None):
+        """
+        异步生成对话响应，可被取消（如对冲请求中较慢的一方）。
+
+        Args:
+            content (str): 用户输入内容（必填，不能为空）
+            stream, max_chars, on_token: 同 send_message
+
+        Returns:
+            str or None: 生成的响应内容或None（如果请求失败）
+        """
+        if not content:
+            self.logger.error("内容不能为空")
+            return None
+
+        request, started = self._build_request(content), time.monotonic()
+        reply = response = result = None
+        try:
+            # 异步客户端绑定当前事件循环，每次请求单独创建并在结束（或被取消）时关闭
+            async with openai.AsyncOpenAI(api_key=self.deepseek_key, base_url=self.url) as client:
+                if self.stream if stream is None else stream:
+                    result = await send.ChatStream(max_chars, on_token).async_collect(
+                        await client.chat.completions.create(**request, stream=True,
+                                                             stream_options={"include_usage": True}))
+                    self._log_stream(result)
+                    reply = result.content or None
+                    return reply
+                response = await client.chat.completions.create(**request)
+            self.logger.debug("响应内容: %s", response)
+            reply = response.choices[0].message.content
+            return reply
+        except openai.OpenAIError as e:
+            self.logger.error(f"OpenAI API 错误: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"发生错误: {e}")
+            return None
+        finally:
+            # 被取消的请求同样计入用量
+            self._record_usage(request, started, reply, response, result)
 
 
 # 示例：如何使用 DeepSeek 类
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from typing import Callable, Optional
+import send
+
+
+class HedgedLLM:
+    """
+    对冲请求：先向主服务发送请求，若在 hedge_delay 秒内没有得到有效回复（或主服务已失败），
+    再向备用服务发送同样的请求，取最先返回的有效回复并取消另一个请求。
+
+    主服务偶尔出现的超长响应（如推理模型 60 秒以上）不再决定整体耗时，
+    而正常情况下只有主服务一个请求。与 DeepSeek / HunYuan 一样提供 send_message 接口。
+    """
+
+    def __init__(self, primary, secondary, hedge_delay: Optional[float] = None,
+                 validator: Optional[Callable[[str], bool]] = None):
+        """
+        初始化对冲请求。
+
+        :param primary: 主服务，需提供 async_send_message 方法
+        :param secondary: 备用服务，需提供 async_send_message 方法
+        :param hedge_delay: 启动备用服务前等待主服务的秒数（建议取主服务耗时的 p95），默认读取 LLMConfig 中的 HedgeDelay
+        :param validator: 判断回复是否有效的函数，默认只要求回复非空
+        """
+        self.logger = send.setup_logger(__name__)
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_delay = hedge_delay if hedge_delay is not None else send.get_config().llm.hedge_delay
+        self.validator = validator or (lambda reply: bool(reply and reply.strip()))
+
+    @staticmethod
+    def _name(service) -> str:
+        return getattr(service, 'name', service.__class__.__name__)
+
+    def send_message(self, content: str, **kwargs) -> Optional[str]:
+        """
+        同步发送对冲请求；若当前线程已有运行中的事件循环，则退回只请求主服务。
+
+        :param content: 用户输入内容
+        :param kwargs: 透传给各服务的参数，如 stream、max_chars
+        :return: 最先返回的有效回复，两个服务都失败时返回 None
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.async_send_message(content, **kwargs))
+        self.logger.warning("当前线程已有运行中的事件循环，只请求主服务")
+        return self.primary.send_message(content, **kwargs)
+
+    async def async_send_message(self, content: str, **kwargs) -> Optional[str]:
+        """
+        异步发送对冲请求。
+
+        :param content: 用户输入内容
+        :param kwargs: 透传给各服务的参数，如 stream、max_chars
+        :return: 最先返回的有效回复，两个服务都失败时返回 None
+        """
+        started = time.monotonic()
+        services = {asyncio.create_task(self.primary.async_send_message(content, **kwargs)): self.primary}
+        pending = set(services)
+        hedged = False
+
+        try:
+            while pending:
+                # 备用服务启动前最多等待 hedge_delay 秒，之后等待任一请求完成
+                timeout = None if hedged else max(0.0, self.hedge_delay - (time.monotonic() - started))
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    reply = task.result()
+                    if self.validator(reply):
+                        self.logger.info(f"{self._name(services[task])} 最先返回有效回复，"
+                                         f"耗时 {time.monotonic() - started:.2f}s{'（已对冲）' if hedged else ''}")
+                        return reply
+                    self.logger.warning(f"{self._name(services[task])} 返回无效回复: {reply!r}")
+
+                # 主服务超时未返回或已失败时启动备用服务
+                if not hedged:
+                    hedged = True
+                    reason = '失败' if done else f'{self.hedge_delay}s 内未返回'
+                    self.logger.info(f"{self._name(self.primary)} {reason}，启动 {self._name(self.secondary)}")
+                    task = asyncio.create_task(self.secondary.async_send_message(content, **kwargs))
+                    services[task] = self.secondary
+                    pending.add(task)
+
+            self.logger.error("对冲请求的所有服务均未返回有效回复")
+            return None
+        finally:
+            for task in services:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*services, return_exceptions=True)
\ No newline at end of file
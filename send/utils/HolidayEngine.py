@@ -0,0 +1,250 @@
+import os
+import json
+import math
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from lunardate import LunarDate
+import send
+
+# 随包附带的法定节假日及调休安排数据
+DEFAULT_HOLIDAYS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'holidays.json')
+
+# 公历 1 年 1 月 1 日 0 时对应的儒略日，用于儒略日与 date.toordinal() 互相转换
+_JD_ORDINAL_OFFSET = 1721425
+
+
+class HolidayEngine:
+    """
+    本地节日计算引擎，无需调用聚合数据日历接口。
+
+    - 公历固定节日与按星期计算的节日（母亲节、父亲节）；
+    - 农历传统节日（春节、端午、中秋、除夕等），基于 lunardate 换算；
+    - 二十四节气，基于 PyMeeus 求太阳视黄经，按北京时间取日期，结果按年缓存到本地；
+    - 法定节假日放假及调休上班安排，读取随包附带的 data/holidays.json。
+
+    get_calendar 的返回结构与聚合数据日历接口一致，可直接交给 EventService.handle_calendar 处理。
+    """
+
+    SOLAR_FESTIVALS = {
+        (1, 1): '元旦', (2, 14): '情人节', (3, 8): '妇女节', (3, 12): '植树节', (4, 1): '愚人节',
+        (5, 1): '劳动节', (5, 4): '青年节', (6, 1): '儿童节', (7, 1): '建党节', (8, 1): '建军节',
+        (9, 10): '教师节', (10, 1): '国庆节', (12, 24): '平安夜', (12, 25): '圣诞节'
+    }
+    # (月, 第几个, 星期几[0=周一]) -> 节日
+    WEEKDAY_FESTIVALS = {(5, 2, 6): '母亲节', (6, 3, 6): '父亲节'}
+    LUNAR_FESTIVALS = {
+        (1, 1): '春节', (1, 15): '元宵节', (2, 2): '龙抬头', (5, 5): '端午节', (7, 7): '七夕节',
+        (7, 15): '中元节', (8, 15): '中秋节', (9, 9): '重阳节', (12, 8): '腊八节', (12, 23): '小年'
+    }
+    # 从小寒(太阳视黄经285°)开始，每15°一个节气
+    SOLAR_TERMS = ('小寒', '大寒', '立春', '雨水', '惊蛰', '春分', '清明', '谷雨', '立夏', '小满', '芒种', '夏至',
+                   '小暑', '大暑', '立秋', '处暑', '白露', '秋分', '寒露', '霜降', '立冬', '小雪', '大雪', '冬至')
+    # 同时也是节日的节气
+    TERM_FESTIVALS = {'清明': '清明节'}
+
+    WEEKDAYS = ('星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日')
+    LUNAR_MONTHS = ('正月', '二月', '三月', '四月', '五月', '六月', '七月', '八月', '九月', '十月', '冬月', '腊月')
+    LUNAR_DAYS = ('初一', '初二', '初三', '初四', '初五', '初六', '初七', '初八', '初九', '初十',
+                  '十一', '十二', '十三', '十四', '十五', '十六', '十七', '十八', '十九', '二十',
+                  '廿一', '廿二', '廿三', '廿四', '廿五', '廿六', '廿七', '廿八', '廿九', '三十')
+    STEMS = '甲乙丙丁戊己庚辛壬癸'
+    BRANCHES = '子丑寅卯辰巳午未申酉戌亥'
+    ANIMALS = '鼠牛虎兔龙蛇马羊猴鸡狗猪'
+
+    def __init__(self, holidays_path: Optional[str] = None, terms_cache_path: Optional[str] = None):
+        """
+        初始化节日计算引擎。
+
+        参数:
+            holidays_path (str, optional): 法定节假日安排数据文件，默认读取 EventConfig 中的 HolidayFile。
+            terms_cache_path (str, optional): 节气计算结果的缓存文件，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.terms_cache_path = terms_cache_path or send.get_config().cache.path('solar_terms.json')
+        self._terms: Dict[int, Dict[int, str]] = {}
+        self._terms_lock = threading.Lock()
+        self._warned_years = set()
+        self._warned_lock = threading.Lock()
+        self._rest, self._work, self._years = self._load_arrangements(
+            holidays_path or send.get_config().event.holiday_file)
+        self._check_year(date.today().year)
+
+    def _load_arrangements(self, path: str) -> Tuple[Dict[int, str], set, set]:
+        """读取法定节假日安排，返回 (放假日期序数 -> 假期名称, 调休上班日期序数集合, 已收录的年份)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                arrangements = json.load(file)
+        except (IOError, ValueError) as e:
+            self.logger.error(f"读取法定节假日安排失败: {e}")
+            return {}, set(), set()
+
+        rest = {}
+        years = set()
+        for item in arrangements.get('rest', []):
+            start = date.fromisoformat(item['start'])
+            end = date.fromisoformat(item['end'])
+            for ordinal in range(start.toordinal(), end.toordinal() + 1):
+                rest[ordinal] = item['name']
+            # 元旦假期可能从上一年年底开始，按结束日期所在年份计入
+            years.add(end.year)
+        work = {date.fromisoformat(day).toordinal() for day in arrangements.get('work', [])}
+        return rest, work, years
+
+    def _check_year(self, year: int):
+        """数据文件未收录指定年份时记录一次警告，此时该年只按正常作息计算，不包含放假与调休安排"""
+        if year in self._years:
+            return
+        with self._warned_lock:
+            if year in self._warned_years:
+                return
+            self._warned_years.add(year)
+        self.logger.warning(f"法定节假日安排未收录 {year} 年（已收录: {', '.join(map(str, sorted(self._years))) or '无'}），"
+                            f"该年的放假与调休将按正常作息计算，请在节假日数据文件中追加当年的安排")
+
+    @classmethod
+    def _compute_solar_terms(cls, year: int) -> Dict[int, str]:
+        """
+        计算指定公历年份的二十四节气，返回 北京时间日期序数 -> 节气名称。
+
+        以平均间隔估算初值，再用牛顿迭代求太阳视黄经等于目标角度的时刻。
+        """
+        from pymeeus.Epoch import Epoch
+        from pymeeus.Sun import Sun
+
+        # 力学时(TT)与世界时(UT)之差，单位：天
+        delta_t = Epoch.tt2ut(year, 6) / 86400
+        base_jde = Epoch(year, 1, 6.0).jde()
+        terms = {}
+        for index, name in enumerate(cls.SOLAR_TERMS):
+            target = (285 + 15 * index) % 360
+            jde = base_jde + index * 15.2184
+            for _ in range(6):
+                longitude = Sun.apparent_geocentric_position(Epoch(jde), nutation=True)[0]()
+                diff = (target - longitude + 180) % 360 - 180
+                jde += diff * 365.2422 / 360
+                if abs(diff) < 1e-6:
+                    break
+            # 力学时 -> 世界时 -> 北京时间(UTC+8)
+            beijing_jd = jde - delta_t + 8 / 24
+            terms[math.floor(beijing_jd + 0.5) - _JD_ORDINAL_OFFSET] = name
+        return terms
+
+    def _read_terms_cache(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.terms_cache_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (IOError, ValueError):
+            return {}
+
+    def solar_terms(self, year: int) -> Dict[int, str]:
+        """
+        获取指定年份的二十四节气，先查内存，再查本地缓存文件，都没有时才计算。
+
+        返回:
+            日期序数(date.toordinal()) -> 节气名称
+        """
+        terms = self._terms.get(year)
+        if terms is not None:
+            return terms
+
+        with self._terms_lock:
+            terms = self._terms.get(year)
+            if terms is not None:
+                return terms
+
+            cached = self._read_terms_cache()
+            if str(year) in cached:
+                terms = {int(ordinal): name for ordinal, name in cached[str(year)].items()}
+            else:
+                terms = self._compute_solar_terms(year)
+                cached[str(year)] = {str(ordinal): name for ordinal, name in terms.items()}
+                try:
+                    with open(self.terms_cache_path, 'w', encoding='utf-8') as file:
+                        json.dump(cached, file, ensure_ascii=False)
+                except IOError as e:
+                    self.logger.warning(f"写入节气缓存失败: {e}")
+            self._terms[year] = terms
+        return terms
+
+    def festivals(self, day: date) -> List[str]:
+        """返回指定日期的所有节日和节气名称"""
+        names = []
+
+        solar_festival = self.SOLAR_FESTIVALS.get((day.month, day.day))
+        if solar_festival:
+            names.append(solar_festival)
+        nth = (day.day - 1) // 7 + 1
+        weekday_festival = self.WEEKDAY_FESTIVALS.get((day.month, nth, day.weekday()))
+        if weekday_festival:
+            names.append(weekday_festival)
+
+        lunar = LunarDate.fromSolarDate(day.year, day.month, day.day)
+        if not lunar.isLeapMonth:
+            lunar_festival = self.LUNAR_FESTIVALS.get((lunar.month, lunar.day))
+            if lunar_festival:
+                names.append(lunar_festival)
+        next_lunar = LunarDate.fromSolarDate(*(day + timedelta(days=1)).timetuple()[:3])
+        if next_lunar.month == 1 and next_lunar.day == 1 and not next_lunar.isLeapMonth:
+            names.append('除夕')
+
+        term = self.solar_terms(day.year).get(day.toordinal())
+        if term:
+            names.append(self.TERM_FESTIVALS.get(term, term))
+        return names
+
+    def get_day(self, day: date) -> Dict:
+        """
+        计算指定日期的日历数据，字段与聚合数据日历接口的 data 字段保持一致。
+
+        status 为 '1' 表示法定放假，'2' 表示调休上班，None 表示按正常作息。
+        """
+        lunar = LunarDate.fromSolarDate(day.year, day.month, day.day)
+        lunar_month = ('闰' if lunar.isLeapMonth else '') + self.LUNAR_MONTHS[lunar.month - 1]
+
+        self._check_year(day.year)
+        ordinal = day.toordinal()
+        if ordinal in self._work:
+            status, desc = '2', '调休上班'
+        elif ordinal in self._rest:
+            status, desc = '1', f"{self._rest[ordinal]}假期"
+        else:
+            status, desc = None, ''
+
+        return {
+            'date': f"{day.year}-{day.month}-{day.day}",
+            'weekday': self.WEEKDAYS[day.weekday()],
+            'animalsYear': self.ANIMALS[(lunar.year - 4) % 12],
+            'lunarYear': f"{self.STEMS[(lunar.year - 4) % 10]}{self.BRANCHES[(lunar.year - 4) % 12]}年",
+            'lunar': f"{lunar_month}{self.LUNAR_DAYS[lunar.day - 1]}",
+            'year-month': f"{day.year}-{day.month}",
+            'holiday': ' '.join(self.festivals(day)),
+            'status': status,
+            'desc': desc
+        }
+
+    def get_calendar(self, date_str: str) -> Optional[Dict]:
+        """
+        获取指定日期的日历信息，返回结构与 EventApi.get_calendar 一致。
+
+        参数:
+            date_str (str): 格式为YYYY-M-D，如:2012-1-1
+        返回:
+            {'result': {'data': {...}}}；日期格式不正确时返回None。
+        """
+        try:
+            day = datetime.strptime(date_str, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            self.logger.error(f"无效的日期格式: {date_str}")
+            return None
+        return {'result': {'data': self.get_day(day)}}
+
+    def holidays(self, start: date, end: date) -> List[Tuple[date, str]]:
+        """返回 [start, end] 区间内的所有节日，按日期排序"""
+        result = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            names = self.festivals(day)
+            if names:
+                result.append((day, ' '.join(names)))
+        return result
\ No newline at end of file
@@ -0,0 +1,181 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import send
+
+# 缓存响应时保留的响应头，其余（如 Content-Encoding、Content-Length）与解码后的正文不再匹配
+_KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'date', 'cache-control')
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """缓存中的一条响应"""
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """用于条件请求的 If-None-Match / If-Modified-Since 请求头"""
+        validators = {}
+        if self.headers.get('etag'):
+            validators['If-None-Match'] = self.headers['etag']
+        if self.headers.get('last-modified'):
+            validators['If-Modified-Since'] = self.headers['last-modified']
+        return validators
+
+
+class HttpCache:
+    """
+    基于 SQLite 的持久化 HTTP 响应缓存。
+
+    - 按 "主机/路径" 前缀配置各接口的缓存时间(TTL)，未配置的接口不缓存；
+    - 过期后若响应带有 ETag / Last-Modified，则发起条件请求重新验证；
+    - 按最近访问时间进行 LRU 淘汰，限制条目数和总字节数；
+    - 缓存键不包含 key、token 等敏感参数。
+    """
+
+    def __init__(self, path=None, ttl_policies=None, max_entries=None, max_bytes=None, sensitive_params=None):
+        """
+        初始化缓存，未传入的参数从 config.ini 的 CacheConfig 配置段读取。
+
+        Args:
+            path (str): SQLite 数据库文件路径。
+            ttl_policies (dict): "主机/路径" 前缀 -> 缓存时间（秒）。
+            max_entries (int): 最大缓存条目数。
+            max_bytes (int): 缓存正文的最大总字节数。
+            sensitive_params (tuple): 不参与缓存键计算的查询参数名。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().cache
+
+        self.ttl_policies = dict(ttl_policies if ttl_policies is not None else config.http_ttl)
+        self.max_entries = max_entries if max_entries is not None else config.http_max_entries
+        self.max_bytes = max_bytes if max_bytes is not None else config.http_max_bytes
+        self.sensitive_params = frozenset(
+            name.lower() for name in (sensitive_params if sensitive_params is not None else config.sensitive_params)
+        )
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or config.path('http_cache.sqlite3'), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB, '
+            'size INTEGER, stored_at REAL, accessed_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        self._conn.commit()
+
+    def ttl_for(self, url: str) -> Optional[int]:
+        """
+        返回URL对应的缓存时间，取最长匹配的 "主机/路径" 前缀。
+
+        :return: 缓存时间（秒）；未配置或配置为0时返回None，表示不缓存
+        """
+        parts = urlsplit(url)
+        target = f"{parts.netloc}{parts.path}"
+        ttl, matched = None, -1
+        for prefix, prefix_ttl in self.ttl_policies.items():
+            if target.startswith(prefix) and len(prefix) > matched:
+                ttl, matched = prefix_ttl, len(prefix)
+        return ttl or None
+
+    def key_for(self, method: str, url: str, params=None) -> str:
+        """
+        计算缓存键：去除敏感参数后，对方法、主机路径和排序后的查询参数取哈希。
+        """
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((str(name), str(value)) for name, value in dict(params).items())
+        query = sorted((name, value) for name, value in query if name.lower() not in self.sensitive_params)
+        canonical = f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """读取缓存条目并更新其访问时间"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, headers, body, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, stored_at = row
+        return CachedResponse(key, url, status, json.loads(headers), body, stored_at)
+
+    @staticmethod
+    def is_fresh(entry: CachedResponse, ttl: int) -> bool:
+        return time.time() - entry.stored_at < ttl
+
+    def put(self, key: str, url: str, status: int, headers, body: bytes):
+        """写入一条响应，并按 LRU 策略淘汰超出限制的条目"""
+        kept_headers = {name.lower(): value for name, value in dict(headers).items()
+                        if name.lower() in _KEPT_HEADERS}
+        now = time.time()
+        # URL 中可能带有密钥，仅保存去除查询参数后的部分用于排查
+        parts = urlsplit(url)
+        safe_url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, url, status, headers, body, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, safe_url, status, json.dumps(kept_headers), body, len(body), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str):
+        """条件请求返回 304 时，刷新条目的存储时间"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?', (now, now, key))
+            self._conn.commit()
+
+    def _evict(self):
+        """淘汰最久未访问的条目，直到条目数和总字节数均不超过上限"""
+        count, total_size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            count, total_size = count - 1, total_size - size
+            evicted += 1
+        self.logger.debug("HTTP缓存淘汰 %d 条记录", evicted)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """获取进程内共享的 HttpCache 实例"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
\ No newline at end of file
@@ -0,0 +1,147 @@
+import threading
+from typing import Callable, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+import send
+from .HttpCache import CachedResponse, HttpCache, get_http_cache
+
+
+class HttpTransport:
+    """
+    所有上游接口共用的 HTTP 传输层。
+
+    基于 requests.Session，按主机维护连接池并保持长连接，统一配置超时、
+    重试与退避策略。
+
+    Attributes:
+        timeout (float): 默认请求超时时间（秒）。
+        session (requests.Session): 带连接池和重试策略的会话。
+    """
+
+    def __init__(self, timeout=None, pool_connections=None, pool_max_size=None, max_retries=None,
+                 backoff_factor=None, retry_status=None, cache: Optional[HttpCache] = None,
+                 use_cache=True):
+        """
+        初始化传输层，未传入的参数从 config.ini 的 HttpConfig 配置段读取。
+
+        Args:
+            timeout (float): 默认请求超时时间（秒）。
+            pool_connections (int): 缓存的主机连接池数量。
+            pool_max_size (int): 每个主机连接池的最大连接数。
+            max_retries (int): 最大重试次数。
+            backoff_factor (float): 重试退避系数，第 n 次重试前等待 backoff_factor * 2^(n-1) 秒。
+            retry_status (tuple): 需要重试的 HTTP 状态码。
+            cache (HttpCache): 响应缓存，默认使用进程内共享的持久化缓存。
+            use_cache (bool): 是否对配置了 TTL 的 GET 请求使用响应缓存。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().http
+
+        self.timeout = timeout if timeout is not None else config.timeout
+        retry = Retry(
+            total=max_retries if max_retries is not None else config.max_retries,
+            backoff_factor=backoff_factor if backoff_factor is not None else config.backoff_factor,
+            status_forcelist=retry_status if retry_status is not None else config.retry_status,
+            # 只重试幂等请求，避免重复推送
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections if pool_connections is not None else config.pool_connections,
+            pool_maxsize=pool_max_size if pool_max_size is not None else config.pool_max_size,
+            max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cache = cache
+        self.use_cache = use_cache
+
+    def request(self, method: str, url: str, cache_check: Optional[Callable] = None, **kwargs) -> requests.Response:
+        """
+        发送 HTTP 请求，未指定 timeout 时使用默认超时时间。
+
+        对配置了 TTL 的 GET 请求，未过期时直接返回缓存的响应；过期后带上 ETag /
+        Last-Modified 发起条件请求，返回 304 时继续使用缓存。
+
+        :param cache_check: 可选，判断 200 响应能否写入缓存的函数，用于排除业务层面的错误响应
+        :raises requests.exceptions.RequestException: 请求失败时抛出
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        cache, ttl = resolve_cache(self.cache, self.use_cache, method, url)
+        if cache is None:
+            return self.session.request(method, url, **kwargs)
+
+        key = cache.key_for(method, url, kwargs.get('params'))
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry, ttl):
+            self.logger.debug("命中HTTP缓存: %s", entry.url)
+            return self._cached_response(entry)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            headers.update(entry.validators)
+        response = self.session.request(method, url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.logger.debug("HTTP缓存重新验证通过: %s", entry.url)
+            cache.refresh(key)
+            return self._cached_response(entry)
+        if response.status_code == 200 and (cache_check is None or cache_check(response)):
+            cache.put(key, url, response.status_code, response.headers, response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(entry: CachedResponse) -> requests.Response:
+        """将缓存条目还原为 requests.Response"""
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = 'OK'
+        response.url = entry.url
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry.body
+        return response
+
+    def get(self, url: str, params=None, **kwargs) -> requests.Response:
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url: str, data=None, json=None, **kwargs) -> requests.Response:
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def close(self):
+        """关闭会话及其连接池"""
+        self.session.close()
+
+
+def resolve_cache(cache: Optional[HttpCache], use_cache: bool, method: str, url: str
+                  ) -> Tuple[Optional[HttpCache], Optional[int]]:
+    """
+    判断请求是否走响应缓存。
+
+    :return: (缓存实例, TTL)；不走缓存时返回 (None, None)
+    """
+    if not use_cache or method.upper() != 'GET':
+        return None, None
+    cache = cache or get_http_cache()
+    ttl = cache.ttl_for(url)
+    if not ttl:
+        return None, None
+    return cache, ttl
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """获取进程内共享的 HttpTransport 实例"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
\ No newline at end of file
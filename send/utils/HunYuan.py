@@ -1,5 +1,6 @@
 import os
-from openai import OpenAI
+import time
+from openai import OpenAI, AsyncOpenAI
 import send
 
 class HunYuan:
@@ -10,17 +11,18 @@ class HunYuan:
         :param api_key: 可选参数，混元 API Key。如果未提供，则从环境变量 HunYuan_Key 获取。
         :param model: 使用的模型名称，默认是 "hunyuan-turbo"。
         """
-        # 读取配置文件中的DeepSeek配置
-        reader = send.ConfigReader()
-        get_hunyuan_config = reader.get_hunyuan_config()
-        self.url = get_hunyuan_config['URL']
-        self.logger = send.setup_logger()
+        # 读取配置文件中的HunYuan配置
+        self.url = send.get_config().hunyuan.url
+        self.logger = send.setup_logger(__name__)
         self.hunyuan_api_key = api_key or os.environ.get("HunYuan_Key")
         if not self.hunyuan_api_key:
             self.logger.error("未设置 HunYuan_Key 环境变量")
             raise ValueError("HunYuan_Key未设置")
 
         self.model = model
+        self.stream = send.get_config().llm.stream
+        # 最近一次流式请求的结果与耗时统计
+        self.last_stream = None
 
         # 构造 client
         self.client = OpenAI(
@@ -28,35 +30,100 @@ class HunYuan:
             base_url=self.url,
         )
 
-    def send_message(self, message):
+    def send_message(self, message, stream=None, max_chars=None, on_token=None):
         """
         发送消息到混元 API 并获取回复。
 
         :param message: 用户输入的消息内容。
+        :param stream: 是否使用流式响应，默认读取 LLMConfig 中的 Stream。
+        :param max_chars: 流式响应的最大字符数，超出后在预算内最后一个完整句子处提前结束。
+        :param on_token: 流式响应收到内容时的回调。
         :return: API 响应内容（字符串）或 None（请求失败时）。
         """
+        request, started = self._build_request(message), time.monotonic()
+        reply = response = result = None
+        try:
+            if self.stream if stream is None else stream:
+                result = send.ChatStream(max_chars, on_token).collect(
+                    self.client.chat.completions.create(**request, stream=True))
+                self._log_stream(result)
+                reply = result.content or None
+                return reply
+            # 调用API并传递完整的请求体
+            response = self.client.chat.completions.create(**request)
+            reply = self._handle_response(response)
+            return reply
+        except Exception as e:
+            self.logger.error(f"请求失败: {e}")
+            return None
+        finally:
+            self._record_usage(request, started, reply, response, result)
+
+    async def async_send_message(self, message, stream=None, max_chars=None, on_token=None):
+        """
+        异步发送消息到混元 API 并获取回复，可被取消（如对冲请求中较慢的一方）。
+
+        :param message: 用户输入的消息内容。
+        :param stream, max_chars, on_token: 同 send_message。
+        :return: API 响应内容（字符串）或 None（请求失败时）。
+        """
+        request, started = self._build_request(message), time.monotonic()
+        reply = response = result = None
+        try:
+            # 异步客户端绑定当前事件循环，每次请求单独创建并在结束（或被取消）时关闭
+            async with AsyncOpenAI(api_key=self.hunyuan_api_key, base_url=self.url) as client:
+                if self.stream if stream is None else stream:
+                    result = await send.ChatStream(max_chars, on_token).async_collect(
+                        await client.chat.completions.create(**request, stream=True))
+                    self._log_stream(result)
+                    reply = result.content or None
+                    return reply
+                response = await client.chat.completions.create(**request)
+            reply = self._handle_response(response)
+            return reply
+        except Exception as e:
+            self.logger.error(f"请求失败: {e}")
+            return None
+        finally:
+            # 被取消的请求同样计入用量
+            self._record_usage(request, started, reply, response, result)
+
+    def _build_request(self, message) -> dict:
+        """构造请求体"""
         # 检查并转换 message 参数为字典格式
         if not isinstance(message, dict):
             message = {"role": "user", "content": message}
+        # 超出 token 预算的提示词截去中间部分
+        message = {**message, "content": send.truncate_prompt(message.get("content") or '',
+                                                                send.get_config().llm.prompt_token_budget)}
 
-        request_body = {
+        return {
             "model": self.model,
             "messages": [message],
         }
 
-        try:
-            # 调用API并传递完整的请求体
-            response = self.client.chat.completions.create(**request_body)
-            self.logger.info(f"响应内容:{response}")
-            # 检查响应是否包含有效的内容
-            if hasattr(response, 'choices') and len(response.choices) > 0:
-                return response.choices[0].message.content
-            else:
-                self.logger.error("API 响应中没有有效的 choices 字段")
-                return None
-        except Exception as e:
-            self.logger.error(f"请求失败: {e}")
-            return None
+    def _handle_response(self, response):
+        """从响应中取出回复内容"""
+        self.logger.debug("响应内容: %s", response)
+        # 检查响应是否包含有效的内容
+        if hasattr(response, 'choices') and len(response.choices) > 0:
+            return response.choices[0].message.content
+        self.logger.error("API 响应中没有有效的 choices 字段")
+        return None
+
+    def _log_stream(self, result):
+        self.last_stream = result
+        self.logger.info(f"{self.model} 流式响应：{result.summary()}")
+
+    def _record_usage(self, request: dict, started: float, reply, response=None, result=None):
+        """记录本次调用的 token、耗时与费用；流式请求的用量按收到的内容估算"""
+        if result is not None:
+            completion, reasoning, usage, ttft = result.received, result.reasoning, result.usage, result.ttft
+        else:
+            completion, reasoning, ttft = reply or '', '', None
+            usage = getattr(response, 'usage', None)
+        send.get_usage_tracker().record('hunyuan', self.model, request['messages'][-1]['content'], completion,
+                                        reasoning, usage, ttft, time.monotonic() - started, bool(reply))
 
 # 示例使用
 if __name__ == "__main__":
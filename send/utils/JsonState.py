@@ -0,0 +1,50 @@
+import json
+import os
+from typing import Any
+import send
+
+
+class JsonState:
+    """
+    缓存目录中的 JSON 状态文件。
+
+    读取时文件不存在、损坏或顶层类型不符都返回默认值，调用方按空状态重新开始；
+    写入时先写临时文件再原子替换，进程中途退出也不会留下写了一半的文件。
+    """
+
+    def __init__(self, path: str, description: str):
+        """
+        参数:
+            path (str): 状态文件路径。
+            description (str): 状态的名称，用于日志，如 "天气建议缓存"。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.path = path
+        self.description = description
+
+    def load(self, default: Any) -> Any:
+        """读取状态，失败或顶层类型与 default 不同时返回 default"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return default
+        except (IOError, ValueError) as e:
+            self.logger.warning(f"读取{self.description}失败，将重新开始: {e}")
+            return default
+        if not isinstance(data, type(default)):
+            self.logger.warning(f"{self.description}格式无效，将重新开始")
+            return default
+        return data
+
+    def save(self, data: Any) -> bool:
+        """写入状态，返回是否成功"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except (IOError, TypeError, ValueError) as e:
+            self.logger.warning(f"保存{self.description}失败: {e}")
+            return False
\ No newline at end of file
@@ -0,0 +1,194 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+import send
+
+# 服务名 -> 客户端类名
+_PROVIDERS = {'deepseek': 'DeepSeek', 'hunyuan': 'HunYuan'}
+
+
+class LLMBackend:
+    """
+    路由器中的一个后端（服务/模型），与 DeepSeek / HunYuan 一样提供 send_message 接口。
+
+    客户端在首次请求时才创建；每次请求的耗时与成败都会反馈给路由器。
+    """
+
+    def __init__(self, router: 'LLMRouter', name: str):
+        self.router = router
+        self.name = name
+        self.provider, _, self.model = name.partition('/')
+
+    def __repr__(self):
+        return f"LLMBackend({self.name})"
+
+    def send_message(self, content, **kwargs) -> Optional[str]:
+        client = self.router.client(self.name)
+        if client is None:
+            return None
+        started = time.monotonic()
+        reply = client.send_message(content, **kwargs)
+        self.router.record(self.name, time.monotonic() - started, bool(reply))
+        return reply
+
+    async def async_send_message(self, content, **kwargs) -> Optional[str]:
+        client = self.router.client(self.name)
+        if client is None:
+            return None
+        started = time.monotonic()
+        try:
+            reply = await client.async_send_message(content, **kwargs)
+        except asyncio.CancelledError:
+            # 被取消（对冲请求中较慢的一方或超过 TipDeadline）时，已耗时是该后端延迟的下限
+            self.router.record_cancelled(self.name, time.monotonic() - started)
+            raise
+        self.router.record(self.name, time.monotonic() - started, bool(reply))
+        return reply
+
+
+class LLMRouter:
+    """
+    大模型后端路由器。
+
+    - 后端为 LLMConfig.Backends 中的 "服务/模型"，客户端在首次使用时才创建，缺少密钥的服务只会被跳过；
+    - 按每个后端观测到的延迟与错误率的指数加权平均(EWMA)估算 "得到一次有效回复的期望耗时"，
+      即 延迟 / (1 - 错误率)，请求总是优先发给当前估算最快的后端；
+    - 连续失败 EvictAfter 次的后端暂停使用 EvictCooldown 秒，冷却结束后重新参与路由；
+    - 统计数据保存在缓存目录中（由调用方在运行结束时调用 save），跨运行持续生效。
+    """
+
+    # 尚无观测数据的后端按该延迟（秒）估算，使其有机会被尝试
+    PRIOR_LATENCY = 10.0
+    # 错误率上限，避免期望耗时无穷大
+    MAX_ERROR = 0.95
+
+    def __init__(self, backends: Optional[Sequence[str]] = None, state_path: Optional[str] = None):
+        """
+        初始化路由器。
+
+        参数:
+            backends (list, optional): "服务/模型" 列表，按优先级排列，默认读取 LLMConfig 中的 Backends。
+            state_path (str, optional): 统计数据文件，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().llm
+        self.names = list(backends or config.backends)
+        self.alpha = config.ewma_alpha
+        self.evict_after = config.evict_after
+        self.evict_cooldown = config.evict_cooldown
+        self.state_path = state_path or send.get_config().cache.path('llm_router.json')
+        self._store = send.JsonState(self.state_path, '大模型路由统计')
+        self.backends = {name: LLMBackend(self, name) for name in self.names}
+        self._clients: Dict[str, object] = {}
+        self._unavailable = set()
+        self._lock = threading.Lock()
+        self._stats = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        stats = self._store.load({})
+        return {name: {'latency': None, 'error': 0.0, 'samples': 0, 'failures': 0, 'evicted_until': 0.0,
+                       **(stats.get(name) or {})}
+                for name in self.names}
+
+    def client(self, name: str):
+        """获取后端对应的客户端，首次使用时创建；创建失败（如缺少密钥）的后端在本次运行中不再使用"""
+        with self._lock:
+            if name in self._clients:
+                return self._clients[name]
+            if name in self._unavailable:
+                return None
+            provider, _, model = name.partition('/')
+            try:
+                client = getattr(send, _PROVIDERS[provider])(model=model)
+            except (KeyError, ValueError) as e:
+                self.logger.error(f"无法创建 {name} 客户端，跳过该后端: {e}")
+                self._unavailable.add(name)
+                return None
+            self._clients[name] = client
+            return client
+
+    def score(self, name: str) -> float:
+        """得到一次有效回复的期望耗时（秒），越小越优先"""
+        stats = self._stats[name]
+        latency = self.PRIOR_LATENCY if stats['latency'] is None else stats['latency']
+        return latency / (1 - min(stats['error'], self.MAX_ERROR))
+
+    def ranked(self) -> List[LLMBackend]:
+        """按期望耗时排序的可用后端；所有后端都被暂停时按冷却结束时间排序全部返回"""
+        now = time.time()
+        with self._lock:
+            names = [name for name in self.names if name not in self._unavailable]
+            active = [name for name in names if self._stats[name]['evicted_until'] <= now]
+            if active:
+                ordered = sorted(active, key=lambda name: (self.score(name), self.names.index(name)))
+            else:
+                ordered = sorted(names, key=lambda name: self._stats[name]['evicted_until'])
+        return [self.backends[name] for name in ordered]
+
+    def backend(self, name: str) -> Optional[LLMBackend]:
+        """按 "服务/模型" 或服务名获取后端，服务名取该服务下当前最快的后端"""
+        if name in self.backends:
+            return self.backends[name]
+        return next((backend for backend in self.ranked() if backend.provider == name), None)
+
+    def record(self, name: str, latency: float, ok: bool):
+        """记录一次请求的耗时与成败，更新 EWMA 并在连续失败时暂停该后端"""
+        with self._lock:
+            stats = self._stats[name]
+            stats['samples'] += 1
+            stats['error'] = (1 - self.alpha) * stats['error'] + self.alpha * (0.0 if ok else 1.0)
+            if ok:
+                stats['latency'] = latency if stats['latency'] is None else \
+                    (1 - self.alpha) * stats['latency'] + self.alpha * latency
+                stats['failures'] = 0
+            else:
+                stats['failures'] += 1
+                if stats['failures'] >= self.evict_after:
+                    stats['evicted_until'] = time.time() + self.evict_cooldown
+                    stats['failures'] = 0
+                    self.logger.warning(f"{name} 连续失败 {self.evict_after} 次，暂停使用 {self.evict_cooldown} 秒")
+
+    def record_cancelled(self, name: str, elapsed: float):
+        """
+        记录一次被取消的请求。
+
+        已耗时只是实际延迟的下限：超过当前估算时按已耗时更新 EWMA，使变慢的后端不会一直保持旧的估算而继续优先，
+        否则不更新；被取消不计为失败。
+        """
+        with self._lock:
+            stats = self._stats[name]
+            if stats['latency'] is None or elapsed > stats['latency']:
+                stats['samples'] += 1
+                stats['latency'] = elapsed if stats['latency'] is None else \
+                    (1 - self.alpha) * stats['latency'] + self.alpha * elapsed
+
+    def send_message(self, content, **kwargs) -> Optional[str]:
+        """发给当前最快的后端，失败时依次尝试下一个"""
+        for backend in self.ranked():
+            self.logger.info(f"路由到 {backend.name}（期望耗时 {self.score(backend.name):.2f}s）")
+            reply = backend.send_message(content, **kwargs)
+            if reply:
+                return reply
+        self.logger.error("所有大模型后端均未返回有效回复")
+        return None
+
+    async def async_send_message(self, content, **kwargs) -> Optional[str]:
+        """send_message 的异步版本"""
+        for backend in self.ranked():
+            self.logger.info(f"路由到 {backend.name}（期望耗时 {self.score(backend.name):.2f}s）")
+            reply = await backend.async_send_message(content, **kwargs)
+            if reply:
+                return reply
+        self.logger.error("所有大模型后端均未返回有效回复")
+        return None
+
+    def stats(self) -> Dict[str, Dict]:
+        """各后端的统计数据"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def save(self):
+        """将统计数据写入缓存文件"""
+        with self._lock:
+            self._store.save(self._stats)
\ No newline at end of file
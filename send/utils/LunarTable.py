@@ -0,0 +1,165 @@
+import threading
+from datetime import date
+from typing import Optional, Tuple
+import numpy as np
+from lunardate import LunarDate
+import send
+
+# 数组列索引：0-11 为正月至腊月，12 为当年的闰月
+_LEAP_COLUMN = 12
+
+
+class LunarTable:
+    """
+    预计算的农历 -> 公历换算表。
+
+    对配置的年份区间，按 [年, 月列] 保存每个农历月初一的公历日期序数（date.toordinal()）和该月天数，
+    闰月单独占一列。换算时只做数组索引与加法，整列事件一次向量化查表即可完成，
+    不再为每个日期创建 LunarDate 对象。表在首次构建后以 .npz 保存到缓存目录，后续运行直接加载。
+    """
+
+    def __init__(self, start_year: Optional[int] = None, end_year: Optional[int] = None,
+                 cache_path: Optional[str] = None):
+        """
+        初始化换算表。
+
+        参数:
+            start_year (int, optional): 起始农历年，默认读取 EventConfig 中的 LunarYears。
+            end_year (int, optional): 结束农历年（包含），默认读取 EventConfig 中的 LunarYears。
+            cache_path (str, optional): 换算表的缓存文件，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        if start_year is None or end_year is None:
+            default_start, default_end = send.get_config().event.lunar_years
+            start_year = default_start if start_year is None else start_year
+            end_year = default_end if end_year is None else end_year
+        if start_year > end_year:
+            raise ValueError(f"农历年份区间无效: {start_year} - {end_year}")
+        self.start_year = start_year
+        self.end_year = end_year
+        self.cache_path = cache_path or send.get_config().cache.path(f'lunar_table_{start_year}_{end_year}.npz')
+
+        arrays = self._load() or self._build()
+        self.month_start, self.month_length, self.leap_month, self.year_start = arrays
+
+    def _load(self) -> Optional[Tuple[np.ndarray, ...]]:
+        """从缓存文件加载换算表，文件不存在或内容不完整时返回 None"""
+        try:
+            with np.load(self.cache_path) as data:
+                arrays = data['month_start'], data['month_length'], data['leap_month'], data['year_start']
+        except (IOError, KeyError, ValueError):
+            return None
+        if len(arrays[3]) != self.end_year - self.start_year + 1:
+            return None
+        return arrays
+
+    def _build(self) -> Tuple[np.ndarray, ...]:
+        """逐年计算每个农历月的月初日期与天数，并保存到缓存文件"""
+        years = self.end_year - self.start_year + 1
+        month_start = np.full((years, 13), -1, dtype=np.int32)
+        month_length = np.zeros((years, 13), dtype=np.int8)
+        leap_month = np.zeros(years, dtype=np.int8)
+        year_start = np.zeros(years, dtype=np.int32)
+
+        for index, year in enumerate(range(self.start_year, self.end_year + 1)):
+            leap = LunarDate.leapMonthForYear(year) or 0
+            leap_month[index] = leap
+            ordinal = LunarDate(year, 1, 1).toSolarDate().toordinal()
+            year_start[index] = ordinal
+            # 闰月紧跟在同名普通月份之后
+            months = [(month, False) for month in range(1, 13)]
+            if leap:
+                months.insert(leap, (leap, True))
+            for month, is_leap in months:
+                column = _LEAP_COLUMN if is_leap else month - 1
+                length = 30 if self._has_day_30(year, month, is_leap) else 29
+                month_start[index, column] = ordinal
+                month_length[index, column] = length
+                ordinal += length
+
+        try:
+            np.savez(self.cache_path, month_start=month_start, month_length=month_length,
+                     leap_month=leap_month, year_start=year_start)
+        except IOError as e:
+            self.logger.warning(f"保存农历换算表失败: {e}")
+        return month_start, month_length, leap_month, year_start
+
+    @staticmethod
+    def _has_day_30(year: int, month: int, is_leap: bool) -> bool:
+        try:
+            LunarDate(year, month, 30, is_leap).toSolarDate()
+            return True
+        except ValueError:
+            return False
+
+    def lunar_year_of(self, ordinals) -> np.ndarray:
+        """公历日期序数所在的农历年，超出换算表范围的返回 -1"""
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        index = np.searchsorted(self.year_start, ordinals, side='right') - 1
+        end = self.year_start[-1] + self.month_length[-1].sum(dtype=np.int64)
+        valid = (index >= 0) & (ordinals < end)
+        return np.where(valid, index + self.start_year, -1)
+
+    def to_solar_ordinals(self, years, months, days, leaps=False, lenient: bool = False) -> np.ndarray:
+        """
+        批量将农历日期换算为公历日期序数。
+
+        参数:
+            years, months, days, leaps: 等长的数组（或可广播的标量），分别为农历年、月、日、是否闰月。
+            lenient (bool): 为 True 时，当年没有对应闰月则按同名普通月份计算，该月没有三十日则按二十九日计算。
+
+        返回:
+            int64 数组，无法换算的日期为 -1。
+        """
+        years, months, days, leaps = np.broadcast_arrays(
+            np.asarray(years, dtype=np.int64), np.asarray(months, dtype=np.int64),
+            np.asarray(days, dtype=np.int64), np.asarray(leaps, dtype=bool))
+
+        row = years - self.start_year
+        valid = (row >= 0) & (row < len(self.year_start)) & (months >= 1) & (months <= 12) & (days >= 1)
+        row = np.where(valid, row, 0)
+        month_index = np.where(valid, months - 1, 0)
+
+        has_leap = self.leap_month[row] == months
+        if lenient:
+            leaps = leaps & has_leap
+        else:
+            valid &= ~leaps | has_leap
+        column = np.where(leaps, _LEAP_COLUMN, month_index)
+
+        start = self.month_start[row, column].astype(np.int64)
+        length = self.month_length[row, column].astype(np.int64)
+        if lenient:
+            days = np.minimum(days, np.maximum(length, 1))
+        valid &= (start >= 0) & (days <= length)
+        return np.where(valid, start + days - 1, -1)
+
+    def next_occurrences(self, months, days, leaps=False, today: Optional[date] = None) -> np.ndarray:
+        """
+        批量计算农历月日从 today 起的下一次发生日期序数（宽松换算，见 to_solar_ordinals）。
+
+        先按 today 所在农历年换算，已经过去的再按下一农历年换算；无法换算的为 -1。
+        """
+        today_ordinal = (today or date.today()).toordinal()
+        lunar_year = int(self.lunar_year_of(today_ordinal))
+        if lunar_year < 0:
+            self.logger.error(f"日期 {date.fromordinal(today_ordinal)} 超出农历换算表范围")
+            return np.full(np.shape(months), -1, dtype=np.int64)
+
+        current = self.to_solar_ordinals(lunar_year, months, days, leaps, lenient=True)
+        following = self.to_solar_ordinals(lunar_year + 1, months, days, leaps, lenient=True)
+        return np.where(current >= today_ordinal, current, following)
+
+
+_lunar_table = None
+_lunar_table_lock = threading.Lock()
+
+
+def get_lunar_table() -> LunarTable:
+    """获取进程内共享的农历换算表，年份区间取自 EventConfig"""
+    global _lunar_table
+    with _lunar_table_lock:
+        span = send.get_config().event.lunar_years
+        if _lunar_table is None or (_lunar_table.start_year, _lunar_table.end_year) != span:
+            _lunar_table = LunarTable(*span)
+        return _lunar_table
\ No newline at end of file
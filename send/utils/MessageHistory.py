@@ -0,0 +1,165 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+import send
+
+# MinHash 的哈希取模用的梅森素数与哈希值上限
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# 置换参数的随机种子，固定后签名在不同进程之间保持一致
+_SEED = 1
+# 字符 n-gram 的长度，情话较短，按相邻两个字切分
+_SHINGLE = 2
+
+
+def normalize(text: str) -> str:
+    """归一化文本：NFKC、转小写，只保留文字与数字"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return ''.join(char for char in text if unicodedata.category(char)[0] in 'LN')
+
+
+class MessageHistory:
+    """
+    已发送消息的历史，用于过滤相同或几乎相同的消息。
+
+    每条消息按字符 n-gram 计算 MinHash 签名，签名分为 HistoryBands 段，每段的哈希作为 LSH 桶保存在
+    缓存目录下的 SQLite 数据库中。查询时只取出与新消息落在同一个桶的历史消息，再用 RapidFuzz 计算
+    编辑距离相似度，不低于 HistoryThreshold 即视为重复；查询耗时取决于候选数量而不是历史总量，
+    多年、多个接收方的历史同样适用。消息共同的固定开头（如情话的称呼）在比较前去除，避免短消息因开头相同而误判为重复。
+    """
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None,
+                 permutations: Optional[int] = None, bands: Optional[int] = None, prefix: str = ''):
+        """
+        初始化消息历史，参数默认从 config.ini 的 LoveQuoteConfig 配置段读取。
+
+        参数:
+            path (str, optional): SQLite 数据库文件路径，默认位于缓存目录下。
+            threshold (float, optional): 视为重复的相似度（0-100）。
+            permutations (int, optional): MinHash 签名长度。
+            bands (int, optional): LSH 分段数，段数越多召回越高、候选越多。
+            prefix (str): 消息的固定开头，比较前去除。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config()
+        love_quote_config = config.love_quote
+        self.threshold = threshold if threshold is not None else love_quote_config.history_threshold
+        self.bands = bands or love_quote_config.history_bands
+        self.rows = max(1, (permutations or love_quote_config.history_permutations) // self.bands)
+        self.prefix = normalize(prefix)
+        generator = np.random.RandomState(_SEED)
+        size = self.bands * self.rows
+        self._a = generator.randint(1, 1 << 32, size=size, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=size, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or config.cache.path('message_history.sqlite3'), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS messages ('
+            'id INTEGER PRIMARY KEY, text TEXT NOT NULL, recipient TEXT NOT NULL, sent_at REAL NOT NULL)'
+        )
+        # 桶的键包含分段序号与签名参数，修改 HistoryBands / HistoryPermutations 后旧桶不会误命中
+        self._conn.execute('CREATE TABLE IF NOT EXISTS buckets (key INTEGER NOT NULL, message_id INTEGER NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS buckets_key ON buckets (key)')
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        """用于比较的文本：归一化并去除固定开头"""
+        text = normalize(text)
+        return text[len(self.prefix):] if self.prefix and text.startswith(self.prefix) else text
+
+    def signature(self, text: str) -> np.ndarray:
+        """计算消息的 MinHash 签名"""
+        text = self._key(text)
+        shingles = {text[i:i + _SHINGLE] for i in range(max(1, len(text) - _SHINGLE + 1))}
+        hashes = np.array([int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+                           for shingle in shingles], dtype=np.uint64)
+        # 乘法在 uint64 内溢出回绕，与常见的 MinHash 实现一致，不影响哈希的均匀性
+        with np.errstate(over='ignore'):
+            permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def _bucket_keys(self, signature: np.ndarray) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8,
+                                     person=f"{band}:{self.rows}".encode('ascii')[:16])
+            keys.append(int.from_bytes(digest.digest(), 'little', signed=True))
+        return keys
+
+    def candidates(self, text: str) -> List[Tuple[int, str]]:
+        """与消息落在同一个 LSH 桶的历史消息"""
+        keys = self._bucket_keys(self.signature(text))
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT id, text FROM messages WHERE id IN "
+                f"(SELECT message_id FROM buckets WHERE key IN ({','.join('?' * len(keys))}))", keys
+            ).fetchall()
+
+    def similar(self, text: Optional[str]) -> Optional[Tuple[str, float]]:
+        """
+        查找与消息相似度不低于阈值的历史消息。
+
+        返回:
+            (历史消息, 相似度)；没有相似的历史消息时返回 None。
+        """
+        if not text or not self._key(text):
+            return None
+        return self.match(text, [candidate for _, candidate in self.candidates(text)])
+
+    def match(self, text: str, choices: Sequence[str]) -> Optional[Tuple[str, float]]:
+        """在给定的消息中查找与消息相似度不低于阈值且最相似的一条，返回 (消息, 相似度)"""
+        if not choices:
+            return None
+        match = process.extractOne(self._key(text), [self._key(choice) for choice in choices],
+                                   scorer=fuzz.ratio, score_cutoff=self.threshold)
+        if match is None:
+            return None
+        _, score, index = match
+        return choices[index], score
+
+    def add(self, text: str, recipient: str = '', sent_at: Optional[float] = None) -> Optional[int]:
+        """
+        记录一条已发送的消息。
+
+        返回:
+            消息的编号；消息为空或保存失败时返回 None。
+        """
+        if not text or not self._key(text):
+            return None
+        keys = self._bucket_keys(self.signature(text))
+        with self._lock:
+            try:
+                cursor = self._conn.execute('INSERT INTO messages (text, recipient, sent_at) VALUES (?, ?, ?)',
+                                            (text, recipient, sent_at or time.time()))
+                self._conn.executemany('INSERT INTO buckets VALUES (?, ?)',
+                                       [(key, cursor.lastrowid) for key in keys])
+                self._conn.commit()
+                return cursor.lastrowid
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                self.logger.warning(f"保存已发送消息失败: {e}")
+                return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM messages').fetchone()[0]
+
+
+_history: Optional[MessageHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_message_history() -> MessageHistory:
+    """获取进程内共享的 MessageHistory 实例，用于已发送的情话"""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = MessageHistory(prefix=send.LoveQuoteService.QUOTE_PREFIX)
+    return _history
\ No newline at end of file
@@ -1,5 +1,4 @@
 import os
-import requests
 import send
 
 
@@ -14,30 +13,31 @@ class PushPlus:
         channel (str): 推送方式（如邮件）。
     """
 
-    def __init__(self):
+    def __init__(self, transport=None):
         """
         初始化SendEmail实例，从环境变量中读取PushPlus的服务Token，并从config.ini文件中读取其他配置项。
+
+        Args:
+            transport (HttpTransport): HTTP传输层，默认使用进程内共享的连接池。
         """
-        self.logger = send.setup_logger()
-        reader = send.ConfigReader()
+        self.logger = send.setup_logger(__name__)
+        self.transport = transport or send.get_transport()
         # 读取配置文件中的URL、模板和推送方式
-        get_send_email_config = reader.get_send_email_config()
-        self.url, self.template,self.channel = (get_send_email_config['URL'], get_send_email_config['Template'],
-                                                get_send_email_config['Channel'])
+        send_email_config = send.get_config().send_email
+        self.url, self.template, self.channel = (send_email_config.url, send_email_config.template,
+                                                 send_email_config.channel)
 
         # 从环境变量中读取PushPlus的服务Token
         self.pushplus_token = os.environ.get('PUSHPLUS_TOKEN')
         if not self.pushplus_token:
             self.logger.error("未设置 PUSHPLUS_TOKEN 环境变量")
 
-    def send_reminder_email(self, title, content, is_group_send=False):
+    def _build_payload(self, title, content, is_group_send=False) -> dict:
         """
-        通过PushPlus服务发送邮件提醒。
+        构造PushPlus请求体。
 
-        Args:
-            title (str): 邮件标题。
-            content (str): 邮件内容。
-            is_group_send (bool): 是否群组发送，默认为False（即个人接收）。
+        Raises:
+            ValueError: 群组发送但未设置 PUSHPLUS_GROUP_TOPIC 环境变量。
         """
         data = {
             "token": self.pushplus_token,  # 推送使用的Token
@@ -54,12 +54,30 @@ class PushPlus:
                 self.logger.error("未设置 PUSHPLUS_GROUP_TOPIC 环境变量")
                 raise ValueError("PUSHPLUS_GROUP_TOPIC 环境变量未设置")
             data["topic"] = group_topic
+        return data
 
-        headers = {'Content-Type': 'application/json'}
-        response = requests.post(self.url, json=data, headers=headers)
-
+    def _handle_response(self, response) -> bool:
+        """记录PushPlus的发送结果，返回是否发送成功"""
         if response.status_code == 200:
             self.logger.info("邮件提醒发送成功")
-        else:
-            self.logger.error(f"邮件提醒发送失败，状态码：{response.status_code}")
-            self.logger.error(f"响应内容：{response.text}")
+            return True
+        self.logger.error(f"邮件提醒发送失败，状态码：{response.status_code}")
+        self.logger.error(f"响应内容：{response.text}")
+        return False
+
+    def send_reminder_email(self, title, content, is_group_send=False):
+        """
+        通过PushPlus服务发送邮件提醒。
+
+        Args:
+            title (str): 邮件标题。
+            content (str): 邮件内容。
+            is_group_send (bool): 是否群组发送，默认为False（即个人接收）。
+
+        Returns:
+            bool: PushPlus 是否返回发送成功。
+        """
+        data = self._build_payload(title, content, is_group_send)
+        headers = {'Content-Type': 'application/json'}
+        response = self.transport.post(self.url, json=data, headers=headers)
+        return self._handle_response(response)
\ No newline at end of file
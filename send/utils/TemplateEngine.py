@@ -0,0 +1,125 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateError
+import send
+
+# 模板库目录，位于 send 包内
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+
+# 天气类型（TipCache.weather_type 的结果） -> 天气建议模板
+WEATHER_TEMPLATES = {
+    '雪': 'weather/tips/snow.j2',
+    '雨': 'weather/tips/rain.j2',
+    '雾霾': 'weather/tips/haze.j2',
+    '沙尘': 'weather/tips/dust.j2',
+    '阴': 'weather/tips/overcast.j2',
+    '多云': 'weather/tips/cloudy.j2',
+    '晴': 'weather/tips/sunny.j2',
+}
+DEFAULT_WEATHER_TEMPLATE = 'weather/tips/default.j2'
+# 触发预警时优先使用预警模板，多个预警按该顺序取第一个
+ALERT_PRIORITY = ('extreme_high', 'extreme_low', 'temp_swing', 'rain_onset')
+
+
+class TemplateEngine:
+    """
+    基于 Jinja2 的本地消息模板引擎。
+
+    模板库位于 send/templates，创建时在进程内全部预编译，渲染只需几十微秒，不需要网络请求。
+    编译结果不写入缓存目录：工作流会从 Actions 缓存恢复该目录，加载其中的字节码等同于执行不受信任的代码。
+    天气建议模板按明天的天气类型与触发的预警选择，可以代替大模型作为低优先级的建议来源，
+    也作为大模型失败或超时时的兜底；事件与节日提醒同样由模板渲染。
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        初始化模板引擎。
+
+        参数:
+            directory (str, optional): 模板库目录，默认为 send/templates。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config()
+        self.prefix = config.weather.tip_prefix if config.weather else ''
+        self.env = Environment(
+            loader=FileSystemLoader(directory or TEMPLATE_DIR, encoding='utf-8'),
+            undefined=StrictUndefined,
+            autoescape=False,
+            # 模板已加载后不再检查文件是否修改
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.precompile()
+
+    def precompile(self) -> int:
+        """预先编译模板库中的所有模板，返回模板数量"""
+        names = self.env.list_templates(extensions=['j2'])
+        for name in names:
+            self.env.get_template(name)
+        self.logger.debug(f"已预编译 {len(names)} 个模板")
+        return len(names)
+
+    def render(self, name: str, **context) -> str:
+        """渲染模板，模板文件末尾的换行不会输出"""
+        return self.env.get_template(name).render(**context)
+
+    def select_weather_template(self, weather: Dict[str, Optional[Dict]], alerts: Sequence[Any] = ()) -> str:
+        """
+        按天气特征选择天气建议模板。
+
+        有预警时按 ALERT_PRIORITY 取第一个预警的模板，否则按第一个有预报数据的城市明天白天的天气类型选择。
+        """
+        rules = {alert.rule for alert in alerts}
+        for rule in ALERT_PRIORITY:
+            if rule in rules:
+                return f"weather/alerts/{rule}.j2"
+        for info in weather.values():
+            casts = (info or {}).get('casts') or []
+            if len(casts) >= 2:
+                weather_type = send.TipCache.weather_type(casts[1].get('dayweather', ''))
+                return WEATHER_TEMPLATES.get(weather_type, DEFAULT_WEATHER_TEMPLATE)
+        return DEFAULT_WEATHER_TEMPLATE
+
+    def weather_tip(self, weather: Dict[str, Optional[Dict]], alerts: Sequence[Any] = ()) -> Optional[str]:
+        """
+        用模板生成天气建议。
+
+        返回:
+            天气建议；模板渲染失败时返回 None。
+        """
+        name = self.select_weather_template(weather, alerts)
+        alert = next((alert for rule in ALERT_PRIORITY for alert in alerts if alert.rule == rule), None)
+        try:
+            tip = self.render(name, prefix=self.prefix, value=alert.value if alert else 0)
+        except TemplateError as e:
+            self.logger.error(f"渲染天气建议模板 {name} 失败: {e}")
+            return None
+        self.logger.info(f"模板天气建议（{name}）：{tip}")
+        return tip
+
+    def weather_fallback(self) -> str:
+        """大模型与模板建议都不可用时的兜底建议"""
+        return self.render('weather/fallback.j2')
+
+    def event_content(self, events: Sequence[Dict]) -> str:
+        """未来事件提醒的内容"""
+        return self.render('event/content.j2', events=events)
+
+    def calendar_content(self, date: Optional[str], holiday: Optional[str]) -> str:
+        """节日提醒的内容"""
+        return self.render('event/calendar.j2', date=date, holiday=holiday)
+
+
+_engine: Optional[TemplateEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_template_engine() -> TemplateEngine:
+    """获取进程内共享的 TemplateEngine 实例"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TemplateEngine()
+    return _engine
\ No newline at end of file
@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+import send
+
+# 天气描述 -> 天气类型，按顺序匹配第一个包含的关键词
+_WEATHER_TYPES = (('雪', '雪'), ('雨', '雨'), ('雾', '雾霾'), ('霾', '雾霾'), ('沙', '沙尘'), ('尘', '沙尘'),
+                  ('阴', '阴'), ('云', '多云'), ('晴', '晴'))
+
+
+class TipCache:
+    """
+    天气建议的语义缓存。
+
+    以归一化的天气特征作为缓存键：每个城市明天的天气类型、最高/最低气温分桶、与今天相比的气温变化分桶，
+    以及触发的预警规则。18-26°C 多云与 19-26°C 多云会落在同一个键上，直接复用已生成的建议。
+    每个键保存多个不同的建议（变体），只要有一个有效的变体即可命中，从变体中随机取一个并避开上一次返回的内容；
+    变体数（或生成次数）n 未达到 TipVariants 时，以 1 - n/TipVariants 的概率放弃命中，由调用方额外生成一个变体，
+    变体越多额外生成越少，近似的天气在积累变体的同时大多直接命中。
+    变体超过 TipTTL 后失效，键的数量超过 TipMaxEntries 时按最近访问时间淘汰，
+    缓存与命中统计保存在缓存目录中（由调用方在运行结束时调用 save）。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化缓存，参数从 config.ini 的 CacheConfig 配置段读取。
+
+        参数:
+            path (str, optional): 缓存文件路径，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config().cache
+        self.ttl = config.tip_ttl
+        self.max_entries = config.tip_max_entries
+        self.variants = config.tip_variants
+        self.bucket = config.tip_temp_bucket
+        self.path = path or config.path('weather_tips.json')
+        self._store = send.JsonState(self.path, '天气建议缓存')
+        self._lock = threading.Lock()
+        # 键 -> {'tips': [[建议, 生成时间], ...], 'last': 上一次返回的建议, 'generated': 有效变体期间生成的次数}
+        self._entries: OrderedDict = OrderedDict()
+        # extra: 已有变体但为积累变体而额外生成的次数
+        self._stats = {'hits': 0, 'misses': 0, 'extra': 0}
+        self._load()
+
+    def _load(self):
+        data = self._store.load({})
+        entries, stats = data.get('entries', {}), data.get('stats', {})
+        if not isinstance(entries, dict) or not isinstance(stats, dict):
+            self.logger.warning("天气建议缓存格式无效，将重新生成")
+            return
+        self._entries = OrderedDict(entries)
+        self._stats.update(stats)
+
+    @staticmethod
+    def weather_type(description: str) -> str:
+        """将天气描述归一化为天气类型，如 "雷阵雨" -> "雨"、"晴间多云" -> "多云" """
+        for keyword, weather_type in _WEATHER_TYPES:
+            if keyword in description:
+                return weather_type
+        return description
+
+    def make_key(self, weather: Dict[str, Optional[Dict]], alerts: Sequence[Any] = ()) -> Optional[str]:
+        """
+        根据各城市前两天的预报与触发的预警生成缓存键。
+
+        返回:
+            缓存键；任一城市缺少预报数据时返回 None，此时不使用缓存。
+        """
+        rules = {}
+        for alert in alerts:
+            rules.setdefault(alert.city, []).append(alert.rule)
+
+        features = []
+        for city, info in weather.items():
+            casts = (info or {}).get('casts') or []
+            if len(casts) < 2:
+                return None
+            today, tomorrow = casts[0], casts[1]
+            try:
+                high, low = int(tomorrow['daytemp']), int(tomorrow['nighttemp'])
+                delta = high - int(today['daytemp'])
+            except (KeyError, TypeError, ValueError):
+                return None
+            # 气温变化只区分大致的升降幅度，超过两个分桶的按两个分桶计算
+            delta_bucket = max(-2, min(2, round(delta / self.bucket)))
+            features.append('|'.join([
+                city, self.weather_type(tomorrow.get('dayweather', '')), self.weather_type(tomorrow.get('nightweather', '')),
+                f"h{high // self.bucket}", f"l{low // self.bucket}", f"d{delta_bucket}", *sorted(rules.get(city, []))
+            ]))
+        return ';'.join(features) if features else None
+
+    def _valid_tips(self, entry: Dict, now: float) -> List[List]:
+        return [item for item in entry['tips'] if now - item[1] < self.ttl]
+
+    def get(self, key: Optional[str], allow_extra: bool = True) -> Optional[str]:
+        """
+        读取缓存的建议。
+
+        参数:
+            key (str): make_key 生成的缓存键。
+            allow_extra (bool): 是否允许为积累变体而放弃命中；额外生成失败后回退到已有变体时传入 False。
+        返回:
+            随机返回键的一个有效变体；没有有效变体或本次需要额外生成变体时返回 None。
+        """
+        if key is None:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['tips'] = self._valid_tips(entry, now)
+                self._entries.move_to_end(key)
+            if entry is None or not entry['tips']:
+                self._stats['misses'] += 1
+                return None
+            # 大模型对同样的输入可能总是给出相同的回复，按生成次数计算，避免变体无法积累时一直额外生成
+            generated = max(len(entry['tips']), entry.get('generated', 0))
+            if allow_extra and random.random() < 1 - generated / self.variants:
+                self._stats['extra'] += 1
+                return None
+            candidates = [item[0] for item in entry['tips'] if item[0] != entry.get('last')] or [entry['tips'][0][0]]
+            tip = random.choice(candidates)
+            entry['last'] = tip
+            self._stats['hits'] += 1
+            return tip
+
+    def has(self, key: Optional[str]) -> bool:
+        """键是否有未过期的变体"""
+        if key is None:
+            return False
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and bool(self._valid_tips(entry, now))
+
+    def put(self, key: Optional[str], tip: str):
+        """保存新生成的建议，相同内容不重复保存，超过变体数时替换最早的一个"""
+        if key is None or not tip:
+            return
+        now = time.time()
+        with self._lock:
+            entry = self._entries.pop(key, None) or {'tips': [], 'last': None}
+            valid = self._valid_tips(entry, now)
+            tips = [item for item in valid if item[0] != tip]
+            tips.append([tip, now])
+            entry['tips'] = tips[-self.variants:]
+            entry['last'] = tip
+            entry['generated'] = (entry.get('generated', 0) if valid else 0) + 1
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """累计命中、未命中与额外生成的次数，命中率与当前缓存的键数量"""
+        with self._lock:
+            total = sum(self._stats.values())
+            return {**self._stats, 'hit_rate': self._stats['hits'] / total if total else 0.0,
+                    'entries': len(self._entries)}
+
+    def save(self):
+        """将缓存与命中统计写入缓存文件"""
+        with self._lock:
+            self._store.save({'entries': self._entries, 'stats': self._stats})
\ No newline at end of file
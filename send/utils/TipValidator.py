@@ -0,0 +1,187 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import send
+from .ChatStream import SENTENCE_ENDINGS, CLAUSE_ENDINGS
+
+# 推理模型残留的思考过程
+_THINK = re.compile(r'<think>.*?(?:</think>|$)', re.S)
+# 模型附带的说明，如 "（共40字）"、"(注：...)"、"字数：38"，说明之后的内容通常也是解释；
+# 只匹配字数统计与带冒号的说明，正文中的 "（注意保暖）" 之类不受影响
+_NOTES = re.compile(r'(?:[（(](?:共|约)?\s*\d+\s*字[）)]|[（(]?(?:注|说明|备注|字数)[:：]).*', re.S)
+# 说明性的开头，如 "好的，以下是温馨提示："
+_PREAMBLE = re.compile(r'^(?:好的|当然|以下是|这是|下面是)[^。！？\n]*?[:：]\s*')
+# Markdown 格式与包裹回复的引号
+_MARKUP = re.compile(r'[*#`>]+')
+_QUOTES = '"\'“”‘’「」『』'
+# 日期、时间、温度等具体数值
+_NUMERIC = re.compile(
+    r'(?:\d+|[零一二两三四五六七八九十]+)\s*[-~～至到]\s*(?:\d+|[零一二两三四五六七八九十]+)\s*(?:°C|℃|度)'
+    r'|\d+\s*(?:年|月|日|号|点|时|分|°C|℃|度|%|％|mm|毫米|级)'
+    r'|[零一二两三四五六七八九十]+\s*(?:°C|℃|度)'
+    r'|\d{1,2}\s*[:：]\s*\d{2}'
+    r'|(?:周|星期|礼拜)[一二三四五六日天]'
+    r'|\d+'
+)
+# 删除数值后留下的空白与重复标点
+_SPACES = re.compile(r'\s+')
+_PUNCTUATION = re.compile(rf'([{re.escape(SENTENCE_ENDINGS + CLAUSE_ENDINGS)}])[{re.escape(SENTENCE_ENDINGS + CLAUSE_ENDINGS)}]+')
+# 修复后正文（开头之后的部分）的最少字数，更短的回复视为无法修复
+MIN_BODY_LENGTH = 6
+
+
+@dataclass(frozen=True, slots=True)
+class Repair:
+    """一次校验的结果：修复后的建议（无法修复时为 None）与所做的修复"""
+    tip: Optional[str]
+    fixes: Tuple[str, ...] = ()
+
+    @property
+    def valid(self) -> bool:
+        """回复原本就满足所有要求"""
+        return self.tip is not None and not self.fixes
+
+
+class TipValidator:
+    """
+    天气建议的本地校验与修复。
+
+    提示词要求回复以固定开头（TipPrefix）开始、开头之后不超过 TipMaxLength 字、不包含日期、时间与温度。
+    大模型的回复不满足要求时在本地修复，而不是再发起一次慢请求：
+        - reasoning: 去除思考过程、字数说明、"以下是..." 等开头、Markdown 标记与包裹的引号；
+        - numeric: 去除数字、日期、时间与温度；
+        - prefix: 补全或替换开头；
+        - length: 在预算内最后一个完整句子处截断，没有完整句子时在分句处截断并补上句号。
+    只有修复后内容过短或命中屏蔽词（TipBlocklist）时才需要重新生成。校验、修复与重新生成的次数保存在缓存目录中。
+    """
+
+    # 开头与正文之间的分隔符
+    _SEPARATORS = f"{SENTENCE_ENDINGS}{CLAUSE_ENDINGS}：: "
+
+    def __init__(self, prefix: Optional[str] = None, max_length: Optional[int] = None,
+                 state_path: Optional[str] = None, blocklist=None):
+        """
+        初始化校验器。
+
+        参数:
+            prefix (str, optional): 固定开头，默认读取 WeatherConfig 中的 TipPrefix。
+            max_length (int, optional): 开头之后的最大字数，默认读取 WeatherConfig 中的 TipMaxLength。
+            state_path (str, optional): 统计数据文件，默认位于缓存目录下。
+            blocklist (BlocklistMatcher, optional): 屏蔽词匹配器，默认使用 WeatherConfig 中的 TipBlocklist。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config()
+        self.prefix = prefix if prefix is not None else config.weather.tip_prefix
+        self.max_length = max_length if max_length is not None else config.weather.tip_max_length
+        self.state_path = state_path or config.cache.path('tip_validator.json')
+        self._store = send.JsonState(self.state_path, '天气建议校验统计')
+        self.blocklist = blocklist or send.get_blocklist_matcher(config.weather.tip_blocklist)
+        # 开头中以标点分隔的部分，如 "温馨提示"、"亲爱的老婆"，用于识别回复中不完整或改写过的开头
+        self._prefix_parts = [part for part in re.split(rf'[{re.escape(SENTENCE_ENDINGS + CLAUSE_ENDINGS)}：:\s]+',
+                                                        self.prefix) if part]
+        # 各部分的前缀与后缀（至少两个字），如 "温馨"、"老婆"，按长度从长到短匹配
+        self._prefix_pieces = sorted({part[:i] for part in self._prefix_parts for i in range(2, len(part) + 1)} |
+                                     {part[-i:] for part in self._prefix_parts for i in range(2, len(part) + 1)},
+                                     key=len, reverse=True)
+        self._lock = threading.Lock()
+        self._stats = {'valid': 0, 'repaired': 0, 'regenerated': 0, **self._store.load({})}
+
+    def _strip_prefix(self, text: str) -> str:
+        """去除回复中完整、不完整或改写过的开头，返回开头之后的正文"""
+        if text.startswith(self.prefix):
+            return text[len(self.prefix):]
+        # 只在开头附近查找，避免误删正文中出现的称呼
+        window = len(self.prefix) + 6
+        end = max((text.find(part) + len(part) for part in self._prefix_parts if 0 <= text.find(part) < window),
+                  default=0)
+        body = text[end:].lstrip(self._SEPARATORS)
+        # 继续去除紧跟在最前面的不完整开头，如 "老婆，"
+        while piece := next((piece for piece in self._prefix_pieces if body.startswith(piece)), None):
+            body = body[len(piece):].lstrip(self._SEPARATORS)
+        return body
+
+    def _trim(self, body: str) -> Optional[str]:
+        """将正文截断到最大字数以内，无法在句子或分句处截断时返回 None"""
+        if len(body) <= self.max_length:
+            return body
+        within = body[:self.max_length]
+        end = max(within.rfind(ending) for ending in SENTENCE_ENDINGS)
+        if end >= MIN_BODY_LENGTH - 1:
+            return within[:end + 1]
+        end = max(within.rfind(ending) for ending in CLAUSE_ENDINGS)
+        if end >= MIN_BODY_LENGTH:
+            return within[:end] + '。'
+        return None
+
+    def repair(self, reply: Optional[str]) -> Repair:
+        """
+        校验并修复一条回复，不记录统计。
+
+        返回:
+            Repair，tip 为修复后的建议；回复为空、修复后内容过短或命中屏蔽词时 tip 为 None。
+        """
+        if not reply or not reply.strip():
+            return Repair(None)
+        fixes = []
+        text = reply.strip()
+
+        cleaned = _THINK.sub('', text)
+        cleaned = _NOTES.sub('', cleaned)
+        cleaned = _MARKUP.sub('', cleaned).strip().strip(_QUOTES)
+        cleaned = _PREAMBLE.sub('', cleaned).strip().strip(_QUOTES)
+        # 多行回复只保留第一段有内容的文字，其余通常是解释
+        cleaned = next((line.strip() for line in cleaned.splitlines() if line.strip()), '')
+        if cleaned != text:
+            fixes.append('reasoning')
+
+        body = self._strip_prefix(cleaned)
+        stripped = _NUMERIC.sub('', body)
+        if stripped != body:
+            fixes.append('numeric')
+            body = _PUNCTUATION.sub(r"\1", _SPACES.sub("", stripped)).lstrip(self._SEPARATORS)
+        if not cleaned.startswith(self.prefix):
+            fixes.append('prefix')
+
+        trimmed = self._trim(body)
+        if trimmed is None:
+            return Repair(None, tuple(fixes))
+        if trimmed != body:
+            fixes.append('length')
+        if len(trimmed) < MIN_BODY_LENGTH:
+            return Repair(None, tuple(fixes))
+        if self.blocklist.find(trimmed):
+            return Repair(None, (*fixes, 'blocked'))
+        return Repair(self.prefix + trimmed, tuple(fixes))
+
+    def check(self, reply: Optional[str]) -> Optional[str]:
+        """
+        校验并修复一条回复，记录统计（由调用方在运行结束时调用 save 保存）。
+
+        返回:
+            满足要求或修复后的建议；无法修复时返回 None，调用方应重新生成。
+        """
+        result = self.repair(reply)
+        with self._lock:
+            if result.tip is None:
+                self._stats['regenerated'] += 1
+            else:
+                self._stats['valid' if result.valid else 'repaired'] += 1
+        if result.tip is None:
+            self.logger.warning(f"天气建议无法修复，需要重新生成: {reply!r}")
+        elif result.fixes:
+            self.logger.info(f"天气建议已修复（{'、'.join(result.fixes)}）: {reply!r} -> {result.tip!r}")
+        return result.tip
+
+    def stats(self) -> Dict[str, float]:
+        """累计的直接通过、修复与重新生成次数及比例"""
+        with self._lock:
+            total = sum(self._stats.values())
+            return {**self._stats,
+                    'repair_rate': self._stats['repaired'] / total if total else 0.0,
+                    'regenerate_rate': self._stats['regenerated'] / total if total else 0.0}
+
+    def save(self):
+        """将统计数据写入缓存文件"""
+        with self._lock:
+            self._store.save(self._stats)
\ No newline at end of file
@@ -0,0 +1,200 @@
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import send
+
+# 中日韩字符（含全角标点），每个字符大约对应一个 token
+_CJK = re.compile(r'[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]')
+# 截断提示词时插入的省略标记
+_ELLIPSIS = '\n……\n'
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """估算文本的 token 数：中文字符按 1 个计算，其余字符按每 4 个 1 个计算"""
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    return cjk + -(-(len(text) - cjk) // 4)
+
+
+def truncate_prompt(text: str, budget: int) -> str:
+    """
+    将提示词截断到 token 预算以内。
+
+    保留开头（通常是任务说明）与结尾（通常是格式要求）各一半，截去中间部分；未超出预算时原样返回。
+    """
+    if budget <= 0 or estimate_tokens(text) <= budget:
+        return text
+    # 按估算的平均每字符 token 数换算保留的字符数
+    keep = int(len(text) * budget / estimate_tokens(text)) - len(_ELLIPSIS)
+    head = max(0, keep // 2)
+    tail = max(0, keep - head)
+    return text[:head] + _ELLIPSIS + (text[-tail:] if tail else '')
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    """一次大模型调用的用量、耗时（秒）与费用（元）"""
+    provider: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    reasoning_tokens: int = 0
+    ttft: Optional[float] = None
+    latency: float = 0.0
+    cost: float = 0.0
+    ok: bool = True
+    # 接口未返回用量（如提前结束的流式请求）时按文本估算
+    estimated: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+
+class UsageTracker:
+    """
+    大模型调用的 token、耗时与费用统计。
+
+    每次 DeepSeek / HunYuan 调用（含失败与提前结束的流式请求）都会记录提示词、回复与思考 token 数、
+    首个回复 token 耗时(TTFT)、总耗时以及按 LLMConfig.Pricing 计算的费用，并按服务/模型标记。
+    记录保存在缓存目录下的 SQLite 数据库中，可汇总为本次运行与最近 UsageWindowDays 天的统计。
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化统计。
+
+        参数:
+            path (str, optional): SQLite 数据库文件路径，默认位于缓存目录下。
+        """
+        self.logger = send.setup_logger(__name__)
+        config = send.get_config()
+        self.pricing = dict(config.llm.pricing)
+        self.window_days = config.llm.usage_window_days
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or config.cache.path('llm_usage.sqlite3'), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS calls ('
+            'timestamp REAL, provider TEXT, model TEXT, prompt_tokens INTEGER, completion_tokens INTEGER, '
+            'reasoning_tokens INTEGER, ttft REAL, latency REAL, cost REAL, ok INTEGER, estimated INTEGER)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS calls_timestamp ON calls (timestamp)')
+        self._conn.commit()
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """按每百万 tokens 的单价计算费用，思考 token 已计入回复 token"""
+        input_price, output_price = self.pricing.get(model, (0.0, 0.0))
+        return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+    def record(self, provider: str, model: str, prompt: str = '', completion: str = '', reasoning: str = '',
+               usage=None, ttft: Optional[float] = None, latency: float = 0.0, ok: bool = True) -> UsageRecord:
+        """
+        记录一次调用。
+
+        参数:
+            provider (str): 服务名，如 deepseek、hunyuan。
+            model (str): 模型名。
+            prompt, completion, reasoning (str): 提示词、回复与思考内容，usage 缺失时用于估算 token 数。
+            usage: 接口返回的用量（OpenAI 兼容的 usage 对象）。
+            ttft (float, optional): 首个回复 token 的耗时，非流式请求为 None。
+            latency (float): 总耗时。
+            ok (bool): 是否得到有效回复。
+        """
+        if usage is not None:
+            details = getattr(usage, 'completion_tokens_details', None)
+            record = UsageRecord(provider, model, usage.prompt_tokens or 0, usage.completion_tokens or 0,
+                                 getattr(details, 'reasoning_tokens', None) or 0)
+        else:
+            reasoning_tokens = estimate_tokens(reasoning)
+            record = UsageRecord(provider, model, estimate_tokens(prompt),
+                                 estimate_tokens(completion) + reasoning_tokens, reasoning_tokens, estimated=True)
+        record.ttft, record.latency, record.ok = ttft, latency, ok
+        record.cost = self.cost(model, record.prompt_tokens, record.completion_tokens)
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    'INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (record.timestamp, provider, model, record.prompt_tokens, record.completion_tokens,
+                     record.reasoning_tokens, ttft, latency, record.cost, int(ok), int(record.estimated))
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"保存大模型用量失败: {e}")
+        self.logger.debug(f"{provider}/{model} 用量: {record}")
+        return record
+
+    def records(self, since: float = 0.0) -> List[UsageRecord]:
+        """读取某一时间之后的调用记录"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT provider, model, prompt_tokens, completion_tokens, reasoning_tokens, ttft, latency, cost, '
+                'ok, estimated, timestamp FROM calls WHERE timestamp >= ? ORDER BY timestamp', (since,)
+            ).fetchall()
+        return [UsageRecord(provider, model, prompt, completion, reasoning, ttft, latency, cost, bool(ok),
+                            bool(estimated), timestamp)
+                for provider, model, prompt, completion, reasoning, ttft, latency, cost, ok, estimated, timestamp
+                in rows]
+
+    @staticmethod
+    def summarize(records: Sequence[UsageRecord]) -> Dict[str, Dict]:
+        """按 "服务/模型" 汇总调用次数、失败次数、token 数、费用、平均与 p95 耗时以及平均 TTFT"""
+        groups: Dict[str, List[UsageRecord]] = {}
+        for record in records:
+            groups.setdefault(f"{record.provider}/{record.model}", []).append(record)
+
+        summary = {}
+        for name, group in groups.items():
+            latency = np.array([record.latency for record in group])
+            ttft = np.array([record.ttft for record in group if record.ttft is not None])
+            summary[name] = {
+                'calls': len(group),
+                'errors': sum(not record.ok for record in group),
+                'prompt_tokens': sum(record.prompt_tokens for record in group),
+                'completion_tokens': sum(record.completion_tokens for record in group),
+                'reasoning_tokens': sum(record.reasoning_tokens for record in group),
+                'cost': round(sum(record.cost for record in group), 6),
+                'latency_avg': round(float(latency.mean()), 3),
+                'latency_p95': round(float(np.percentile(latency, 95)), 3),
+                'ttft_avg': round(float(ttft.mean()), 3) if ttft.size else None,
+            }
+        return summary
+
+    def run_summary(self) -> Dict[str, Dict]:
+        """本次运行的统计"""
+        return self.summarize(self.records(self.started))
+
+    def rolling_summary(self, days: Optional[int] = None) -> Dict[str, Dict]:
+        """最近若干天（默认 UsageWindowDays）的统计"""
+        return self.summarize(self.records(time.time() - (days or self.window_days) * 86400))
+
+    def log_summary(self):
+        """将本次运行与滚动窗口的统计写入日志"""
+        for title, summary in (('本次运行', self.run_summary()),
+                               (f"最近 {self.window_days} 天", self.rolling_summary())):
+            for name, stats in summary.items():
+                ttft = '-' if stats['ttft_avg'] is None else f"{stats['ttft_avg']:.2f}s"
+                self.logger.info(
+                    f"大模型用量（{title}）{name}: 调用 {stats['calls']} 次，失败 {stats['errors']} 次，"
+                    f"tokens 输入 {stats['prompt_tokens']} / 输出 {stats['completion_tokens']}"
+                    f"（思考 {stats['reasoning_tokens']}），费用 {stats['cost']:.4f} 元，"
+                    f"耗时 平均 {stats['latency_avg']:.2f}s / p95 {stats['latency_p95']:.2f}s，"
+                    f"TTFT {ttft}"
+                )
+
+
+_tracker: Optional[UsageTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_usage_tracker() -> UsageTracker:
+    """获取进程内共享的 UsageTracker 实例"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = UsageTracker()
+    return _tracker
\ No newline at end of file
@@ -0,0 +1,195 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import send
+
+# 高德天气的发布时间为北京时间
+BEIJING = timezone(timedelta(hours=8))
+
+# casts 中按文本保存的字段；daytemp/nighttemp 单独以整数列保存
+_TEXT_FIELDS = ('week', 'dayweather', 'nightweather', 'daywind', 'nightwind', 'daypower', 'nightpower')
+
+
+@dataclass(frozen=True, slots=True)
+class CastSeries:
+    """某个地区按日期排列的天气预报序列，每个日期取最近一次发布的预报"""
+    adcode: str
+    ordinals: np.ndarray
+    daytemp: np.ndarray
+    nighttemp: np.ndarray
+    dayweather: List[str]
+    nightweather: List[str]
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    @property
+    def dates(self) -> List[date]:
+        return [date.fromordinal(ordinal) for ordinal in self.ordinals.tolist()]
+
+
+class WeatherStore:
+    """
+    本地天气预报存储，按地区编码(adcode)和发布时间(reporttime)保存高德天气接口返回的 casts。
+
+    每次发布的预报都会保留，温度以整数列保存，可以直接查询某地区一段时间内的温度与天气序列；
+    高德预报按固定时刻更新，最近一次保存的预报在下一个更新时刻之前都视为最新，此时无需请求接口。
+    """
+
+    def __init__(self, path=None, report_hours: Optional[Sequence[int]] = None):
+        """
+        初始化天气预报存储。
+
+        参数:
+            path (str): SQLite 数据库文件路径，默认位于 CacheConfig 配置的缓存目录下。
+            report_hours (list, optional): 高德预报每天的更新时刻（北京时间，小时），默认读取 WeatherConfig 中的 ReportHours。
+        """
+        self.logger = send.setup_logger(__name__)
+        self.report_hours = sorted(report_hours or send.get_config().weather.report_hours)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or send.get_config().cache.path('weather.sqlite3'),
+                                     check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS reports ('
+            'adcode TEXT NOT NULL, reporttime TEXT NOT NULL, province TEXT NOT NULL, city TEXT NOT NULL, '
+            'fetched_at REAL NOT NULL, PRIMARY KEY (adcode, reporttime))'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS casts ('
+            'adcode TEXT NOT NULL, reporttime TEXT NOT NULL, ordinal INTEGER NOT NULL, '
+            'daytemp INTEGER, nighttemp INTEGER, '
+            + ', '.join(f'{field} TEXT NOT NULL' for field in _TEXT_FIELDS) +
+            ', PRIMARY KEY (adcode, ordinal, reporttime))'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _to_int(value) -> Optional[int]:
+        try:
+            return int(round(float(value)))
+        except (TypeError, ValueError):
+            return None
+
+    def put_forecast(self, forecast: Dict):
+        """保存高德天气接口返回的一条 forecasts 记录（包含 adcode、reporttime 与 casts）"""
+        adcode, reporttime = forecast.get('adcode'), forecast.get('reporttime')
+        if not adcode or not reporttime:
+            self.logger.warning("预报数据缺少 adcode 或 reporttime，不保存")
+            return
+
+        rows = []
+        for cast in forecast.get('casts', []):
+            try:
+                ordinal = date.fromisoformat(cast['date']).toordinal()
+            except (KeyError, ValueError):
+                self.logger.warning(f"预报数据日期无效: {cast.get('date')}")
+                continue
+            rows.append((adcode, reporttime, ordinal, self._to_int(cast.get('daytemp')),
+                         self._to_int(cast.get('nighttemp')), *(str(cast.get(field, '')) for field in _TEXT_FIELDS)))
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO reports (adcode, reporttime, province, city, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                (adcode, reporttime, forecast.get('province', ''), forecast.get('city', ''), time.time())
+            )
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO casts (adcode, reporttime, ordinal, daytemp, nighttemp, {", ".join(_TEXT_FIELDS)}) '
+                f'VALUES ({", ".join("?" * (5 + len(_TEXT_FIELDS)))})', rows
+            )
+            self._conn.commit()
+
+    def latest_forecast(self, adcode: str, today: Optional[date] = None) -> Optional[Dict]:
+        """
+        读取某地区最近一次发布的预报，结构与高德 forecasts 中的一项一致，只包含 today 及之后的 casts。
+
+        返回:
+            预报字典，没有保存过该地区的预报时返回 None。
+        """
+        today = today or datetime.now(BEIJING).date()
+        with self._lock:
+            report = self._conn.execute(
+                'SELECT reporttime, province, city FROM reports WHERE adcode = ? ORDER BY reporttime DESC LIMIT 1',
+                (adcode,)
+            ).fetchone()
+            if report is None:
+                return None
+            rows = self._conn.execute(
+                f'SELECT ordinal, daytemp, nighttemp, {", ".join(_TEXT_FIELDS)} FROM casts '
+                'WHERE adcode = ? AND reporttime = ? AND ordinal >= ? ORDER BY ordinal',
+                (adcode, report[0], today.toordinal())
+            ).fetchall()
+
+        casts = []
+        for ordinal, daytemp, nighttemp, *texts in rows:
+            cast = {'date': date.fromordinal(ordinal).isoformat()}
+            cast.update(zip(_TEXT_FIELDS, texts))
+            cast['daytemp'] = '' if daytemp is None else str(daytemp)
+            cast['nighttemp'] = '' if nighttemp is None else str(nighttemp)
+            casts.append(cast)
+        return {'adcode': adcode, 'reporttime': report[0], 'province': report[1], 'city': report[2], 'casts': casts}
+
+    def next_report_time(self, reporttime: datetime) -> datetime:
+        """发布时间之后的下一个预报更新时刻"""
+        for offset in (0, 1):
+            day = reporttime.date() + timedelta(days=offset)
+            for hour in self.report_hours:
+                candidate = datetime(day.year, day.month, day.day, hour)
+                if candidate > reporttime:
+                    return candidate
+        return reporttime + timedelta(days=1)
+
+    def current_forecast(self, adcode: str, min_casts: int = 1, now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        读取仍然是最新的预报：下一个更新时刻还未到，且从今天起至少还有 min_casts 天的预报。
+
+        参数:
+            now (datetime, optional): 当前北京时间（不含时区），默认为当前时间。
+
+        返回:
+            预报字典；没有保存或已经过期时返回 None，此时应请求接口。
+        """
+        now = now or datetime.now(BEIJING).replace(tzinfo=None)
+        forecast = self.latest_forecast(adcode, now.date())
+        if forecast is None or len(forecast['casts']) < min_casts:
+            return None
+        try:
+            reporttime = datetime.strptime(forecast['reporttime'], '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+        if now >= self.next_report_time(reporttime):
+            return None
+        return forecast
+
+    def history(self, adcode: str, start: date, end: date) -> CastSeries:
+        """
+        查询某地区 [start, end] 区间内每天的温度与天气，每个日期取最近一次发布的预报。
+
+        返回:
+            CastSeries，温度为 int16 数组，缺失的温度为 -32768。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT ordinal, daytemp, nighttemp, dayweather, nightweather FROM casts c '
+                'WHERE adcode = ? AND ordinal BETWEEN ? AND ? AND reporttime = ('
+                'SELECT MAX(reporttime) FROM casts WHERE adcode = c.adcode AND ordinal = c.ordinal) '
+                'ORDER BY ordinal',
+                (adcode, start.toordinal(), end.toordinal())
+            ).fetchall()
+
+        missing = np.iinfo(np.int16).min
+        return CastSeries(
+            adcode=adcode,
+            ordinals=np.array([row[0] for row in rows], dtype=np.int32),
+            daytemp=np.array([missing if row[1] is None else row[1] for row in rows], dtype=np.int16),
+            nighttemp=np.array([missing if row[2] is None else row[2] for row in rows], dtype=np.int16),
+            dayweather=[row[3] for row in rows],
+            nightweather=[row[4] for row in rows]
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
\ No newline at end of file
@@ -1,5 +1,38 @@
-from .PushPlus import PushPlus
-from .Deep_SEEK import DeepSeek
-from .HunYuan import HunYuan
+import importlib
 
-__all__ = ['PushPlus', 'DeepSeek', 'HunYuan']
\ No newline at end of file
+# 与子模块同名的类（如 PushPlus）不在这里导出，请通过 send.PushPlus 访问：
+# 子模块被导入后会以模块对象覆盖子包上的同名属性，子包的 __getattr__ 不再被调用
+# 导出名称 -> 所在模块
+_LAZY_IMPORTS = {
+    'DeepSeek': '.Deep_SEEK',
+    'get_transport': '.HttpTransport',
+    'get_http_cache': '.HttpCache',
+    'get_lunar_table': '.LunarTable',
+    'get_city_resolver': '.CityResolver',
+    'CastSeries': '.WeatherStore',
+    'LLMBackend': '.LLMRouter',
+    'Repair': '.TipValidator',
+    'get_template_engine': '.TemplateEngine',
+    'get_blocklist_matcher': '.BlocklistMatcher',
+    'get_quote_blocklist': '.BlocklistMatcher',
+    'get_message_history': '.MessageHistory',
+    'UsageRecord': '.UsageTracker',
+    'get_usage_tracker': '.UsageTracker',
+    'estimate_tokens': '.UsageTracker',
+    'truncate_prompt': '.UsageTracker',
+    'StreamResult': '.ChatStream'
+}
+
+__all__ = ['DeepSeek', 'get_transport', 'get_http_cache', 'get_lunar_table', 'get_city_resolver', 'CastSeries',
+           'StreamResult', 'LLMBackend', 'UsageRecord', 'get_usage_tracker', 'estimate_tokens', 'truncate_prompt',
+           'Repair', 'get_template_engine', 'get_blocklist_matcher', 'get_quote_blocklist', 'get_message_history']
+
+
+def __getattr__(name):
+    """首次访问时才导入对应模块，避免一次性加载所有依赖"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
@@ -0,0 +1,37 @@
+import pytest
+import send
+
+ADCODE_FILE = send.get_config().weather.adcode_file
+EXTENSIONS = {'实况天气': 'base', '预报天气': 'all'}
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return send.CityResolver({'老家': '450321'}, EXTENSIONS, ADCODE_FILE)
+
+
+@pytest.mark.parametrize('content, expected', [
+    ('苏州市预报天气', ('320500', 'all')),
+    ('昆山市实况天气', ('320583', 'base')),
+    ('南宁市青秀区实况天气', ('450103', 'base')),
+    ('桂林阳朔实况天气', ('450321', 'base')),
+    ('北京实况天气', ('110000', 'base')),
+    ('老家实况天气', ('450321', 'base')),
+])
+def test_known_cities(resolver, content, expected):
+    assert resolver.resolve(content) == expected
+
+
+def test_typo_within_found_city(resolver):
+    assert resolver.resolve('南宁市青秀去实况天气') == ('450103', 'base')
+
+
+@pytest.mark.parametrize('content', ['火星市实况天气', '乌鲁木奇市实况天气'])
+def test_unknown_city_is_not_guessed(resolver, content):
+    assert resolver.resolve(content) == (None, 'base')
+
+
+def test_table_covers_all_counties():
+    with open(ADCODE_FILE, encoding='utf-8') as file:
+        rows = [line for line in file if line.strip() and not line.startswith('#')]
+    assert len(rows) > 3000
\ No newline at end of file
@@ -0,0 +1,56 @@
+import pytest
+import send
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = send.TipCache(path=str(tmp_path / 'weather_tips.json'))
+    cache.variants = 3
+    return cache
+
+
+def test_first_tip_is_returned(cache, monkeypatch):
+    assert cache.get('晴') is None
+    cache.put('晴', '明天天气晴朗。')
+    monkeypatch.setattr('random.random', lambda: 0.99)
+    assert cache.get('晴') == '明天天气晴朗。'
+    assert cache.stats()['hits'] == 1
+
+
+def test_extra_variant_is_requested_until_full(cache, monkeypatch):
+    cache.put('晴', '明天天气晴朗。')
+    monkeypatch.setattr('random.random', lambda: 0.5)
+    # 1 个变体：1 - 1/3 > 0.5，额外生成
+    assert cache.get('晴') is None
+    assert cache.has('晴')
+    assert cache.get('晴', allow_extra=False) == '明天天气晴朗。'
+    cache.put('晴', '明天阳光很好。')
+    # 2 个变体：1 - 2/3 < 0.5，直接命中
+    assert cache.get('晴') in ('明天天气晴朗。', '明天阳光很好。')
+    cache.put('晴', '明天适合出门。')
+    monkeypatch.setattr('random.random', lambda: 0.0)
+    assert cache.get('晴') is not None
+    stats = cache.stats()
+    assert (stats['misses'], stats['extra'], stats['hits']) == (0, 1, 3)
+
+
+def test_hit_avoids_last_tip(cache):
+    cache.put('晴', '明天天气晴朗。')
+    cache.put('晴', '明天阳光很好。')
+    cache.put('晴', '明天适合出门。')
+    tips = [cache.get('晴') for _ in range(20)]
+    assert all(a != b for a, b in zip(tips, tips[1:]))
+
+
+def test_save_and_reload(cache, tmp_path):
+    cache.put('晴', '明天天气晴朗。')
+    cache.save()
+    reloaded = send.TipCache(path=str(tmp_path / 'weather_tips.json'))
+    assert reloaded.has('晴')
+    assert not reloaded.has('雨')
+
+def test_repeated_tip_counts_towards_variants(cache, monkeypatch):
+    for _ in range(3):
+        cache.put('晴', '明天天气晴朗。')
+    monkeypatch.setattr('random.random', lambda: 0.0)
+    assert cache.get('晴') == '明天天气晴朗。'
\ No newline at end of file
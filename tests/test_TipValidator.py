@@ -0,0 +1,78 @@
+import pytest
+import send
+
+PREFIX = '温馨提示：亲爱的老婆，'
+
+
+@pytest.fixture
+def validator(tmp_path):
+    blocklist = send.BlocklistMatcher(['雨伞'])
+    return send.TipValidator(prefix=PREFIX, max_length=45, state_path=str(tmp_path / 'tip_validator.json'),
+                             blocklist=blocklist)
+
+
+def test_valid_tip_is_unchanged(validator):
+    result = validator.repair(f"{PREFIX}明天天气晴朗，适合出门散步，记得多喝水。")
+    assert result.valid
+    assert result.tip == f"{PREFIX}明天天气晴朗，适合出门散步，记得多喝水。"
+
+
+def test_parenthetical_in_body_is_kept(validator):
+    result = validator.repair("亲爱的老婆，明天降温（注意保暖），出门多穿点衣服，别着凉了。")
+    assert result.tip == f"{PREFIX}明天降温（注意保暖），出门多穿点衣服，别着凉了。"
+    assert result.fixes == ('prefix',)
+
+
+@pytest.mark.parametrize('note', ['（共40字）', '(38字)', '（约30字）', '（注：已去除具体温度）',
+                                  '\n注：以上建议仅供参考。', '字数：38', '\n说明：根据天气生成'])
+def test_notes_are_removed(validator, note):
+    result = validator.repair(f"{PREFIX}明天有小雨，出门记得带把伞哦。{note}")
+    assert result.tip == f"{PREFIX}明天有小雨，出门记得带把伞哦。"
+    assert result.fixes == ('reasoning',)
+
+
+def test_reasoning_and_preamble_are_removed(validator):
+    reply = f"<think>用户需要一句提示</think>好的，以下是温馨提示：\n“{PREFIX}明天风大，出门注意安全。”"
+    result = validator.repair(reply)
+    assert result.tip == f"{PREFIX}明天风大，出门注意安全。"
+    assert 'reasoning' in result.fixes
+
+
+def test_numbers_and_dates_are_removed(validator):
+    result = validator.repair(f"{PREFIX}明天25℃，周六下午3点有雨，记得早点回家。")
+    assert result.tip is not None
+    assert not any(char.isdigit() for char in result.tip)
+    assert '周六' not in result.tip
+    assert 'numeric' in result.fixes
+
+
+def test_partial_prefix_is_replaced(validator):
+    result = validator.repair("温馨提示：老婆，明天有雾霾，出门记得戴口罩。")
+    assert result.tip == f"{PREFIX}明天有雾霾，出门记得戴口罩。"
+    assert result.fixes == ('prefix',)
+
+
+def test_long_tip_is_trimmed_at_sentence(validator):
+    body = "明天气温骤降，早晚温差很大，出门一定要多穿点衣服。" + "晚上回家的路上风很大，记得戴好围巾和手套，别让自己着凉了。"
+    result = validator.repair(PREFIX + body)
+    assert result.tip == f"{PREFIX}明天气温骤降，早晚温差很大，出门一定要多穿点衣服。"
+    assert result.fixes == ('length',)
+
+
+@pytest.mark.parametrize('reply', [None, '', '   ', f"{PREFIX}好的。", '（共40字）'])
+def test_unrepairable_replies(validator, reply):
+    assert validator.repair(reply).tip is None
+
+
+def test_blocked_tip_is_regenerated(validator):
+    result = validator.repair(f"{PREFIX}明天有雨，出门记得带雨伞哦。")
+    assert result.tip is None
+    assert 'blocked' in result.fixes
+
+
+def test_check_records_stats(validator):
+    validator.check(f"{PREFIX}明天天气晴朗，适合出门散步，记得多喝水。")
+    validator.check("亲爱的老婆，明天有雾霾，出门记得戴口罩。")
+    assert validator.check('（共40字）') is None
+    stats = validator.stats()
+    assert (stats['valid'], stats['repaired'], stats['regenerated']) == (1, 1, 1)
\ No newline at end of file
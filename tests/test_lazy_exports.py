@@ -0,0 +1,36 @@
+import importlib
+import inspect
+import pytest
+import send
+
+SUBPACKAGES = ['send.utils', 'send.api', 'send.service', 'send.controller']
+
+
+@pytest.fixture(scope='module', autouse=True)
+def import_everything():
+    """先通过 send 访问全部导出名称，所有子模块都已导入并绑定到各自的子包上"""
+    for name in send._LAZY_IMPORTS:
+        getattr(send, name)
+
+
+@pytest.mark.parametrize('name', sorted(send._LAZY_IMPORTS))
+def test_send_exports_are_not_modules(name):
+    value = getattr(send, name)
+    assert callable(value) and not inspect.ismodule(value)
+
+
+@pytest.mark.parametrize('package', SUBPACKAGES)
+def test_subpackage_exports_after_send(package):
+    module = importlib.import_module(package)
+    for name in getattr(module, '__all__', []):
+        value = getattr(module, name)
+        assert callable(value) and not inspect.ismodule(value), f"{package}.{name} 是 {value!r}"
+        assert value is getattr(send, name)
+
+
+def test_same_named_classes_are_only_exported_from_send():
+    from send.utils import PushPlus
+    assert inspect.ismodule(PushPlus)
+    assert inspect.isclass(send.PushPlus)
+    assert not any(name == module.lstrip('.') for package in SUBPACKAGES
+                   for name, module in getattr(importlib.import_module(package), '_LAZY_IMPORTS', {}).items())
\ No newline at end of file